@@ -0,0 +1,86 @@
+"""Startzeit-Benchmark: Kaltstart bis zum ersten gezeichneten Hauptfenster.
+
+Jeder Lauf startet einen frischen Interpreter, importiert main.py, erzeugt das
+Fenster (ohne Budget-Dialog) und wartet, bis es gezeichnet ist. Ohne Display
+wird nur die Importzeit gemessen. Überschreitet der Median das Zeitbudget oder
+wird matplotlib bereits beim Start geladen, endet das Skript mit Code 1.
+
+    python benchmarks/startup.py --runs 5 --budget-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wird im Kindprozess ausgeführt und gibt die Messwerte als JSON aus
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    import tkinter as tk
+except ImportError:
+    # main.py importiert tkinter selbst, ohne Tk ist nichts zu messen
+    sys.exit("tkinter ist nicht verfügbar")
+import main
+imported = time.perf_counter()
+window = None
+try:
+    root = tk.Tk()
+    app = main.RiskManagementApp(root, project_budget=1.0)
+    root.update()
+    window = time.perf_counter()
+    root.destroy()
+except tk.TclError:
+    pass
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'window_ms': None if window is None else (window - start) * 1000,
+    'modules': sorted(name for name in ('matplotlib', 'numpy') if name in sys.modules)
+}))
+"""
+
+
+def measure_once() -> dict:
+    """Misst einen Kaltstart; total_ms enthält auch den Interpreterstart"""
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-c', _CHILD], cwd=ROOT, capture_output=True, text=True)
+    if process.returncode:
+        raise SystemExit(process.stderr.strip() or f"Kindprozess endete mit Code {process.returncode}")
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result['total_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="Anzahl Kaltstarts (Median wird bewertet)")
+    parser.add_argument('--budget-ms', type=float, default=1000.0, help="Zeitbudget für den Median von total_ms")
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.runs)]
+    summary = {key: statistics.median(run[key] for run in runs)
+               for key in ('import_ms', 'total_ms')}
+    windows = [run['window_ms'] for run in runs if run['window_ms'] is not None]
+    summary['window_ms'] = statistics.median(windows) if windows else None
+    summary['modules'] = runs[-1]['modules']
+    summary['budget_ms'] = args.budget_ms
+    print(json.dumps(summary, indent=2))
+
+    failed = False
+    if 'matplotlib' in summary['modules']:
+        print("matplotlib wird bereits beim Start geladen", file=sys.stderr)
+        failed = True
+    if summary['total_ms'] > args.budget_ms:
+        print(f"Startzeit {summary['total_ms']:.0f} ms über dem Budget von {args.budget_ms:.0f} ms",
+              file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
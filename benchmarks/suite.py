@@ -0,0 +1,277 @@
+"""Benchmark-Suite für RiskManager, Persistenz und RiskMatrix mit Regressionsprüfung.
+
+    python -m benchmarks.suite --size 10000 --output baseline.json
+    python -m benchmarks.suite --size 10000 --compare baseline.json --threshold 0.3
+
+Jeder Fall wird --repeat mal auf frisch vorbereiteten Daten gemessen; bewertet
+wird der Median. Mit --compare endet der Lauf mit Code 1, sobald ein Fall um
+mehr als --threshold (relativ) langsamer ist als in der gespeicherten Baseline.
+Streuen die Einzelmessungen eines Falls stärker, gilt diese Streuung als Toleranz.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import matplotlib
+matplotlib.use("Agg")  # Vor pyplot: ohne Display und ohne Fenster rendern
+import numpy as np
+
+from benchmarks.synthetic import (IMPACT_DISTRIBUTIONS, PROBABILITY_DISTRIBUTIONS, generate_records,
+                                  parse_mix)
+from src.services.persistence import load_register, save_register
+from src.services.risk_manager import RiskManager
+from src.visualization.risk_matrix import RiskMatrix
+
+# Ergebnisformat; Vergleiche nur zwischen gleichen Versionen
+RESULT_VERSION = 1
+
+# Vorbereitung eines Falls: liefert die zu messende Funktion und die Anzahl Operationen
+Prepare = Callable[['Context'], Tuple[Callable[[], Any], int]]
+
+
+class Context:
+    """Gemeinsame Eingaben aller Fälle eines Laufs"""
+
+    def __init__(self, records: List[Dict[str, Any]], project_budget: float, directory: str):
+        self.records = records
+        self.project_budget = project_budget
+        self.directory = directory
+        self.register_path = os.path.join(directory, "register.json")
+        self._manager: Optional[RiskManager] = None
+
+    def filled_manager(self) -> RiskManager:
+        """Neuer RiskManager mit allen Datensätzen"""
+        risk_manager = RiskManager()
+        risk_manager.set_project_budget(self.project_budget)
+        risk_manager.add_risks(self.records)
+        return risk_manager
+
+    @property
+    def shared_manager(self) -> RiskManager:
+        """Gefüllter RiskManager für nur lesende Fälle (einmal aufgebaut)"""
+        if self._manager is None:
+            self._manager = self.filled_manager()
+        return self._manager
+
+
+def _add_risk(ctx: Context):
+    risk_manager = RiskManager()
+    return lambda: [risk_manager.add_risk(**record) for record in ctx.records], len(ctx.records)
+
+
+def _add_risks(ctx: Context):
+    risk_manager = RiskManager()
+    return lambda: risk_manager.add_risks(ctx.records), len(ctx.records)
+
+
+def _update_risk(ctx: Context):
+    risk_manager = ctx.filled_manager()
+    ids = list(risk_manager.risks)
+
+    def run():
+        for risk_id in ids:
+            risk_manager.update_risk(risk_id, probability=50.0, impact=1.0)
+    return run, len(ids)
+
+
+def _delete_risk(ctx: Context):
+    risk_manager = ctx.filled_manager()
+    ids = list(risk_manager.risks)
+
+    def run():
+        for risk_id in ids:
+            risk_manager.delete_risk(risk_id)
+    return run, len(ids)
+
+
+# Filter sind schnell; mehrere Aufrufe je Messung glätten das Rauschen des Timers
+FILTER_LOOPS = 100
+
+
+def _filter(method: str, *args, **kwargs) -> Prepare:
+    def prepare(ctx: Context):
+        bound = getattr(ctx.shared_manager, method)
+
+        def run():
+            for _ in range(FILTER_LOOPS):
+                bound(*args, **kwargs)
+        return run, FILTER_LOOPS
+    return prepare
+
+
+def _save_json(ctx: Context):
+    risk_manager = ctx.shared_manager
+    path = os.path.join(ctx.directory, "save.json")
+    risks = risk_manager.get_all_risks()
+    return lambda: save_register(path, risk_manager.get_project_budget(), risks), len(risks)
+
+
+def _load_json(ctx: Context):
+    if not os.path.exists(ctx.register_path):
+        save_register(ctx.register_path, ctx.project_budget, ctx.shared_manager.get_all_risks())
+    risk_manager = RiskManager()
+    return lambda: load_register(ctx.register_path, risk_manager), len(ctx.records)
+
+
+def _group_positions(ctx: Context):
+    risks = ctx.shared_manager.get_all_risks()
+    risk_matrix = RiskMatrix()
+    return lambda: risk_matrix._group_risks_by_position(risks, ctx.project_budget), len(risks)
+
+
+def _create_matrix(ctx: Context):
+    risks = ctx.shared_manager.get_all_risks()
+    risk_matrix = RiskMatrix()
+    path = os.path.join(ctx.directory, "matrix.png")
+
+    def run():
+        import matplotlib.pyplot as plt
+        risk_matrix.create_matrix(risks, ctx.project_budget, save_path=path)
+        # Figur schließen, damit jede Messung mit einer neuen Figur beginnt
+        plt.close('all')
+    return run, len(risks)
+
+
+# Name -> Vorbereitung; die Reihenfolge ist die Ausgabereihenfolge
+CASES: Dict[str, Prepare] = {
+    'manager.add_risk': _add_risk,
+    'manager.add_risks': _add_risks,
+    'manager.update_risk': _update_risk,
+    'manager.delete_risk': _delete_risk,
+    'filter.get_risks_by_type': _filter('get_risks_by_type', "Project"),
+    'filter.get_risks_by_reporting_level': _filter('get_risks_by_reporting_level', "SteerCo"),
+    'filter.get_high_risks': _filter('get_high_risks'),
+    'filter.get_risks_by_owner': _filter('get_risks_by_owner', "Niemand"),
+    'filter.filter_risks': _filter('filter_risks', risk_type="Business", reporting_level="Program",
+                                   risk_level="Hoch"),
+    'persistence.save_json': _save_json,
+    'persistence.load_json': _load_json,
+    'matrix.group_risks_by_position': _group_positions,
+    'matrix.create_matrix': _create_matrix,
+}
+
+
+def run_case(prepare: Prepare, ctx: Context, repeat: int) -> Dict[str, Any]:
+    """Misst einen Fall repeat mal (Vorbereitung jeweils außerhalb der Messung)"""
+    runs = []
+    operations = 0
+    for _ in range(repeat):
+        func, operations = prepare(ctx)
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    seconds = statistics.median(runs)
+    return {
+        'seconds': seconds,
+        'runs': runs,
+        'operations': operations,
+        'ops_per_second': operations / seconds if seconds > 0 else None
+    }
+
+
+def run_suite(size: int, repeat: int = 5, seed: int = 0, pattern: str = "*", **generator_options) -> Dict[str, Any]:
+    """Führt alle Fälle aus, deren Name auf pattern passt, und liefert das Ergebnis-Dokument"""
+    project_budget = generator_options.pop('project_budget', 100.0)
+    records = generate_records(size, seed=seed, project_budget=project_budget, **generator_options)
+    cases = {}
+    with tempfile.TemporaryDirectory() as directory:
+        ctx = Context(records, project_budget, directory)
+        for name, prepare in CASES.items():
+            if fnmatch.fnmatch(name, pattern):
+                cases[name] = run_case(prepare, ctx, repeat)
+                print(f"{name:40s} {cases[name]['seconds'] * 1000:10.2f} ms", file=sys.stderr)
+    return {
+        'version': RESULT_VERSION,
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': platform.machine()
+        },
+        'parameters': {'size': size, 'repeat': repeat, 'seed': seed, 'project_budget': project_budget,
+                       **generator_options},
+        'cases': cases
+    }
+
+
+# Identische Stände lagen bei wiederholten Läufen bis zu 1.21x auseinander
+DEFAULT_THRESHOLD = 0.3
+
+
+def spread(case: Dict[str, Any]) -> float:
+    """Relative Streuung der Einzelmessungen eines Falls ((max - min) / Median)"""
+    runs = case.get('runs') or []
+    if len(runs) < 2 or not case['seconds']:
+        return 0.0
+    return (max(runs) - min(runs)) / case['seconds']
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Vergleicht die Mediane mit einer Baseline; gibt die regressierten Fälle zurück.
+
+    Ein Fall gilt als regressiert, wenn er um mehr als threshold bzw. mehr als
+    die Streuung seiner Messungen (in Baseline oder aktuellem Lauf) langsamer ist.
+    """
+    if baseline.get('version') != results['version']:
+        raise ValueError("Baseline hat ein anderes Ergebnisformat")
+    if baseline.get('parameters', {}).get('size') != results['parameters']['size']:
+        print("Warnung: Baseline wurde mit anderer Registergröße gemessen", file=sys.stderr)
+    regressions = []
+    for name, case in results['cases'].items():
+        reference = baseline['cases'].get(name)
+        if reference is None or not reference['seconds']:
+            continue
+        ratio = case['seconds'] / reference['seconds']
+        tolerance = max(threshold, spread(reference), spread(case))
+        marker = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:40s} {ratio:6.2f}x {marker}", file=sys.stderr)
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=10000, help="Anzahl synthetischer Risiken")
+    parser.add_argument('--repeat', type=int, default=5, help="Messungen je Fall (Median wird bewertet)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', default="*", help="Muster für Fallnamen, z.B. 'filter.*'")
+    parser.add_argument('--types', type=parse_mix, help="Mischung der Risiko-Typen, z.B. Project=0.6,Business=0.4")
+    parser.add_argument('--reporting-levels', type=parse_mix, help="Mischung der Reporting Levels")
+    parser.add_argument('--probability', choices=PROBABILITY_DISTRIBUTIONS, default="uniform")
+    parser.add_argument('--impact', choices=IMPACT_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument('--output', help="Ergebnisse als JSON hierhin schreiben (sonst stdout)")
+    parser.add_argument('--compare', help="Baseline-JSON, gegen die verglichen wird")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Erlaubte relative Verlangsamung gegenüber der Baseline (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.repeat, args.seed, args.cases, risk_types=args.types,
+                        reporting_levels=args.reporting_levels, probability=args.probability,
+                        impact=args.impact)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} Fälle langsamer als erlaubt: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
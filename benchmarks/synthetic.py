@@ -0,0 +1,78 @@
+"""Synthetische Risikoregister für Benchmarks (reproduzierbar über seed)."""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Standard-Kategorien wie in der GUI (Wert -> Anteil)
+DEFAULT_TYPES = {"Project": 0.6, "Business": 0.4}
+DEFAULT_REPORTING_LEVELS = {"Project": 0.7, "Program": 0.2, "SteerCo": 0.1}
+
+PROBABILITY_DISTRIBUTIONS = ("uniform", "beta")
+IMPACT_DISTRIBUTIONS = ("uniform", "lognormal")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Liest eine Kategorie-Mischung wie "Project=0.6,Business=0.4" """
+    mix = {}
+    for part in text.split(','):
+        name, _, share = part.partition('=')
+        if not name or not share:
+            raise ValueError(f"Ungültige Mischung: {text}")
+        mix[name.strip()] = float(share)
+    return mix
+
+
+def _choice(rng: np.random.Generator, mix: Dict[str, float], n: int) -> List[str]:
+    names = list(mix)
+    shares = np.array([mix[name] for name in names], dtype=float)
+    if (shares < 0).any() or shares.sum() <= 0:
+        raise ValueError("Anteile müssen nicht-negativ sein und dürfen nicht alle 0 sein")
+    return [names[index] for index in rng.choice(len(names), size=n, p=shares / shares.sum())]
+
+
+def _probabilities(rng: np.random.Generator, distribution: str, n: int) -> np.ndarray:
+    """Wahrscheinlichkeiten in Prozent (1-99)"""
+    if distribution == "uniform":
+        values = rng.uniform(0, 1, n)
+    elif distribution == "beta":
+        # Viele unwahrscheinliche, wenige sehr wahrscheinliche Risiken
+        values = rng.beta(2, 5, n)
+    else:
+        raise ValueError(f"Unbekannte Verteilung: {distribution}")
+    return np.round(1 + values * 98, 1)
+
+
+def _impacts(rng: np.random.Generator, distribution: str, n: int, project_budget: float) -> np.ndarray:
+    """Auswirkungen in Mio. € (0.01 bis zum Projektbudget)"""
+    if distribution == "uniform":
+        values = rng.uniform(0, project_budget, n)
+    elif distribution == "lognormal":
+        # Rechtsschief: meist kleine Auswirkungen, einzelne große
+        values = rng.lognormal(np.log(project_budget / 50), 1.0, n)
+    else:
+        raise ValueError(f"Unbekannte Verteilung: {distribution}")
+    return np.round(np.clip(values, 0.01, project_budget), 2)
+
+
+def generate_records(n: int, seed: int = 0, project_budget: float = 100.0,
+                     risk_types: Optional[Dict[str, float]] = None,
+                     reporting_levels: Optional[Dict[str, float]] = None,
+                     probability: str = "uniform", impact: str = "lognormal") -> List[Dict[str, Any]]:
+    """Erzeugt n Datensätze im Format von RiskManager.add_risk (ohne risk_id)"""
+    rng = np.random.default_rng(seed)
+    types = _choice(rng, risk_types or DEFAULT_TYPES, n)
+    levels = _choice(rng, reporting_levels or DEFAULT_REPORTING_LEVELS, n)
+    probabilities = _probabilities(rng, probability, n).tolist()
+    impacts = _impacts(rng, impact, n, project_budget).tolist()
+    return [
+        {
+            'name': f"Risiko {index + 1}",
+            'description': f"Synthetisches Risiko {index + 1}",
+            'probability': probabilities[index],
+            'impact': impacts[index],
+            'reporting_level': levels[index],
+            'risk_type': types[index]
+        }
+        for index in range(n)
+    ]
+
@@ -0,0 +1,234 @@
+"""Kommandozeile für Risikoregister ohne GUI (z.B. für Cronjobs und Pipelines).
+
+    python cli.py score register.json --risk-level Hoch > hohe_risiken.ndjson
+    python cli.py summary register.json.gz --type Project
+    python cli.py summary register.rmsnap
+    python cli.py export register.json matrix.png --dpi 150
+    cat risiken.ndjson | python cli.py stream --budget 10 > bewertet.ndjson
+
+score, summary und stream verarbeiten die Risiken stapelweise und brauchen
+unabhängig von der Registergröße nur konstanten Speicher; tkinter wird nie
+geladen, matplotlib nur für export. Register können JSON-Dateien (auch .gz/.xz)
+oder Binär-Snapshots sein.
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from src.models.risk import Risk
+from src.services.persistence import RegisterReader, record_to_kwargs, risk_to_record
+from src.services.risk_index import normalize_key
+from src.services.snapshot import SnapshotReader, is_snapshot
+
+# Datensätze je Stapel beim Lesen von Registern und NDJSON
+BATCH_SIZE = 1000
+
+
+def _criteria(args) -> Dict[str, Optional[str]]:
+    """Filter wie RiskManager.filter_risks (None = Feld nicht filtern)"""
+    return {'risk_type': args.type, 'reporting_level': args.reporting_level, 'risk_level': args.risk_level}
+
+
+def filter_batch(risks: List[Risk], criteria: Dict[str, Optional[str]]) -> List[Risk]:
+    """Wendet die Filter des RiskManagers auf einen Stapel an (gleiche Schlüssel, Eingabereihenfolge bleibt)"""
+    keys = {field: normalize_key(value) for field, value in criteria.items() if value is not None}
+    if not keys:
+        return risks
+    return [risk for risk in risks
+            if all(normalize_key(getattr(risk, field)) == key for field, key in keys.items())]
+
+
+def scored_record(risk: Risk, project_budget: Optional[float]) -> Dict[str, Any]:
+    """Datensatz eines Risikos mit Erwartungswert, Risiko-Level und Budgetanteil"""
+    record = risk_to_record(risk)
+    record['risk_score'] = risk.risk_score
+    record['risk_level'] = risk.risk_level
+    record['budget_usage_percent'] = risk.impact / project_budget * 100 if project_budget else 0.0
+    return record
+
+
+def open_register(path: str):
+    """Reader für ein JSON-Register oder einen Binär-Snapshot (erkannt am Dateikopf)"""
+    if is_snapshot(path):
+        return SnapshotReader(path, batch_size=BATCH_SIZE)
+    return RegisterReader(path, batch_size=BATCH_SIZE)
+
+
+def register_batches(path: str) -> Iterator[List[Risk]]:
+    """Liest ein Register (auch .gz/.xz oder Snapshot) stapelweise als Risiken"""
+    with open_register(path) as reader:
+        for batch in reader.batches():
+            yield [_to_risk(record) for record in batch]
+
+
+def _to_risk(record: Dict[str, Any], default_id: int = 0) -> Risk:
+    kwargs = record_to_kwargs(record)
+    risk_id = kwargs.pop('risk_id')
+    return Risk(id=default_id if risk_id is None else risk_id, **kwargs)
+
+
+class NdjsonReader:
+    """Liest NDJSON-Datensätze stapelweise; ungültige Zeilen werden gemeldet und übersprungen.
+
+    Datensätze ohne id erhalten ihre Zeilennummer als ID.
+    """
+
+    def __init__(self, lines: Iterable[str], errors: TextIO, batch_size: int = BATCH_SIZE):
+        self.lines = lines
+        self.errors = errors
+        self.batch_size = batch_size
+        self.failed = 0
+
+    def batches(self) -> Iterator[List[Risk]]:
+        batch: List[Risk] = []
+        for line_number, line in enumerate(self.lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(_to_risk(json.loads(line), default_id=line_number))
+            except (ValueError, KeyError, TypeError) as e:
+                self.failed += 1
+                print(f"Zeile {line_number}: ungültiger Datensatz ({e})", file=self.errors)
+                continue
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _write_ndjson(batches: Iterable[List[Risk]], criteria: Dict[str, Optional[str]],
+                  project_budget: Optional[float], out: TextIO) -> int:
+    count = 0
+    for batch in batches:
+        risks = filter_batch(batch, criteria)
+        out.write(''.join(json.dumps(scored_record(risk, project_budget), ensure_ascii=False) + '\n'
+                          for risk in risks))
+        count += len(risks)
+    return count
+
+
+def _project_budget(args, path: str) -> Optional[float]:
+    """Budget aus --budget oder aus dem Register (steht ggf. erst hinter den Risiken)"""
+    if args.budget is not None:
+        return args.budget
+    if is_snapshot(path):
+        with SnapshotReader(path) as reader:
+            return reader.project_budget
+    with RegisterReader(path) as reader:
+        for _ in reader.batches():
+            if reader.project_budget is not None:
+                break
+        return reader.project_budget
+
+
+def cmd_score(args, out: TextIO) -> int:
+    project_budget = _project_budget(args, args.register)
+    _write_ndjson(register_batches(args.register), _criteria(args), project_budget, out)
+    return 0
+
+
+def cmd_stream(args, out: TextIO) -> int:
+    reader = NdjsonReader(sys.stdin, sys.stderr)
+    _write_ndjson(reader.batches(), _criteria(args), args.budget, out)
+    return 1 if reader.failed else 0
+
+
+def cmd_summary(args, out: TextIO) -> int:
+    criteria = _criteria(args)
+    count = 0
+    total_impact = 0.0
+    expected_value = 0.0
+    levels: Counter = Counter()
+    types: Counter = Counter()
+    reporting_levels: Counter = Counter()
+    with open_register(args.register) as reader:
+        for batch in reader.batches():
+            for risk in filter_batch([_to_risk(record) for record in batch], criteria):
+                count += 1
+                total_impact += risk.impact
+                expected_value += risk.risk_score
+                levels[risk.risk_level] += 1
+                types[risk.risk_type] += 1
+                reporting_levels[risk.reporting_level] += 1
+        project_budget = args.budget if args.budget is not None else reader.project_budget
+    summary = {
+        'project_budget': project_budget,
+        'count': count,
+        'total_impact': total_impact,
+        'expected_value': expected_value,
+        'budget_usage_percent': total_impact / project_budget * 100 if project_budget else 0.0,
+        'risk_levels': dict(levels),
+        'risk_types': dict(types),
+        'reporting_levels': dict(reporting_levels)
+    }
+    out.write(json.dumps(summary, indent=4, ensure_ascii=False) + '\n')
+    return 0
+
+
+def cmd_export(args, out: TextIO) -> int:
+    # Die Matrix braucht alle Risiken zugleich; matplotlib erst hier laden
+    from src.services.risk_manager import RiskManager
+    from src.services.snapshot import load_file
+    from src.visualization.risk_matrix import RiskMatrix
+
+    risk_manager = RiskManager()
+    load_file(args.register, risk_manager)
+    if args.budget is not None:
+        risk_manager.set_project_budget(args.budget)
+    risks = risk_manager.filter_risks(**_criteria(args))
+    RiskMatrix().export_matrix(risks, risk_manager.get_project_budget(), args.output, title=args.title,
+                               dpi=args.dpi, file_format=args.format)
+    out.write(f"{len(risks)} Risiken nach {args.output} exportiert\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description="Risikoregister ohne GUI verarbeiten")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument('--type', help="nur Risiken dieses Risiko-Typs")
+    filters.add_argument('--reporting-level', help="nur Risiken dieses Reporting Levels")
+    filters.add_argument('--risk-level', help="nur Risiken dieses Risiko-Levels (Niedrig, Mittel, Hoch)")
+    filters.add_argument('--budget', type=float, help="Projektbudget (Mio. €), überschreibt das des Registers")
+
+    score = subparsers.add_parser('score', parents=[filters],
+                                  help="Register als NDJSON mit Erwartungswert, Level und Budgetanteil ausgeben")
+    score.add_argument('register')
+    score.set_defaults(handler=cmd_score)
+
+    summary = subparsers.add_parser('summary', parents=[filters], help="Kennzahlen eines Registers als JSON")
+    summary.add_argument('register')
+    summary.set_defaults(handler=cmd_summary)
+
+    export = subparsers.add_parser('export', parents=[filters], help="Risiko-Matrix als PNG, SVG oder PDF")
+    export.add_argument('register')
+    export.add_argument('output')
+    export.add_argument('--title', default="Risiko Matrix")
+    export.add_argument('--dpi', type=float, default=300)
+    export.add_argument('--format', choices=('png', 'svg', 'pdf'), help="Standard: aus der Dateiendung")
+    export.set_defaults(handler=cmd_export)
+
+    stream = subparsers.add_parser('stream', parents=[filters],
+                                   help="NDJSON-Datensätze von stdin bewertet und gefiltert nach stdout")
+    stream.set_defaults(handler=cmd_stream)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args, sys.stdout)
+    except BrokenPipeError:
+        # Ausgabe wurde vorzeitig geschlossen (z.B. durch head)
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
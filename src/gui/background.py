@@ -0,0 +1,108 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+# Abstand, in dem der Hauptthread Fortschritt und Ergebnis abholt
+POLL_INTERVAL_MS = 50
+
+
+class TaskCancelled(Exception):
+    """Die Hintergrundaufgabe wurde abgebrochen"""
+
+
+class BackgroundTask:
+    """Führt eine Funktion in einem Worker-Thread aus, ohne die Oberfläche zu blockieren.
+
+    Die Funktion erhält die Aufgabe und meldet mit report() ihren Fortschritt
+    (0-1); nach cancel() löst der nächste report()-Aufruf TaskCancelled aus.
+    Fortschritt und Ergebnis laufen über eine Queue und werden per after() im
+    Tk-Hauptthread abgeholt, nur dort werden die Callbacks aufgerufen.
+    """
+
+    def __init__(self, widget, work: Callable[['BackgroundTask'], Any], on_done: Callable[[Any], None],
+                 on_error: Callable[[BaseException], None],
+                 on_progress: Optional[Callable[[float], None]] = None, poll_ms: int = POLL_INTERVAL_MS):
+        self.widget = widget
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> None:
+        self._thread.start()
+        self.widget.after(self.poll_ms, self._poll)
+
+    def cancel(self) -> None:
+        """Fordert den Abbruch an; wirksam beim nächsten report() der Funktion"""
+        self._cancel.set()
+
+    def report(self, progress: float) -> None:
+        """Meldet den Fortschritt (aus dem Worker-Thread)"""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        self._queue.put(('progress', progress))
+
+    def _run(self) -> None:
+        try:
+            result = self.work(self)
+        except BaseException as e:
+            self._queue.put(('error', e))
+        else:
+            self._queue.put(('done', result))
+
+    def _poll(self) -> None:
+        progress = None
+        while True:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                progress = value
+                continue
+            if kind == 'done':
+                self.on_done(value)
+            else:
+                self.on_error(value)
+            return
+        # Nur der letzte Stand seit dem letzten Abholen wird angezeigt
+        if progress is not None and self.on_progress is not None:
+            self.on_progress(progress)
+        self.widget.after(self.poll_ms, self._poll)
+
+
+class ProgressDialog(tk.Toplevel):
+    """Modaler Fortschrittsdialog mit Abbrechen-Schaltfläche"""
+
+    def __init__(self, master, title: str, on_cancel: Optional[Callable[[], None]] = None):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        self.transient(master)
+        self.on_cancel = on_cancel
+
+        self.progress = ttk.Progressbar(self, length=300, maximum=100, mode="determinate")
+        self.progress.pack(padx=20, pady=(20, 10))
+        self.cancel_button = ttk.Button(self, text="Abbrechen", command=self.cancel)
+        self.cancel_button.pack(pady=(0, 15))
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        # Keine Änderungen am Register, solange die Aufgabe läuft
+        self.grab_set()
+
+    def set_progress(self, progress: float) -> None:
+        self.progress["value"] = 100 * progress
+
+    def cancel(self) -> None:
+        self.cancel_button.configure(text="Wird abgebrochen...", state="disabled")
+        if self.on_cancel is not None:
+            self.on_cancel()
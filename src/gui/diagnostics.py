@@ -0,0 +1,90 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from src.services.instrumentation import Instrumentation, instrumentation
+
+# Aktualisierungsintervall der Anzeige, solange das Fenster offen ist
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Zeigt die Messwerte der Instrumentierung (Aufrufe, Laufzeiten, Speicherspitzen)"""
+
+    COLUMNS = ("Operation", "Aufrufe", "Gesamt (ms)", "Mittel (ms)", "p95 (ms)", "Max (ms)", "Speicher (KB)")
+
+    def __init__(self, master, source: Instrumentation = instrumentation):
+        super().__init__(master)
+        self.title("Diagnose")
+        self.geometry("800x350")
+        self.source = source
+        self._refresh_job = None
+
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        self.enabled_var = tk.BooleanVar(value=source.enabled)
+        self.memory_var = tk.BooleanVar(value=source.memory)
+        ttk.Checkbutton(controls, text="Messung aktiv", variable=self.enabled_var,
+                        command=self.apply_settings).pack(side=tk.LEFT)
+        ttk.Checkbutton(controls, text="Speicher messen (tracemalloc, langsamer)", variable=self.memory_var,
+                        command=self.apply_settings).pack(side=tk.LEFT, padx=10)
+        ttk.Button(controls, text="Zurücksetzen", command=self.reset).pack(side=tk.RIGHT)
+        ttk.Button(controls, text="Chrome-Trace speichern", command=self.save_trace).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(controls, text="Als JSON speichern", command=self.save_json).pack(side=tk.RIGHT)
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings")
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=90, anchor=tk.E)
+        self.tree.column("Operation", width=240, anchor=tk.W)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.bind("<Destroy>", self._on_destroy)
+        self.refresh()
+
+    def apply_settings(self):
+        if self.enabled_var.get():
+            self.source.enable(memory=self.memory_var.get())
+        else:
+            self.source.disable()
+            self.memory_var.set(False)
+
+    def refresh(self):
+        """Überträgt die aktuellen Messwerte in die Tabelle und plant die nächste Aktualisierung"""
+        self.tree.delete(*self.tree.get_children())
+        for name, stats in sorted(self.source.snapshot().items()):
+            self.tree.insert('', 'end', values=(
+                name,
+                stats.count,
+                f"{stats.total_seconds * 1000:.1f}",
+                f"{stats.mean_seconds * 1000:.3f}",
+                f"{stats.percentile(0.95) * 1000:.3f}",
+                f"{stats.max_seconds * 1000:.1f}",
+                "" if stats.peak_bytes is None else f"{stats.peak_bytes / 1024:.0f}"
+            ))
+        self._refresh_job = self.after(REFRESH_INTERVAL_MS, self.refresh)
+
+    def reset(self):
+        self.source.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def save_json(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON Dateien", "*.json")])
+        if path:
+            self._save(self.source.dump_json, path)
+
+    def save_trace(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("Chrome-Trace", "*.json")])
+        if path:
+            self._save(self.source.dump_chrome_trace, path)
+
+    def _save(self, dump, path):
+        try:
+            dump(path)
+        except OSError as e:
+            messagebox.showerror("Fehler", f"Fehler beim Speichern: {str(e)}", parent=self)
+
+    def _on_destroy(self, event):
+        if event.widget is self and self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
@@ -0,0 +1,72 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from src.services.risk_manager import RiskManager
+from src.visualization.risk_matrix import RiskMatrix
+
+# Verzögerung, mit der Änderungen gesammelt werden, bevor neu gezeichnet wird
+REDRAW_DELAY_MS = 50
+
+
+class MatrixPanel(ttk.Frame):
+    """Im Hauptfenster eingebettete Risiko-Matrix, die dem Register live folgt.
+
+    Änderungsereignisse des RiskManagers starten einen Timer (after()); erst
+    wenn für REDRAW_DELAY_MS keine weitere Änderung kam, wird neu gezeichnet.
+    Die Zellbelegung wird direkt aus den Spalten des RiskStore berechnet, und
+    nur die Beschriftungen werden ersetzt; der Hintergrund bleibt stehen.
+    """
+
+    def __init__(self, master, risk_manager: RiskManager, risk_matrix: RiskMatrix = None,
+                 title: str = "Risiko Matrix", delay_ms: int = REDRAW_DELAY_MS):
+        super().__init__(master)
+        self.risk_manager = risk_manager
+        # Im kleineren Panel passen weniger Einzelbeschriftungen in eine Zelle
+        self.risk_matrix = risk_matrix or RiskMatrix(density_threshold=9)
+        self.title = title
+        self.delay_ms = delay_ms
+        self._redraw_job = None
+
+        figure = Figure(figsize=(5, 5), dpi=100)
+        self.matrix_figure = self.risk_matrix.setup_figure(figure)
+        self.canvas = FigureCanvasTkAgg(figure, master=self)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        self._unsubscribe = risk_manager.events.subscribe(self.on_risk_events)
+        self.bind("<Destroy>", self._on_destroy)
+        self.redraw()
+
+    def on_risk_events(self, events):
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        """Plant ein Neuzeichnen; weitere Aufrufe innerhalb der Verzögerung verschieben es"""
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+        self._redraw_job = self.after(self.delay_ms, self.redraw)
+
+    def redraw(self):
+        """Berechnet die Zellbelegung neu und zeichnet die geänderten Beschriftungen"""
+        self._redraw_job = None
+        # Ohne Budget leere Matrix zeigen (get_project_budget würde ValueError auslösen)
+        project_budget = self.risk_manager.project_budget
+        store = self.risk_manager.store
+        if project_budget:
+            # Nach ID sortiert, damit die Reihenfolge in den Zellen stabil bleibt
+            order = np.argsort(store.ids, kind='stable')
+            positions, summaries = self.risk_matrix.layout_cells(
+                store.ids[order], store.probabilities[order], store.impacts[order], project_budget)
+        else:
+            positions, summaries = {}, {}
+        self.risk_matrix.update_figure(self.matrix_figure, positions, self.title, summaries)
+        self.canvas.draw_idle()
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        self._unsubscribe()
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+            self._redraw_job = None
@@ -1,24 +1,61 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
+from src.services.events import ADDED, BULK_LOADED, DELETED, UPDATED, coalesce
+from src.services.risk_index import normalize_key
 from src.services.risk_manager import RiskManager
-from src.visualization.risk_matrix import RiskMatrix
-import json
+from src.services.snapshot import load_file, save_file
+from src.services.sort_index import SORT_FIELDS
+from src.gui.background import BackgroundTask, ProgressDialog, TaskCancelled
+from src.gui.diagnostics import DiagnosticsWindow
+from src.gui.virtual_table import VirtualTable
+
+REGISTER_FILETYPES = [
+    ("JSON Dateien", "*.json"),
+    ("Komprimierte JSON Dateien", "*.json.gz *.json.xz"),
+    ("Binär-Snapshot (schnelles Laden)", "*.rmsnap"),
+    ("Alle Dateien", "*.*")
+]
+
+# Sortierfeld im RiskManager je Tabellenspalte (siehe services.sort_index)
+SORT_COLUMNS = {
+    "ID": 'id',
+    "Name": 'name',
+    "Beschreibung": 'description',
+    "Wahrscheinlichkeit": 'probability',
+    "Auswirkung": 'impact',
+    "Erwartungswert": 'risk_score',
+    "Reporting Level": 'reporting_level',
+    "Risiko-Typ": 'risk_type',
+    "Risiko-Level": 'risk_level'
+}
+
+# Filterauswahl ohne Einschränkung
+ALL_VALUES = "Alle"
 
 class RiskManagementApp(tk.Frame):
-    def __init__(self, master):
+    def __init__(self, master, project_budget=None):
         super().__init__(master)
         self.master = master
         self.master.title("Risikomanagement")
         self.risk_manager = RiskManager()
-        self.risk_matrix = RiskMatrix()
+        # Matrix-Export und eingebettete Matrix werden erst beim ersten Gebrauch erzeugt,
+        # damit matplotlib den Start des Fensters nicht verzögert
+        self._risk_matrix = None
+        self.matrix_panel = None
+        # Aktuelle Sortierung der Tabelle (Spalte, absteigend); None = Einfügereihenfolge
+        self.sort_column = None
+        self.sort_descending = False
         
         # Dropdown-Optionen
         self.reporting_levels = ["Project", "Program", "SteerCo"]
         self.risk_types = ["Project", "Business"]
         
-        # Projektbudget beim Start abfragen
-        self.get_project_budget()
+        # Projektbudget beim Start abfragen (entfällt, wenn es übergeben wurde)
+        if project_budget is None:
+            self.get_project_budget()
+        else:
+            self.risk_manager.set_project_budget(project_budget)
         
         # Hauptfenster-Konfiguration
         self.master.geometry("1000x600")
@@ -27,6 +64,18 @@ class RiskManagementApp(tk.Frame):
         self.create_menu()
         self.create_main_layout()
         
+        # Änderungen am Register gesammelt (einmal pro Idle-Zyklus) in die Tabelle übernehmen
+        self._pending_events = []
+        self._events_scheduled = False
+        self.risk_manager.events.subscribe(self.on_risk_events)
+        
+    @property
+    def risk_matrix(self):
+        if self._risk_matrix is None:
+            from src.visualization.risk_matrix import RiskMatrix
+            self._risk_matrix = RiskMatrix()
+        return self._risk_matrix
+
     def get_project_budget(self):
         """Fragt das Projektbudget beim Start ab"""
         dialog = tk.Toplevel(self.master)
@@ -64,6 +113,7 @@ class RiskManagementApp(tk.Frame):
         file_menu.add_command(label="Projektbudget ändern", command=self.change_project_budget)
         file_menu.add_command(label="Speichern", command=self.save_data)
         file_menu.add_command(label="Laden", command=self.load_data)
+        file_menu.add_command(label="Powermatrix exportieren", command=self.export_power_matrix)
         file_menu.add_separator()
         file_menu.add_command(label="Beenden", command=self.master.quit)
         
@@ -73,6 +123,15 @@ class RiskManagementApp(tk.Frame):
         edit_menu.add_command(label="Ausgewähltes Risiko bearbeiten", 
                             command=lambda: self.edit_risk(None))
         
+        # Extras-Menü
+        extras_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Extras", menu=extras_menu)
+        extras_menu.add_command(label="Diagnose", command=self.show_diagnostics)
+        
+    def show_diagnostics(self):
+        """Öffnet das Diagnosefenster (Messung lässt sich dort ein- und ausschalten)"""
+        DiagnosticsWindow(self.master)
+        
     def create_main_layout(self):
         """Erstellt das Hauptlayout"""
         # Eingabeformular
@@ -134,25 +193,30 @@ class RiskManagementApp(tk.Frame):
         list_frame = ttk.Frame(self.master)
         list_frame.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
         
-        # Treeview für Risiken
+        # Filter über der Tabelle
+        filter_frame = ttk.Frame(list_frame)
+        filter_frame.grid(row=0, column=0, sticky="w", pady=(0, 5))
+        self.type_filter = tk.StringVar(value=ALL_VALUES)
+        self.reporting_filter = tk.StringVar(value=ALL_VALUES)
+        for label, variable, values in (("Risiko-Typ:", self.type_filter, self.risk_types),
+                                        ("Reporting Level:", self.reporting_filter, self.reporting_levels)):
+            ttk.Label(filter_frame, text=label).pack(side=tk.LEFT, padx=(0, 5))
+            dropdown = ttk.Combobox(filter_frame, textvariable=variable, values=[ALL_VALUES] + values,
+                                    state="readonly", width=12)
+            dropdown.pack(side=tk.LEFT, padx=(0, 15))
+            dropdown.bind("<<ComboboxSelected>>", lambda event: self.refresh_table_order())
+        
+        # Virtuelle Tabelle: nur die sichtbaren Zeilen liegen im Treeview
         columns = ("ID", "Name", "Beschreibung", "Wahrscheinlichkeit", "Auswirkung", 
                   "Erwartungswert", "Reporting Level", "Risiko-Typ", "Risiko-Level")
-        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.risk_table = VirtualTable(list_frame, columns, self.row_values)
+        self.risk_table.grid(row=1, column=0, sticky="nsew")
+        self.tree = self.risk_table.tree
         
         # Spaltenüberschriften und Sortierungsfunktion hinzufügen
         for col in columns:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_treeview(c))
         
-        # Scrollbars
-        vsb = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(list_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        
-        # Treeview-Layout
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        
         # Kontextmenü für Treeview
         context_menu = tk.Menu(self.master, tearoff=0)
         context_menu.add_command(label="Bearbeiten", 
@@ -161,7 +225,7 @@ class RiskManagementApp(tk.Frame):
                                command=self.delete_selected_risk)
         
         def show_context_menu(event):
-            if self.tree.selection():  # Nur wenn ein Item ausgewählt ist
+            if self.risk_table.selected_id() is not None:  # Nur wenn ein Risiko ausgewählt ist
                 context_menu.post(event.x_root, event.y_root)
         
         # Bindings
@@ -169,7 +233,7 @@ class RiskManagementApp(tk.Frame):
         self.tree.bind("<Button-3>", show_context_menu)  # Rechtsklick
             
         # Grid-Konfiguration für list_frame
-        list_frame.grid_rowconfigure(0, weight=1)
+        list_frame.grid_rowconfigure(1, weight=1)
         list_frame.grid_columnconfigure(0, weight=1)
         
     def create_matrix_button(self):
@@ -178,10 +242,28 @@ class RiskManagementApp(tk.Frame):
                   command=self.show_power_matrix).grid(row=2, column=0, pady=10)
     
     def show_power_matrix(self):
-        """Zeigt die Risiko-Matrix an"""
-        risks = self.risk_manager.get_all_risks()
-        project_budget = self.risk_manager.get_project_budget()
-        self.risk_matrix.create_matrix(risks, project_budget, title="Risiko Matrix")
+        """Blendet die live aktualisierte Risiko-Matrix neben der Tabelle ein"""
+        if self.matrix_panel is None:
+            from src.gui.matrix_panel import MatrixPanel
+            self.matrix_panel = MatrixPanel(self.master, self.risk_manager)
+            self.matrix_panel.grid(row=0, column=1, rowspan=3, padx=10, pady=5, sticky="nsew")
+            self.master.grid_columnconfigure(1, weight=1)
+        else:
+            self.matrix_panel.redraw()
+
+    def export_power_matrix(self):
+        """Exportiert die Risiko-Matrix als PNG, SVG oder PDF"""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG", "*.png"), ("SVG", "*.svg"), ("PDF", "*.pdf")]
+        )
+        if not path:
+            return
+        try:
+            self.risk_matrix.export_matrix(self.risk_manager.get_all_risks(),
+                                           self.risk_manager.get_project_budget(), path)
+        except Exception as e:
+            messagebox.showerror("Fehler", f"Fehler beim Exportieren: {str(e)}")
 
     def add_risk(self):
         """Fügt ein neues Risiko hinzu"""
@@ -202,8 +284,8 @@ class RiskManagementApp(tk.Frame):
             if impact < 0:
                 raise ValueError("Auswirkung muss positiv sein")
             
-            # Risiko hinzufügen
-            risk = self.risk_manager.add_risk(
+            # Risiko hinzufügen (die Tabelle folgt über das Änderungsereignis)
+            self.risk_manager.add_risk(
                 name=name,
                 description=description,
                 probability=probability,
@@ -212,22 +294,6 @@ class RiskManagementApp(tk.Frame):
                 risk_type=risk_type
             )
             
-            # Erwartungswert berechnen
-            expected_value = (probability * impact) / 100  # Wahrscheinlichkeit ist in Prozent
-            
-            # Aktualisiere Tabelle
-            self.tree.insert('', 'end', values=(
-                f"R-{risk.id}",  # Prefix "R-" hinzugefügt
-                risk.name,
-                risk.description,
-                f"{risk.probability:.1f}",
-                f"{risk.impact:.2f}",
-                f"{expected_value:.2f}",
-                risk.reporting_level,
-                risk.risk_type,
-                risk.risk_level
-            ))
-            
             # Felder leeren
             for entry in self.entries.values():
                 entry.delete(0, 'end')
@@ -259,120 +325,106 @@ class RiskManagementApp(tk.Frame):
         ttk.Label(details_window, text=f"Risk-Level: {risk.risk_level}").pack(pady=5)
     
     def save_data(self):
-        """Speichert alle Risiken in eine JSON-Datei mit Dateiauswahl"""
+        """Speichert alle Risiken in eine JSON-Datei mit Dateiauswahl (im Hintergrund)"""
         try:
             # Dateiauswahl-Dialog öffnen
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".json",
-                filetypes=[("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
+                filetypes=REGISTER_FILETYPES,
                 title="Risiken speichern unter"
             )
             
             if not filepath:  # Wenn Benutzer abbricht
                 return
             
-            risks_data = []
-            for risk in self.risk_manager.risks.values():
-                risks_data.append({
-                    'id': risk.id,
-                    'name': risk.name,
-                    'description': risk.description,
-                    'probability': risk.probability,
-                    'impact': risk.impact,
-                    'reporting_level': risk.reporting_level,
-                    'risk_type': risk.risk_type
-                })
-            
-            data = {
-                'project_budget': self.risk_manager.get_project_budget(),
-                'risks': risks_data
-            }
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-                
-            messagebox.showinfo("Erfolg", "Daten wurden erfolgreich gespeichert")
+            # Stand zum Zeitpunkt des Speicherns; der Dialog sperrt Änderungen bis zum Ende
+            project_budget = self.risk_manager.get_project_budget()
+            risks = self.risk_manager.get_all_risks()
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Speichern: {str(e)}")
+            return
+        
+        def work(task):
+            def tracked():
+                for index, risk in enumerate(risks):
+                    if index % 1000 == 0:
+                        task.report(index / len(risks))
+                    yield risk
+            # Datensätze streamen; Format und Kompression ergeben sich aus der Dateiendung (.gz/.xz/.rmsnap)
+            return save_file(filepath, project_budget, tracked())
+        
+        def done(count):
+            messagebox.showinfo("Erfolg", "Daten wurden erfolgreich gespeichert")
+        
+        self.run_in_background("Risiken speichern", work, done, "Fehler beim Speichern")
 
     def load_data(self):
-        """Lädt Risiken aus einer JSON-Datei mit Dateiauswahl"""
-        try:
-            # Dateiauswahl-Dialog öffnen
-            filepath = filedialog.askopenfilename(
-                filetypes=[("JSON Dateien", "*.json"), ("Alle Dateien", "*.*")],
-                title="Risiken laden"
-            )
-            
-            if not filepath:  # Wenn Benutzer abbricht
-                return
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Projektbudget setzen
-            self.risk_manager.set_project_budget(data['project_budget'])
-            
-            # Bestehende Risiken löschen
-            self.risk_manager.risks.clear()
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Neue Risiken laden
-            for risk_data in data['risks']:
-                risk = self.risk_manager.add_risk(
-                    name=risk_data['name'],
-                    description=risk_data['description'],
-                    probability=risk_data['probability'],
-                    impact=risk_data['impact'],
-                    reporting_level=risk_data['reporting_level'],
-                    risk_type=risk_data['risk_type']
-                )
-                
-                # Erwartungswert berechnen
-                expected_value = (risk.probability * risk.impact) / 100
-                
-                # Risiko zur Tabelle hinzufügen
-                self.tree.insert('', 'end', values=(
-                    f"R-{risk.id}",  # Prefix "R-" hinzugefügt
-                    risk.name,
-                    risk.description,
-                    f"{risk.probability:.1f}",
-                    f"{risk.impact:.2f}",
-                    f"{expected_value:.2f}",
-                    risk.reporting_level,
-                    risk.risk_type,
-                    risk.risk_level
-                ))
-            
+        """Lädt Risiken aus einer JSON-Datei oder einem Snapshot mit Dateiauswahl (im Hintergrund)"""
+        # Dateiauswahl-Dialog öffnen
+        filepath = filedialog.askopenfilename(
+            filetypes=REGISTER_FILETYPES,
+            title="Risiken laden"
+        )
+        
+        if not filepath:  # Wenn Benutzer abbricht
+            return
+        
+        def work(task):
+            # In ein separates Register laden; das bestehende bleibt bei Fehler oder Abbruch unverändert
+            staging = RiskManager()
+            load_file(filepath, staging, on_batch=lambda added, progress: task.report(progress))
+            return staging
+        
+        def done(staging):
+            # Register in einem Schritt austauschen; die Tabelle wird einmal neu aufgebaut
+            self.risk_manager.replace_register(staging)
             messagebox.showinfo("Erfolg", "Daten wurden erfolgreich geladen")
-        except FileNotFoundError:
-            messagebox.showwarning("Warnung", "Datei nicht gefunden")
-        except Exception as e:
-            messagebox.showerror("Fehler", f"Fehler beim Laden: {str(e)}")
+        
+        self.run_in_background("Risiken laden", work, done, "Fehler beim Laden")
+
+    def run_in_background(self, title, work, on_done, error_message):
+        """Führt work(task) in einem Worker-Thread aus und zeigt solange einen Fortschrittsdialog"""
+        dialog = ProgressDialog(self.master, title)
+        
+        def done(result):
+            dialog.destroy()
+            # Abbruch nach dem letzten report(): Ergebnis verwerfen, Register bleibt unverändert
+            if task.cancelled:
+                return
+            on_done(result)
+        
+        def failed(error):
+            dialog.destroy()
+            if isinstance(error, TaskCancelled):
+                return
+            if isinstance(error, FileNotFoundError):
+                messagebox.showwarning("Warnung", "Datei nicht gefunden")
+            else:
+                messagebox.showerror("Fehler", f"{error_message}: {str(error)}")
+        
+        task = BackgroundTask(self.master, work, done, failed, on_progress=dialog.set_progress)
+        dialog.on_cancel = task.cancel
+        task.start()
 
     def on_risk_select(self, event):
         try:
-            selected_item = self.tree.selection()[0]
-            risk_id = int(self.tree.item(selected_item)['values'][0].replace('R-', ''))
+            risk_id = self.risk_table.selected_id()
+            if risk_id is None:
+                return  # Nichts ausgewählt
             risk = self.risk_manager.get_risk(risk_id)
             if risk:
                 self.show_risk_details(risk)
-        except IndexError:
-            pass  # Nichts ausgewählt
         except ValueError as e:
             messagebox.showerror("Fehler", str(e))
 
     def edit_risk(self, event):
         """Öffnet Dialog zum Bearbeiten eines Risikos"""
-        selection = self.tree.selection()
-        if not selection:
+        risk_id = self.risk_table.selected_id()
+        if risk_id is None:
             messagebox.showwarning("Warnung", "Bitte wählen Sie ein Risiko aus")
             return
             
-        item = selection[0]
-        risk_id = int(self.tree.item(item)['values'][0].replace('R-', ''))  # "R-" Prefix entfernen
-        risk = self.risk_manager.risks[risk_id]
+        risk = self.risk_manager.get_risk(risk_id)
         
         # Dialog erstellen
         dialog = tk.Toplevel(self.master)
@@ -435,30 +487,16 @@ class RiskManagementApp(tk.Frame):
                 if impact < 0:
                     raise ValueError("Auswirkung muss positiv sein")
                 
-                # Risiko aktualisieren
-                risk.name = name
-                risk.description = description
-                risk.probability = probability
-                risk.impact = impact
-                risk.reporting_level = reporting_level
-                risk.risk_type = risk_type
-                risk._risk_level = risk._calculate_risk_level()
-                
-                # Erwartungswert berechnen
-                expected_value = (probability * impact) / 100  # Wahrscheinlichkeit ist in Prozent
-                
-                # Treeview aktualisieren
-                self.tree.item(item, values=(
-                    f"R-{risk.id}",  # Prefix "R-" hinzugefügt
-                    risk.name,
-                    risk.description,
-                    f"{risk.probability:.1f}",
-                    f"{risk.impact:.2f}",
-                    f"{expected_value:.2f}",
-                    risk.reporting_level,
-                    risk.risk_type,
-                    risk.risk_level
-                ))
+                # Risiko über den RiskManager aktualisieren (hält die Indizes aktuell)
+                self.risk_manager.update_risk(
+                    risk_id,
+                    name=name,
+                    description=description,
+                    probability=probability,
+                    impact=impact,
+                    reporting_level=reporting_level,
+                    risk_type=risk_type
+                )
                 
                 dialog.destroy()
                 messagebox.showinfo("Erfolg", "Risiko wurde aktualisiert")
@@ -502,103 +540,118 @@ class RiskManagementApp(tk.Frame):
         ttk.Button(dialog, text="Aktualisieren", command=update_budget).pack(pady=10)
 
     def sort_treeview(self, col):
-        """Sortiert die Treeview-Spalte auf- oder absteigend"""
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children('')]
-        
-        if hasattr(self, '_last_sort_col') and self._last_sort_col == col:
-            items.reverse()
-            self._last_sort_col = None
-        else:
-            if col == "ID":  # Spezielle Behandlung für ID-Spalte mit "R-" Prefix
-                items.sort(key=lambda x: int(x[0].replace('R-', '')))
-            elif col in ["Wahrscheinlichkeit", "Auswirkung", "Erwartungswert"]:
-                items.sort(key=lambda x: float(x[0]) if x[0] else 0)
-            else:
-                items.sort(key=lambda x: x[0].lower())
-            self._last_sort_col = col
-        
-        for index, (val, item) in enumerate(items):
-            self.tree.move(item, '', index)
+        """Sortiert die Tabelle nach einer Spalte; erneuter Klick kehrt die Richtung um"""
+        column = SORT_COLUMNS[col]
+        self.sort_descending = column == self.sort_column and not self.sort_descending
+        self.sort_column = column
+        self.refresh_table_order()
 
-    def update_power_matrix(self):
-        """Aktualisiert die Power-Matrix"""
-        # Matrix leeren
-        for widget in self.matrix_frame.winfo_children():
-            widget.destroy()
-        
-        # Matrix neu aufbauen
-        for i in range(11):
-            for j in range(11):
-                cell = tk.Frame(self.matrix_frame, width=40, height=40, 
-                              bg=self.get_cell_color(10-i, j))
-                cell.grid(row=i, column=j)
-                cell.grid_propagate(False)
-                
-                # Risiken für diese Zelle finden
-                risks_in_cell = []
-                for item in self.tree.get_children():
-                    values = self.tree.item(item)['values']
-                    prob = float(values[3])  # Wahrscheinlichkeit
-                    impact = float(values[4])  # Auswirkung
-                    
-                    # Prüfen ob Risiko in diese Zelle gehört
-                    if (prob // 10 == j and impact // 10 == 10-i):
-                        risks_in_cell.append(f"R-{values[0]}")  # ID mit "R-" Präfix
-                
-                # Risiko-IDs in der Zelle anzeigen
-                if risks_in_cell:
-                    label = tk.Label(cell, text="\n".join(risks_in_cell),
-                                   bg='red', fg='white',  # Weiße Schrift auf rotem Grund
-                                   font=('Arial', 8))
-                    label.place(relx=0.5, rely=0.5, anchor='center')
+    def table_filter(self):
+        """Aktive Filter der Tabelle als Argumente für RiskManager.sorted_ids"""
+        return {
+            'risk_type': None if self.type_filter.get() == ALL_VALUES else self.type_filter.get(),
+            'reporting_level': None if self.reporting_filter.get() == ALL_VALUES else self.reporting_filter.get()
+        }
 
-    def create_risk_list_frame(self):
-        list_frame = ttk.Frame(self)
-        
-        # Erstelle Scrollbare Liste
-        self.risk_listbox = tk.Listbox(list_frame, width=50)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.risk_listbox.yview)
-        self.risk_listbox.configure(yscrollcommand=scrollbar.set)
-        
-        # Lösch-Button
-        delete_button = ttk.Button(
-            list_frame, 
-            text="Ausgewähltes Risiko löschen",
-            command=self.delete_selected_risk
-        )
-        
-        # Layout
-        self.risk_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        delete_button.pack(side=tk.BOTTOM, pady=5)
-        
-        return list_frame
+    def table_ordered(self):
+        """True, wenn die Tabelle sortiert oder gefiltert ist (Reihenfolge kommt vom RiskManager)"""
+        return self.sort_column is not None or any(value is not None for value in self.table_filter().values())
+
+    def refresh_table_order(self):
+        """Übernimmt die im RiskManager vorsortierte und gefilterte Reihenfolge in die Tabelle"""
+        self.risk_table.set_rows(self.risk_manager.sorted_ids(
+            self.sort_column or 'id', self.sort_descending, **self.table_filter()))
 
     def delete_selected_risk(self):
         """Löscht das ausgewählte Risiko"""
-        selection = self.tree.selection()
-        if not selection:
+        risk_id = self.risk_table.selected_id()
+        if risk_id is None:
             return
             
         try:
-            item = selection[0]
-            risk_id = int(self.tree.item(item)['values'][0].replace('R-', ''))
-            
-            # Risiko aus dem RiskManager löschen
-            self.risk_manager.risks.pop(risk_id, None)
-            
-            # Eintrag aus der Treeview entfernen
-            self.tree.delete(item)
+            # Risiko aus dem RiskManager löschen (die Tabelle folgt über das Änderungsereignis)
+            if self.risk_manager.get_risk(risk_id) is not None:
+                self.risk_manager.delete_risk(risk_id)
             
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Löschen: {str(e)}")
 
-    def update_risk_list(self):
-        self.risk_listbox.delete(0, tk.END)  # Liste leeren
-        self.displayed_risks = self.risk_manager.get_all_risks()
-        
-        for risk in self.displayed_risks:
-            self.risk_listbox.insert(tk.END, f"{risk.name} - {risk.description[:50]}...")
+    def row_values(self, risk_id):
+        """Liefert die Tabellenzeile eines Risikos (wird erst beim Anzeigen formatiert)"""
+        return self.tree_values(self.risk_manager.get_risk(risk_id))
+
+    def tree_values(self, risk):
+        """Formatiert ein Risiko als Tabellenzeile"""
+        # Erwartungswert berechnen (Wahrscheinlichkeit ist in Prozent)
+        expected_value = (risk.probability * risk.impact) / 100
+        return (
+            f"R-{risk.id}",  # Prefix "R-" hinzugefügt
+            risk.name,
+            risk.description,
+            f"{risk.probability:.1f}",
+            f"{risk.impact:.2f}",
+            f"{expected_value:.2f}",
+            risk.reporting_level,
+            risk.risk_type,
+            risk.risk_level
+        )
+    
+    def on_risk_events(self, events):
+        """Sammelt Änderungsereignisse und plant eine gemeinsame Aktualisierung"""
+        self._pending_events.extend(events)
+        if not self._events_scheduled:
+            self._events_scheduled = True
+            self.master.after_idle(self.apply_risk_events)
+    
+    def apply_risk_events(self):
+        """Überträgt die gesammelten Änderungen als Deltas in die Tabelle"""
+        events, self._pending_events = coalesce(self._pending_events), []
+        self._events_scheduled = False
+        if self.table_ordered():
+            self.apply_ordered_events(events)
+            return
+        for event in events:
+            if event.kind == BULK_LOADED:
+                self.risk_table.set_rows(self.risk_manager.risks)
+            elif event.kind == ADDED:
+                self.risk_table.append_row(event.risk_id)
+            elif event.kind == UPDATED:
+                self.risk_table.refresh_row(event.risk_id)
+            elif event.kind == DELETED:
+                self.risk_table.remove_row(event.risk_id)
+
+    def apply_ordered_events(self, events):
+        """Überträgt Änderungen in die sortierte/gefilterte Tabelle, ohne die Reihenfolge neu aufzubauen.
+
+        Nur Risiken, deren Sortier- oder Filterfeld sich geändert hat, werden an
+        ihre neue Position (Schlüssel aus dem SortIndex des RiskManagers) verschoben.
+        """
+        if any(event.kind == BULK_LOADED for event in events):
+            self.refresh_table_order()
+            return
+        column = self.sort_column or 'id'
+        filters = self.table_filter()
+        relevant = set(SORT_FIELDS[column]) | {field for field, value in filters.items() if value is not None}
+        moved = []
+        for event in events:
+            if event.kind == DELETED:
+                self.risk_table.remove_row(event.risk_id)
+            elif event.kind == ADDED:
+                moved.append(event.risk_id)
+            elif event.kind == UPDATED:
+                if relevant.intersection(event.changes):
+                    # Zuerst alle verschobenen entfernen, damit die übrigen Zeilen sortiert bleiben
+                    self.risk_table.remove_row(event.risk_id)
+                    moved.append(event.risk_id)
+                else:
+                    self.risk_table.refresh_row(event.risk_id)
+        sort_index = self.risk_manager.sort_index
+        for risk_id in moved:
+            risk = self.risk_manager.get_risk(risk_id)
+            if risk is not None and all(value is None or normalize_key(getattr(risk, field)) == normalize_key(value)
+                                        for field, value in filters.items()):
+                self.risk_table.insert_sorted(risk_id, lambda other: sort_index.key(column, other),
+                                              self.sort_descending)
 
 def main():
     root = tk.Tk()
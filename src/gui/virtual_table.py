@@ -0,0 +1,314 @@
+from bisect import bisect_right
+from itertools import accumulate
+from tkinter import ttk
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Standardhöhen (Pixel) für die Berechnung der sichtbaren Zeilen
+ROW_HEIGHT = 20
+HEADING_HEIGHT = 25
+# Zielgröße der Blöcke in RowOrder; ein Block wird ab der doppelten Größe geteilt
+BLOCK_SIZE = 512
+
+
+class _Block:
+    """Ein Abschnitt der Zeilenreihenfolge (Vergleich über Identität)"""
+    __slots__ = ('ids',)
+
+    def __init__(self, ids: List[int]):
+        self.ids = ids
+
+
+class RowOrder:
+    """Reihenfolge der Tabellenzeilen als Liste kurzer Blöcke mit Index ID -> Block.
+
+    Positionsabfrage, Einfügen und Entfernen durchsuchen nur einen Block und
+    die Blockgrößen, kosten also O(√N) statt O(N) für eine flache Liste, in
+    der jede Änderung alle folgenden Positionen verschiebt.
+    """
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self.reset(ids)
+
+    def reset(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        self._blocks = [_Block(ids[start:start + BLOCK_SIZE]) for start in range(0, len(ids), BLOCK_SIZE)]
+        self._counts = [len(block.ids) for block in self._blocks]
+        self._block_of: Dict[int, _Block] = {risk_id: block for block in self._blocks for risk_id in block.ids}
+        self._size = len(ids)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, risk_id) -> bool:
+        return risk_id in self._block_of
+
+    def __iter__(self) -> Iterator[int]:
+        for block in self._blocks:
+            yield from block.ids
+
+    def index(self, risk_id: int) -> int:
+        """Position einer ID (ValueError, wenn nicht enthalten)"""
+        block = self._block_of.get(risk_id)
+        if block is None:
+            raise ValueError(f"Zeile {risk_id} nicht vorhanden")
+        position = self._blocks.index(block)
+        return sum(self._counts[:position]) + block.ids.index(risk_id)
+
+    def _locate(self, index: int):
+        """Block-Nummer und Versatz für eine Position"""
+        ends = list(accumulate(self._counts))
+        position = bisect_right(ends, index)
+        return position, index - (ends[position - 1] if position else 0)
+
+    def slice(self, start: int, count: int) -> List[int]:
+        """count IDs ab Position start"""
+        if count <= 0 or start >= self._size:
+            return []
+        position, offset = self._locate(start)
+        result = self._blocks[position].ids[offset:offset + count]
+        for block in self._blocks[position + 1:]:
+            if len(result) >= count:
+                break
+            result.extend(block.ids[:count - len(result)])
+        return result
+
+    def bisect(self, value, key: Callable[[int], object], descending: bool = False) -> int:
+        """Einfügeposition für value in einer nach key (ab- bzw. aufsteigend) sortierten Reihenfolge"""
+        def before(risk_id: int) -> bool:
+            other = key(risk_id)
+            return other > value if descending else other < value
+
+        low, high = 0, len(self._blocks)
+        while low < high:
+            middle = (low + high) // 2
+            if before(self._blocks[middle].ids[-1]):
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self._blocks):
+            return self._size
+        ids = self._blocks[low].ids
+        start, end = 0, len(ids)
+        while start < end:
+            middle = (start + end) // 2
+            if before(ids[middle]):
+                start = middle + 1
+            else:
+                end = middle
+        return sum(self._counts[:low]) + start
+
+    def insert(self, index: int, risk_id: int) -> None:
+        if risk_id in self._block_of:
+            raise ValueError(f"Zeile {risk_id} bereits vorhanden")
+        if not self._blocks:
+            self._blocks.append(_Block([]))
+            self._counts.append(0)
+        if index >= self._size:
+            position, offset = len(self._blocks) - 1, len(self._blocks[-1].ids)
+        else:
+            position, offset = self._locate(max(0, index))
+        block = self._blocks[position]
+        block.ids.insert(offset, risk_id)
+        self._counts[position] += 1
+        self._block_of[risk_id] = block
+        self._size += 1
+        if len(block.ids) >= 2 * BLOCK_SIZE:
+            # Block teilen, damit die Suche in einem Block kurz bleibt
+            tail = _Block(block.ids[BLOCK_SIZE:])
+            del block.ids[BLOCK_SIZE:]
+            self._blocks.insert(position + 1, tail)
+            self._counts[position] = len(block.ids)
+            self._counts.insert(position + 1, len(tail.ids))
+            for moved in tail.ids:
+                self._block_of[moved] = tail
+
+    def append(self, risk_id: int) -> None:
+        self.insert(self._size, risk_id)
+
+    def remove(self, risk_id: int) -> int:
+        """Entfernt eine ID und gibt ihre bisherige Position zurück"""
+        index = self.index(risk_id)
+        block = self._block_of.pop(risk_id)
+        position = self._blocks.index(block)
+        block.ids.remove(risk_id)
+        self._counts[position] -= 1
+        self._size -= 1
+        if not block.ids:
+            del self._blocks[position], self._counts[position]
+        return index
+
+
+class VirtualTable(ttk.Frame):
+    """Tabelle mit virtuellem Scrollen über beliebig viele Zeilen.
+
+    Die Zeilen sind nur als Risiko-IDs hinterlegt (RowOrder). Der Treeview
+    enthält höchstens so viele Einträge, wie sichtbar sind (fester Pool), und
+    erst beim Anzeigen werden die Werte über row_values(risk_id) formatiert.
+    Scrollen, Einfügen und Aktualisieren kosten daher unabhängig von der
+    Registergröße nur die sichtbaren Zeilen.
+    """
+
+    def __init__(self, master, columns: Sequence[str], row_values: Callable[[int], tuple], **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_values = row_values
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse")
+        self._vsb = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self._vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        style_height = ttk.Style(self).lookup("Treeview", "rowheight")
+        self._row_height = int(style_height) if style_height else ROW_HEIGHT
+        self._order = RowOrder()         # Reihenfolge aller Zeilen
+        self._top = 0                    # Index der ersten sichtbaren Zeile
+        self._visible = 1                # Anzahl sichtbarer Zeilen
+        self._pool: List[str] = []       # iids der vorhandenen Treeview-Einträge
+        self._selected: Optional[int] = None
+        self._refresh_scheduled = False
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda event: self._move_selection(self._visible))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def ids(self) -> List[int]:
+        return list(self._order)
+
+    def set_rows(self, ids: Iterable[int]) -> None:
+        """Ersetzt alle Zeilen (Reihenfolge wie übergeben)"""
+        self._order.reset(ids)
+        if self._selected is not None and self._selected not in self._order:
+            self._selected = None
+        self.invalidate()
+
+    def append_row(self, risk_id: int) -> None:
+        self._order.append(risk_id)
+        self.invalidate()
+
+    def insert_sorted(self, risk_id: int, key: Callable[[int], object], descending: bool = False) -> None:
+        """Fügt eine Zeile an ihrer Position in einer nach key sortierten Tabelle ein"""
+        index = self._order.bisect(key(risk_id), key, descending)
+        self._order.insert(index, risk_id)
+        if index < self._top:
+            self._top += 1
+        self.invalidate()
+
+    def remove_row(self, risk_id: int) -> None:
+        if risk_id not in self._order:
+            return
+        index = self._order.remove(risk_id)
+        if index < self._top:
+            self._top -= 1
+        if self._selected == risk_id:
+            self._selected = None
+        self.invalidate()
+
+    def refresh_row(self, risk_id: int) -> None:
+        """Formatiert eine Zeile neu, falls sie gerade sichtbar ist"""
+        if risk_id in self._order and self._top <= self._order.index(risk_id) < self._top + self._visible:
+            self.invalidate()
+
+    def selected_id(self) -> Optional[int]:
+        return self._selected
+
+    def select(self, risk_id: int) -> None:
+        """Wählt eine Zeile aus und scrollt sie in den sichtbaren Bereich"""
+        self._selected = risk_id
+        self.see(self._order.index(risk_id))
+
+    def see(self, index: int) -> None:
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._visible:
+            self._top = index - self._visible + 1
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Plant ein Neuzeichnen der sichtbaren Zeilen (einmal pro Idle-Zyklus)"""
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.after_idle(self.refresh)
+
+    def refresh(self) -> None:
+        """Überträgt den sichtbaren Ausschnitt in den Zeilen-Pool des Treeviews"""
+        self._refresh_scheduled = False
+        self._top = max(0, min(self._top, len(self._order) - self._visible))
+        rows = self._order.slice(self._top, self._visible)
+        count = len(rows)
+        while len(self._pool) < count:
+            self._pool.append(self.tree.insert('', 'end', iid=f"row{len(self._pool)}"))
+        while len(self._pool) > count:
+            self.tree.delete(self._pool.pop())
+
+        selection = []
+        for iid, risk_id in zip(self._pool, rows):
+            self.tree.item(iid, values=self.row_values(risk_id))
+            if risk_id == self._selected:
+                selection.append(iid)
+        self.tree.selection_set(selection)
+
+        total = len(self._order)
+        if total:
+            self._vsb.set(self._top / total, min(1.0, (self._top + count) / total))
+        else:
+            self._vsb.set(0.0, 1.0)
+
+    def yview(self, *args) -> None:
+        """Scrollbar-Befehl: ('moveto', Anteil) oder ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self._order))
+            self.invalidate()
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._visible if args[2] == "pages" else 1)
+            self._scroll_by(step)
+
+    def _scroll_by(self, rows: int) -> str:
+        self._top += rows
+        self.invalidate()
+        return "break"
+
+    def _on_mousewheel(self, event) -> str:
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _move_selection(self, rows: int) -> str:
+        if not self._order:
+            return "break"
+        if self._selected is None or self._selected not in self._order:
+            index = self._top
+        else:
+            index = max(0, min(len(self._order) - 1, self._order.index(self._selected) + rows))
+        self._selected = self._order.slice(index, 1)[0]
+        self.see(index)
+        return "break"
+
+    def _on_configure(self, event) -> None:
+        visible = max(1, (event.height - HEADING_HEIGHT) // self._row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self.invalidate()
+
+    def _on_select(self, event) -> None:
+        # Nur sichtbare Zeilen sind im Treeview; eine unsichtbare Auswahl bleibt erhalten
+        selection = self.tree.selection()
+        if selection:
+            slot = self._pool.index(selection[0])
+            self._selected = self._order.slice(self._top + slot, 1)[0]
+        elif self._selected in self._order and \
+                self._top <= self._order.index(self._selected) < self._top + len(self._pool):
+            self._selected = None
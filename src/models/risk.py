@@ -1,9 +1,23 @@
-from dataclasses import dataclass
+import sys
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
+
+# Felder, von denen die abgeleiteten Werte (Score, Level, Budgetanteil) abhängen
+_DERIVED_INPUTS = frozenset(('probability', 'impact', 'budget'))
+# Kategorie-Felder mit wenigen verschiedenen Werten werden internalisiert
+_INTERNED = frozenset(('reporting_level', 'risk_type'))
+
 
-@dataclass
 class Risk:
+    """Ein Risiko mit speichersparender Darstellung (__slots__).
+
+    Abgeleitete Werte werden beim ersten Lesen berechnet und bei jeder
+    Änderung von Wahrscheinlichkeit, Auswirkung oder Budget verworfen.
+    """
+
+    __slots__ = ('id', 'budget', 'name', 'description', 'probability', 'impact', 'reporting_level',
+                 'risk_type', 'created_at', 'updated_at', '_risk_score', '_risk_level', '_budget_usage')
+
     id: int
     budget: float      # Budget in Mio. Euro
     name: str
@@ -12,22 +26,55 @@ class Risk:
     impact: float      # Auswirkung in Mio. Euro
     reporting_level: str  # Niedrig, Mittel, Hoch
     risk_type: str      # Operationell, Strategisch, Finanziell, Extern
-    created_at: datetime
-    updated_at: datetime
-    
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    def __init__(self, id: int, name: str, description: str, probability: float,
+                 impact: float, reporting_level: str, risk_type: str, budget: float = 0.0):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.probability = probability
+        self.impact = impact
+        self.reporting_level = reporting_level
+        self.risk_type = risk_type
+        self.budget = budget
+        self.created_at = None
+        self.updated_at = None
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in _INTERNED and type(value) is str:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+        if name in _DERIVED_INPUTS:
+            object.__setattr__(self, '_risk_score', None)
+            object.__setattr__(self, '_risk_level', None)
+            object.__setattr__(self, '_budget_usage', None)
+
+    def __repr__(self) -> str:
+        return (f"Risk(id={self.id!r}, name={self.name!r}, probability={self.probability!r}, "
+                f"impact={self.impact!r}, reporting_level={self.reporting_level!r}, "
+                f"risk_type={self.risk_type!r})")
+
     @property
     def risk_score(self) -> float:
         # Wahrscheinlichkeit wird von Prozent in Dezimal umgerechnet
-        return (self.probability / 100) * self.impact
-    
+        if self._risk_score is None:
+            self._risk_score = (self.probability / 100) * self.impact
+        return self._risk_score
+
     @property
     def risk_level(self) -> str:
+        if self._risk_level is None:
+            self._risk_level = self._calculate_risk_level()
         return self._risk_level
-    
+
     @property
     def budget_usage_percent(self) -> float:
-        return (self.impact / self.budget * 100) if self.budget > 0 else 0
-    
+        if self._budget_usage is None:
+            self._budget_usage = (self.impact / self.budget * 100) if self.budget > 0 else 0
+        return self._budget_usage
+
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -38,24 +85,13 @@ class Risk:
             'impact': self.impact,
             'reporting_level': self.reporting_level,
             'risk_type': self.risk_type,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'risk_score': self.risk_score,
             'risk_level': self.risk_level,
             'budget_usage_percent': self.budget_usage_percent
         }
 
-    def __init__(self, id: int, name: str, description: str, probability: float, 
-                 impact: float, reporting_level: str, risk_type: str):
-        self.id = id
-        self.name = name
-        self.description = description
-        self.probability = probability
-        self.impact = impact
-        self.reporting_level = reporting_level
-        self.risk_type = risk_type
-        self._risk_level = self._calculate_risk_level()
-
     def _calculate_risk_level(self) -> str:
         risk_value = self.probability * self.impact
         if risk_value < 10:
@@ -63,4 +99,4 @@ class Risk:
         elif risk_value < 30:
             return "Mittel"
         else:
-            return "Hoch"
\ No newline at end of file
+            return "Hoch"
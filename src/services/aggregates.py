@@ -0,0 +1,148 @@
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+from ..models.risk import Risk
+from .risk_index import normalize_key
+from .risk_store import LEVEL_THRESHOLDS, LEVELS, RiskStore
+
+_LOW, _HIGH = (float(threshold) for threshold in LEVEL_THRESHOLDS)
+
+
+def risk_level_of(probability: float, impact: float) -> str:
+    """Risiko-Level wie Risk.risk_level, aber aus einzelnen Werten (z.B. alten Werten vor einer Änderung)"""
+    value = probability * impact
+    return LEVELS[0] if value < _LOW else LEVELS[1] if value < _HIGH else LEVELS[2]
+
+
+@dataclass
+class RiskSummary:
+    """Kennzahlen des Registers zu einem Zeitpunkt"""
+    count: int
+    expected_value: float                  # Summe der Erwartungswerte
+    impact: float                          # Summe der Auswirkungen
+    count_by_level: Dict[str, int]
+    expected_value_by_type: Dict[str, float]
+    project_budget: Optional[float]
+    budget_at_risk_percent: float          # Erwartungswert in Prozent des Projektbudgets
+    exposure_by_type_percent: Dict[str, float] = field(default_factory=dict)
+
+
+class RunningAggregates:
+    """Laufend nachgeführte Summen über alle Risiken eines RiskManagers.
+
+    Jede Änderung passt die Summen um die Differenz an, Abfragen kosten daher
+    konstante Zeit (bzw. proportional zur Zahl der Risiko-Typen). Die auf das
+    Budget bezogenen Anteile werden bei set_budget() neu berechnet.
+    """
+
+    def __init__(self):
+        self.budget: Optional[float] = None
+        self._budget_share: Optional[float] = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Setzt alle Summen zurück (das Budget bleibt)"""
+        self.count = 0
+        self.expected_value = 0.0
+        self.impact = 0.0
+        self.count_by_level: Dict[str, int] = {level: 0 for level in LEVELS}
+        # Je Risiko-Typ (normalisiert wie im RiskIndex); Anzeigename aus der ersten Schreibweise
+        self._expected_by_type: Dict[str, float] = {}
+        self._count_by_type: Dict[str, int] = {}
+        self._type_labels: Dict[str, str] = {}
+
+    def _apply(self, risk_type: str, probability: float, impact: float, sign: int) -> None:
+        expected_value = probability / 100 * impact
+        self.count += sign
+        self.expected_value += sign * expected_value
+        self.impact += sign * impact
+        self.count_by_level[risk_level_of(probability, impact)] += sign
+        key = normalize_key(risk_type)
+        self._type_labels.setdefault(key, risk_type or "")
+        self._expected_by_type[key] = self._expected_by_type.get(key, 0.0) + sign * expected_value
+        count = self._count_by_type.get(key, 0) + sign
+        if count:
+            self._count_by_type[key] = count
+        else:
+            # Letztes Risiko des Typs entfernt: Rundungsreste nicht stehen lassen
+            del self._count_by_type[key], self._expected_by_type[key], self._type_labels[key]
+        if not self.count:
+            self.expected_value = self.impact = 0.0
+
+    def add(self, risk: Risk) -> None:
+        self._apply(risk.risk_type, risk.probability, risk.impact, 1)
+
+    def add_many(self, risks: Iterable[Risk]) -> None:
+        for risk in risks:
+            self._apply(risk.risk_type, risk.probability, risk.impact, 1)
+
+    def add_store(self, store: RiskStore) -> None:
+        """Addiert alle Zeilen eines RiskStore vektorisiert (beim Öffnen eines gefüllten Backends)"""
+        if not len(store):
+            return
+        scores = store.risk_scores()
+        self.count += len(store)
+        self.expected_value += float(scores.sum())
+        self.impact += float(store.impacts.sum())
+        levels = np.bincount(store.risk_level_codes(), minlength=len(LEVELS))
+        for level, count in zip(LEVELS, levels):
+            self.count_by_level[level] += int(count)
+        labels = store.risk_types.labels
+        counts = np.bincount(store.type_codes, minlength=len(labels))
+        sums = np.bincount(store.type_codes, weights=scores, minlength=len(labels))
+        for code in np.flatnonzero(counts):
+            label = labels[code]
+            key = normalize_key(label)
+            self._type_labels.setdefault(key, label)
+            self._expected_by_type[key] = self._expected_by_type.get(key, 0.0) + float(sums[code])
+            self._count_by_type[key] = self._count_by_type.get(key, 0) + int(counts[code])
+
+    def update(self, risk: Risk, previous: Dict[str, Any]) -> None:
+        """Ersetzt die alten Werte (previous: geänderte Felder vor der Änderung) durch die aktuellen"""
+        self._apply(previous.get('risk_type', risk.risk_type), previous.get('probability', risk.probability),
+                    previous.get('impact', risk.impact), -1)
+        self.add(risk)
+
+    def remove(self, risk: Risk) -> None:
+        self._apply(risk.risk_type, risk.probability, risk.impact, -1)
+
+    def set_budget(self, budget: Optional[float]) -> None:
+        self.budget = budget
+        self._budget_share = 100 / budget if budget else None
+
+    def summary(self) -> RiskSummary:
+        share = self._budget_share or 0.0
+        by_type = {self._type_labels[key]: value for key, value in self._expected_by_type.items()}
+        return RiskSummary(
+            count=self.count,
+            expected_value=self.expected_value,
+            impact=self.impact,
+            count_by_level=dict(self.count_by_level),
+            expected_value_by_type=by_type,
+            project_budget=self.budget,
+            budget_at_risk_percent=self.expected_value * share,
+            exposure_by_type_percent={risk_type: value * share for risk_type, value in by_type.items()}
+        )
+
+    def verify(self, risks: Iterable[Risk]) -> List[str]:
+        """Vergleicht mit einer vollständigen Neuberechnung; gibt die Abweichungen zurück (leer = konsistent)"""
+        expected = RunningAggregates()
+        expected.set_budget(self.budget)
+        expected.add_many(risks)
+        problems = []
+        if expected.count != self.count:
+            problems.append(f"Anzahl: {self.count} statt {expected.count}")
+        if expected.count_by_level != self.count_by_level:
+            problems.append(f"Anzahl je Level: {self.count_by_level} statt {expected.count_by_level}")
+        for name, actual, correct in (("Erwartungswert", self.expected_value, expected.expected_value),
+                                      ("Auswirkung", self.impact, expected.impact)):
+            if not math.isclose(actual, correct, rel_tol=1e-9, abs_tol=1e-6):
+                problems.append(f"{name}: {actual} statt {correct}")
+        if set(expected._expected_by_type) != set(self._expected_by_type):
+            problems.append(f"Risiko-Typen: {sorted(self._expected_by_type)} statt {sorted(expected._expected_by_type)}")
+        else:
+            for key, correct in expected._expected_by_type.items():
+                if not math.isclose(self._expected_by_type[key], correct, rel_tol=1e-9, abs_tol=1e-6):
+                    problems.append(f"Erwartungswert {key}: {self._expected_by_type[key]} statt {correct}")
+        return problems
@@ -0,0 +1,123 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from ..models.risk import Risk
+
+# Ereignistypen
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+CLEARED = "cleared"
+BUDGET_CHANGED = "budget_changed"
+BULK_LOADED = "bulk_loaded"
+
+# Ereignisse, nach denen Abonnenten ihren Zustand komplett neu aufbauen
+_RESET_KINDS = (CLEARED, BULK_LOADED)
+
+
+@dataclass
+class RiskEvent:
+    """Änderung am Register eines RiskManagers"""
+    kind: str
+    risk_id: Optional[int] = None
+    risk: Optional[Risk] = None                               # aktueller (bei DELETED: letzter) Zustand
+    previous: Dict[str, Any] = field(default_factory=dict)    # alte Werte (bei DELETED: alle Felder)
+    changes: Dict[str, Any] = field(default_factory=dict)     # neue Werte der geänderten Felder
+
+
+Subscriber = Callable[[List[RiskEvent]], None]
+
+
+def coalesce(events: List[RiskEvent]) -> List[RiskEvent]:
+    """Fasst eine Folge von Ereignissen zur minimalen gleichwertigen Folge zusammen.
+
+    Mehrere Ereignisse je Risiko werden zu einem verschmolzen, Hinzufügen und
+    anschließendes Löschen heben sich auf. Enthält die Folge ein Leeren oder
+    Massenladen, bleibt nur ein BULK_LOADED (und ggf. die Budgetänderung).
+    """
+    budget_event: Optional[RiskEvent] = None
+    for event in events:
+        if event.kind == BUDGET_CHANGED:
+            if budget_event is None:
+                budget_event = RiskEvent(BUDGET_CHANGED, previous=dict(event.previous))
+            budget_event.changes = dict(event.changes)
+
+    if any(event.kind in _RESET_KINDS for event in events):
+        result = [RiskEvent(BULK_LOADED)]
+        return result + [budget_event] if budget_event else result
+
+    merged: Dict[int, RiskEvent] = {}
+    for event in events:
+        if event.kind == BUDGET_CHANGED:
+            continue
+        current = merged.get(event.risk_id)
+        if current is None:
+            merged[event.risk_id] = RiskEvent(event.kind, event.risk_id, event.risk,
+                                              dict(event.previous), dict(event.changes))
+            continue
+        if current.kind == ADDED:
+            # Neu hinzugefügt: nur der Endzustand zählt, Löschen hebt das Hinzufügen auf
+            if event.kind == DELETED:
+                del merged[event.risk_id]
+            else:
+                current.risk = event.risk
+            continue
+        # Bekannte alte Werte bleiben erhalten, neue Werte überschreiben
+        for key, value in event.previous.items():
+            current.previous.setdefault(key, value)
+        current.changes.update(event.changes)
+        current.risk = event.risk
+        if event.kind == DELETED:
+            current.kind = DELETED
+            current.changes.clear()
+        elif current.kind == DELETED and event.kind == ADDED:
+            # Gelöscht und mit derselben ID neu angelegt: wirkt wie eine Änderung aller Felder
+            current.kind = UPDATED
+            current.changes = {key: getattr(event.risk, key) for key in current.previous}
+    result = list(merged.values())
+    return result + [budget_event] if budget_event else result
+
+
+class EventBus:
+    """Verteilt Änderungsereignisse an Abonnenten.
+
+    Außerhalb eines batch()-Blocks wird jedes Ereignis sofort zugestellt.
+    Innerhalb werden Ereignisse gesammelt und beim Verlassen des äußersten
+    Blocks zusammengefasst als ein Stapel zugestellt.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Subscriber] = []
+        self._pending: List[RiskEvent] = []
+        self._depth = 0
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Registriert einen Abonnenten; gibt eine Funktion zum Abmelden zurück"""
+        self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, event: RiskEvent) -> None:
+        if self._depth:
+            self._pending.append(event)
+        else:
+            self._deliver([event])
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and self._pending:
+                events, self._pending = coalesce(self._pending), []
+                if events:
+                    self._deliver(events)
+
+    def _deliver(self, events: List[RiskEvent]) -> None:
+        for callback in list(self._subscribers):
+            callback(events)
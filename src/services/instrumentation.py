@@ -0,0 +1,195 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Höchstzahl gespeicherter Einzelaufrufe für den Chrome-Trace (älteste fallen heraus)
+TRACE_LIMIT = 100_000
+
+
+@dataclass
+class OperationStats:
+    """Aufrufzahl, Laufzeiten und Speicherspitze einer Operation"""
+    count: int = 0
+    total_seconds: float = 0.0
+    min_seconds: float = float('inf')
+    max_seconds: float = 0.0
+    # Log2-Histogramm: Bucket b zählt Aufrufe mit Dauer < 2**b Mikrosekunden
+    histogram: Dict[int, int] = field(default_factory=dict)
+    peak_bytes: Optional[int] = None   # nur bei Messung mit memory=True
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Obergrenze (Sekunden) des Histogramm-Buckets, in dem das Quantil q (0-1) liegt"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(2 ** bucket / 1e6, self.max_seconds)
+        return self.max_seconds
+
+    def record(self, seconds: float, peak_bytes: Optional[int]) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+        bucket = int(seconds * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        if peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes or 0, peak_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.mean_seconds,
+            'min_seconds': self.min_seconds if self.count else 0.0,
+            'max_seconds': self.max_seconds,
+            'p50_seconds': self.percentile(0.5),
+            'p95_seconds': self.percentile(0.95),
+            'histogram_us': {str(2 ** bucket): count for bucket, count in sorted(self.histogram.items())},
+            'peak_bytes': self.peak_bytes
+        }
+
+
+class Instrumentation:
+    """Optionale Messung von Aufrufzahlen, Laufzeiten und Speicherspitzen.
+
+    Abgeschaltet (Standard) prüfen die mit instrumented() markierten Funktionen
+    nur ein Flag. Mit memory=True wird tracemalloc gestartet und je Aufruf die
+    Speicherspitze über dem Stand beim Aufruf erfasst (auch bei verschachtelten
+    Aufrufen korrekt). Zusätzlich werden die letzten trace_limit Aufrufe für
+    einen Chrome-Trace (chrome://tracing, Perfetto) aufbewahrt.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self._stats: Dict[str, OperationStats] = {}
+        self._trace: deque = deque(maxlen=TRACE_LIMIT)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def enable(self, memory: bool = False, trace_limit: int = TRACE_LIMIT) -> None:
+        if trace_limit != self._trace.maxlen:
+            self._trace = deque(self._trace, maxlen=trace_limit)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif not memory and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.memory = memory
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.memory = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._trace.clear()
+
+    def snapshot(self) -> Dict[str, OperationStats]:
+        """Kopie der bisherigen Messwerte je Operation"""
+        with self._lock:
+            return {name: OperationStats(stats.count, stats.total_seconds, stats.min_seconds,
+                                         stats.max_seconds, dict(stats.histogram), stats.peak_bytes)
+                    for name, stats in self._stats.items()}
+
+    def call(self, name: str, func: Callable, *args, **kwargs):
+        """Führt func gemessen aus"""
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            self._memory_start()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            peak = self._memory_end() if memory else None
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is None:
+                    stats = self._stats[name] = OperationStats()
+                stats.record(end - start, peak)
+                self._trace.append((name, start, end, threading.get_ident()))
+
+    # Speicherspitzen: tracemalloc kennt nur eine globale Spitze, daher je Thread
+    # ein Stapel [Stand beim Aufruf, bisherige Spitze] für verschachtelte Aufrufe
+    def _memory_start(self) -> None:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current, current])
+
+    def _memory_end(self) -> Optional[int]:
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            return None
+        _, peak = tracemalloc.get_traced_memory()
+        start, previous_peak = stack.pop()
+        peak = max(peak, previous_peak)
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        return peak - start
+
+    # Export
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: stats.to_dict() for name, stats in sorted(self.snapshot().items())}
+
+    def dump_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Aufgezeichnete Aufrufe im Chrome Trace Event Format (Zeiten in Mikrosekunden)"""
+        with self._lock:
+            trace = list(self._trace)
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'ts': start * 1e6,
+             'dur': (end - start) * 1e6, 'pid': pid, 'tid': tid}
+            for name, start, end, tid in trace
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# Prozessweite Instanz, die von instrumented() verwendet wird
+instrumentation = Instrumentation()
+
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """Markiert eine Funktion als Messpunkt; ohne aktive Messung nur ein Flag-Test"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            return instrumentation.call(name, func, *args, **kwargs)
+        return wrapper
+    return decorator
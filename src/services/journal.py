@@ -0,0 +1,211 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from ..models.risk import Risk
+from .persistence import load_register, record_to_kwargs, risk_to_record, save_register
+
+SEQUENCE_KEY = 'journal_sequence'
+
+
+class RiskJournal:
+    """Append-only-Journal der Änderungen eines RiskManagers (ein JSON-Datensatz pro Zeile).
+
+    Jeder Eintrag trägt eine fortlaufende Sequenznummer und wird sofort an das
+    Betriebssystem übergeben (flush), übersteht also einen Absturz des Prozesses.
+    Nur fsync erfolgt gebündelt nach sync_every Einträgen oder spätestens nach
+    sync_interval Sekunden.
+    on_append wird erst nach dem letzten Eintrag eines deferred()-Blocks aufgerufen.
+    """
+
+    def __init__(self, path: str, sync_every: int = 64, sync_interval: float = 1.0, sequence: int = 0):
+        if sync_every < 1:
+            raise ValueError("sync_every muss positiv sein")
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.sequence = sequence
+        self.entries = 0
+        self.on_append: Optional[Callable[["RiskJournal"], None]] = None
+        self._file = open(path, 'a', encoding='utf-8')
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._deferred = 0
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Hält on_append zurück, bis alle Einträge einer zusammengesetzten Operation geschrieben sind"""
+        self._deferred += 1
+        try:
+            yield
+        finally:
+            self._deferred -= 1
+        if not self._deferred and self.on_append is not None:
+            self.on_append(self)
+
+    # Einträge
+    def record_add(self, risk: Risk) -> None:
+        self._append({'op': 'add', 'risk': risk_to_record(risk)})
+
+    def record_update(self, risk_id: int, changes: Dict[str, Any]) -> None:
+        self._append({'op': 'update', 'id': risk_id, 'changes': changes})
+
+    def record_delete(self, risk_id: int) -> None:
+        self._append({'op': 'delete', 'id': risk_id})
+
+    def record_clear(self) -> None:
+        self._append({'op': 'clear'})
+
+    def record_budget(self, budget: float) -> None:
+        self._append({'op': 'budget', 'value': budget})
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self.sequence += 1
+        entry = {'seq': self.sequence, **entry}
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.entries += 1
+        self._pending += 1
+        if self._pending >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        if self.on_append is not None and not self._deferred:
+            self.on_append(self)
+
+    def sync(self) -> None:
+        """Schreibt gepufferte Einträge und erzwingt sie auf den Datenträger"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def reset(self) -> None:
+        """Leert das Journal (nach einer Kompaktierung); die Sequenz läuft weiter"""
+        self._file.truncate(0)
+        self._file.seek(0)
+        self.sync()
+        self.entries = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def replay(path: str, risk_manager, after_sequence: int = 0) -> int:
+        """Spielt die Einträge mit Sequenz > after_sequence auf einen RiskManager ein.
+
+        Eine unvollständige letzte Zeile (Absturz beim Schreiben) wird abgeschnitten.
+        Gibt die letzte gelesene Sequenznummer zurück.
+        """
+        if not os.path.exists(path):
+            return after_sequence
+        sequence = after_sequence
+        valid_end = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid_end += len(line)
+                if entry['seq'] <= after_sequence:
+                    continue
+                _apply(risk_manager, entry)
+                sequence = entry['seq']
+        if valid_end < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(valid_end)
+        return sequence
+
+
+def _apply(risk_manager, entry: Dict[str, Any]) -> None:
+    op = entry['op']
+    if op == 'add':
+        kwargs = record_to_kwargs(entry['risk'])
+        if risk_manager.get_risk(kwargs['risk_id']) is not None:
+            # Bereits im Snapshot enthalten (Kompaktierung mitten in einer Operation): Stand übernehmen
+            risk_id = kwargs.pop('risk_id')
+            risk_manager.update_risk(risk_id, **kwargs)
+        else:
+            risk_manager.add_risk(**kwargs)
+    elif op == 'update':
+        risk_manager.update_risk(entry['id'], **entry['changes'])
+    elif op == 'delete':
+        risk_manager.delete_risk(entry['id'])
+    elif op == 'clear':
+        risk_manager.clear_risks()
+    elif op == 'budget':
+        risk_manager.set_project_budget(entry['value'])
+    else:
+        raise ValueError(f"Unbekannter Journal-Eintrag: {op}")
+
+
+class JournaledRegister:
+    """Register aus Snapshot (JSON) plus Journal der seitherigen Änderungen.
+
+    open() lädt den Snapshot, spielt den Journal-Rest ein und hängt das
+    Journal an den RiskManager. compact() schreibt einen neuen Snapshot und
+    leert das Journal; mit compact_after geschieht das automatisch.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: Optional[str] = None, sync_every: int = 64,
+                 sync_interval: float = 1.0, compact_after: Optional[int] = 10000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or f"{snapshot_path}.journal"
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self.risk_manager = None
+        self.journal: Optional[RiskJournal] = None
+
+    def open(self, risk_manager=None):
+        """Stellt den RiskManager aus Snapshot und Journal wieder her"""
+        if risk_manager is None:
+            from .risk_manager import RiskManager
+            risk_manager = RiskManager()
+        snapshot_sequence = 0
+        if os.path.exists(self.snapshot_path):
+            metadata = {}
+            load_register(self.snapshot_path, risk_manager, metadata=metadata)
+            snapshot_sequence = metadata.get(SEQUENCE_KEY, 0)
+        sequence = RiskJournal.replay(self.journal_path, risk_manager, after_sequence=snapshot_sequence)
+
+        self.journal = RiskJournal(self.journal_path, sync_every=self.sync_every,
+                                   sync_interval=self.sync_interval, sequence=sequence)
+        self.journal.on_append = self._maybe_compact
+        risk_manager.journal = self.journal
+        self.risk_manager = risk_manager
+        return risk_manager
+
+    def compact(self) -> None:
+        """Faltet das Journal in einen neuen Snapshot"""
+        if self.risk_manager is None:
+            raise ValueError("Register wurde noch nicht geöffnet")
+        self.journal.sync()
+        save_register(
+            self.snapshot_path,
+            self.risk_manager.project_budget,
+            self.risk_manager.get_all_risks(),
+            compact=True,
+            compression=None,
+            metadata={SEQUENCE_KEY: self.journal.sequence},
+            fsync=True
+        )
+        # Ein Absturz vor dem Leeren ist unkritisch: replay überspringt bereits enthaltene Sequenzen
+        self.journal.reset()
+
+    def _maybe_compact(self, journal: RiskJournal) -> None:
+        if self.compact_after and journal.entries >= self.compact_after:
+            self.compact()
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+            if self.risk_manager is not None and self.risk_manager.journal is self.journal:
+                self.risk_manager.journal = None
+            self.journal = None
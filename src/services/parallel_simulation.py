@@ -0,0 +1,87 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Sequence, Tuple
+from .simulation import MonteCarloSimulation, SimulationResult, _BlockResult, _simulate_block
+
+# Zustand der Worker-Prozesse (wird vom Initializer einmal pro Prozess gesetzt)
+_worker_state = {}
+
+
+def _attach_worker(shm_name: str, n_risks: int, distribution: str, bin_edges: np.ndarray,
+                   budget: Optional[float], chunk_trials: int) -> None:
+    """Verbindet einen Worker mit den Eingabe-Arrays im Shared Memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    columns = np.ndarray((4, n_risks), dtype=np.float64, buffer=shm.buf)
+    _worker_state.update(
+        shm=shm,
+        columns=columns,
+        distribution=distribution,
+        bin_edges=bin_edges,
+        budget=budget,
+        chunk_trials=chunk_trials
+    )
+
+
+def _run_block(task: Tuple[np.random.SeedSequence, int]) -> _BlockResult:
+    seed, n_trials = task
+    state = _worker_state
+    probabilities, impacts, low, high = state["columns"]
+    return _simulate_block(probabilities, impacts, low, high, state["distribution"], seed, n_trials,
+                           state["bin_edges"], state["budget"], state["chunk_trials"])
+
+
+class ParallelMonteCarloSimulation(MonteCarloSimulation):
+    """Monte-Carlo-Simulation auf mehreren Prozessen.
+
+    Wahrscheinlichkeiten und Auswirkungen liegen einmalig im Shared Memory,
+    statt pro Worker gepickelt zu werden. Blockaufteilung und Seed-Ströme sind
+    dieselben wie bei der sequentiellen Simulation, und die Teilergebnisse
+    werden in Blockreihenfolge zusammengeführt. Das Ergebnis ist daher
+    bitgleich, egal wie viele Worker laufen.
+    """
+
+    def __init__(self, workers: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Anzahl der Worker muss positiv sein")
+        self.workers = workers
+
+    def run_arrays(self, probabilities: Sequence[float], impacts: Sequence[float], n_trials: int,
+                   seed: Optional[int] = None, project_budget: Optional[float] = None) -> SimulationResult:
+        probabilities, impacts = self._prepare_inputs(probabilities, impacts, n_trials)
+        seed_sequence = np.random.SeedSequence(seed)
+        block_seeds = self._block_seeds(seed_sequence, n_trials)
+        workers = min(self.workers, len(block_seeds))
+        if workers == 1 or len(probabilities) == 0:
+            return super().run_arrays(probabilities, impacts, n_trials, seed=seed_sequence.entropy,
+                                      project_budget=project_budget)
+
+        low, high = self._impact_bounds(impacts)
+        bin_edges = self._bin_edges(high)
+        chunk_trials = self._chunk_trials(len(probabilities))
+
+        n_risks = len(probabilities)
+        shm = shared_memory.SharedMemory(create=True, size=4 * n_risks * 8)
+        columns = None
+        try:
+            columns = np.ndarray((4, n_risks), dtype=np.float64, buffer=shm.buf)
+            columns[0] = probabilities / 100
+            columns[1] = impacts
+            columns[2] = low
+            columns[3] = high
+            initargs = (shm.name, n_risks, self.impact_distribution, bin_edges, project_budget, chunk_trials)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                     initargs=initargs) as pool:
+                # map liefert die Ergebnisse in Blockreihenfolge
+                blocks = list(pool.map(_run_block, block_seeds))
+        finally:
+            # View vor close() freigeben, sonst verdeckt ein BufferError die eigentliche Ausnahme
+            del columns
+            try:
+                shm.close()
+            finally:
+                shm.unlink()
+        return self._merge(blocks, n_trials, seed_sequence, bin_edges, project_budget)
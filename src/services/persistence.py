@@ -0,0 +1,294 @@
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from ..models.risk import Risk
+from .instrumentation import instrumented
+
+RECORD_FIELDS = ('id', 'name', 'description', 'probability', 'impact', 'reporting_level', 'risk_type')
+
+_SUFFIXES = {'.gz': 'gzip', '.gzip': 'gzip', '.xz': 'lzma', '.lzma': 'lzma'}
+_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'\xfd7zXZ\x00', 'lzma'))
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def risk_to_record(risk: Risk) -> Dict[str, Any]:
+    """Wandelt ein Risiko in den Datensatz des JSON-Formats um"""
+    return {
+        'id': risk.id,
+        'name': risk.name,
+        'description': risk.description,
+        'probability': risk.probability,
+        'impact': risk.impact,
+        'reporting_level': risk.reporting_level,
+        'risk_type': risk.risk_type
+    }
+
+
+def compression_for_path(path: str) -> Optional[str]:
+    """Leitet die Kompression aus der Dateiendung ab"""
+    return _SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def _detect_compression(raw) -> Optional[str]:
+    head = raw.read(6)
+    raw.seek(0)
+    for magic, compression in _MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _wrap_binary(raw, mode: str, compression: Optional[str]):
+    if compression is None:
+        return raw
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode=mode)
+    if compression == 'lzma':
+        return lzma.LZMAFile(raw, mode=mode)
+    raise ValueError(f"Unbekannte Kompression: {compression}")
+
+
+@instrumented("persistence.save_register")
+def save_register(path: str, project_budget: float, risks: Iterable[Risk], compact: bool = False,
+                  compression: Optional[str] = 'auto', batch_size: int = 1000,
+                  metadata: Optional[Dict[str, Any]] = None, fsync: bool = False) -> int:
+    """Schreibt ein Risikoregister datensatzweise als JSON.
+
+    Die Datei wird zunächst unter einem temporären Namen geschrieben und erst
+    nach vollständigem Schreiben ersetzt. metadata wird als zusätzliche
+    Schlüssel vor "risks" abgelegt. Gibt die Anzahl der Risiken zurück.
+    """
+    if compression == 'auto':
+        compression = compression_for_path(path)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    try:
+        with open(tmp_path, 'wb') as raw:
+            binary = _wrap_binary(raw, 'wb', compression)
+            f = io.TextIOWrapper(binary, encoding='utf-8', newline='\n')
+            count = _write_register(f, project_budget, risks, compact, batch_size, metadata or {})
+            # Textschicht lösen, ohne die Datei zu schließen; Kompressor schreibt beim Schließen den Abschluss
+            f.detach()
+            if binary is not raw:
+                binary.close()
+            if fsync:
+                raw.flush()
+                os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def _write_register(f, project_budget: float, risks: Iterable[Risk], compact: bool, batch_size: int,
+                    metadata: Dict[str, Any]) -> int:
+    if compact:
+        def encode(record):
+            return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        key_format, separator, tail = '"%s":%s,', ',', ']}'
+        head, risks_head = '{', '"risks":['
+    else:
+        def encode(record):
+            text = json.dumps(record, indent=4, ensure_ascii=False)
+            return '\n'.join(' ' * 8 + line for line in text.split('\n'))
+        key_format, separator, tail = '    "%s": %s,\n', ',\n', '\n    ]\n}'
+        head, risks_head = '{\n', '    "risks": [\n'
+
+    f.write(head)
+    for key, value in {'project_budget': project_budget, **metadata}.items():
+        f.write(key_format % (key, json.dumps(value, ensure_ascii=False)))
+    f.write(risks_head)
+    count = 0
+    batch: List[str] = []
+    for risk in risks:
+        batch.append(encode(risk_to_record(risk)))
+        if len(batch) >= batch_size:
+            f.write((separator if count else '') + separator.join(batch))
+            count += len(batch)
+            batch = []
+    if batch:
+        f.write((separator if count else '') + separator.join(batch))
+        count += len(batch)
+    if not compact and count == 0:
+        tail = '    ]\n}'
+    f.write(tail)
+    return count
+
+
+class RegisterReader:
+    """Liest ein Risikoregister inkrementell in Stapeln begrenzter Größe.
+
+    Der Parser hält nur ein Lesefenster des Dateiinhalts im Speicher. Die
+    Reihenfolge der Schlüssel ist beliebig: project_budget steht nach dem
+    Lesen der Stapel auch dann zur Verfügung, wenn es hinter "risks" steht.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, compression: Optional[str] = 'auto',
+                 read_size: int = 1 << 16):
+        if batch_size < 1:
+            raise ValueError("batch_size muss positiv sein")
+        self.path = path
+        self.batch_size = batch_size
+        self.read_size = read_size
+        self.project_budget: Optional[float] = None
+        self.metadata: Dict[str, Any] = {}
+        self._raw = open(path, 'rb')
+        self.total_bytes = os.fstat(self._raw.fileno()).st_size
+        if compression == 'auto':
+            compression = _detect_compression(self._raw)
+        self._stream = io.TextIOWrapper(_wrap_binary(self._raw, 'rb', compression), encoding='utf-8')
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._stream.close()
+        self._raw.close()
+
+    @property
+    def bytes_read(self) -> int:
+        """Gelesene Bytes der (ggf. komprimierten) Datei, für Fortschrittsanzeigen"""
+        return self._raw.tell() if not self._raw.closed else self.total_bytes
+
+    @property
+    def progress(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    # Lesefenster
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(size or self.read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> str:
+        """Überspringt Leerraum und gibt das nächste Zeichen zurück ('' am Dateiende)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> None:
+        if self._skip_whitespace() != char:
+            raise ValueError(f"Ungültiges Registerformat: '{char}' erwartet")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Dekodiert den nächsten JSON-Wert und lädt bei Bedarf nach"""
+        self._skip_whitespace()
+        read_size = self.read_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # Eine Zahl am Fensterende könnte abgeschnitten sein
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            if not self._fill(read_size):
+                continue
+            read_size *= 2
+
+    def batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """Liefert die Risiko-Datensätze in Stapeln von höchstens batch_size"""
+        self._expect('{')
+        if self._skip_whitespace() == '}':
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == 'risks':
+                yield from self._risk_batches()
+            else:
+                value = self._value()
+                self.metadata[key] = value
+                if key == 'project_budget':
+                    self.project_budget = value
+            next_char = self._skip_whitespace()
+            self._pos += 1
+            if next_char == '}':
+                return
+            if next_char != ',':
+                raise ValueError("Ungültiges Registerformat: ',' oder '}' erwartet")
+
+    def _risk_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        self._expect('[')
+        batch: List[Dict[str, Any]] = []
+        if self._skip_whitespace() == ']':
+            self._pos += 1
+            return
+        while True:
+            batch.append(self._value())
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+            next_char = self._skip_whitespace()
+            self._pos += 1
+            if next_char == ']':
+                break
+            if next_char != ',':
+                raise ValueError("Ungültiges Registerformat: ',' oder ']' erwartet")
+        if batch:
+            yield batch
+
+
+@instrumented("persistence.load_register")
+def load_register(path: str, risk_manager, batch_size: int = 1000,
+                  on_batch: Optional[Callable[[List[Risk], float], None]] = None,
+                  metadata: Optional[Dict[str, Any]] = None) -> int:
+    """Lädt ein Register stapelweise in einen RiskManager (vorhandene Risiken werden ersetzt).
+
+    on_batch wird nach jedem Stapel mit den neuen Risiken und dem Lesefortschritt (0-1) aufgerufen.
+    Weitere Schlüssel der Datei werden in metadata übernommen, falls übergeben.
+    Gibt die Anzahl der geladenen Risiken zurück.
+    """
+    count = 0
+    with RegisterReader(path, batch_size=batch_size) as reader, risk_manager.batch():
+        risk_manager.clear_risks()
+        for batch in reader.batches():
+            added = risk_manager.add_risks(record_to_kwargs(record) for record in batch)
+            count += len(added)
+            if on_batch is not None:
+                on_batch(added, reader.progress)
+        if 'project_budget' not in reader.metadata:
+            raise ValueError("Register enthält kein Projektbudget")
+        if reader.project_budget is not None:
+            risk_manager.set_project_budget(reader.project_budget)
+        if metadata is not None:
+            metadata.update(reader.metadata)
+    return count
+
+
+def record_to_kwargs(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Wandelt einen Datensatz in Argumente für RiskManager.add_risk um"""
+    return {
+        'risk_id': record.get('id'),
+        'name': record['name'],
+        'description': record['description'],
+        'probability': record['probability'],
+        'impact': record['impact'],
+        'reporting_level': record.get('reporting_level', ''),
+        'risk_type': record.get('risk_type', '')
+    }
@@ -0,0 +1,217 @@
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..models.risk import Risk
+from .events import ADDED, BUDGET_CHANGED, BULK_LOADED, CLEARED, DELETED, UPDATED, RiskEvent
+from .risk_index import normalize_key
+from .risk_manager import RiskManager
+
+# Aggregat-Schlüssel: (Reporting Level, Risiko-Typ), normalisiert wie im RiskIndex
+_Cell = Tuple[str, str]
+
+
+@dataclass
+class Aggregate:
+    """Laufende Summen über eine Menge von Risiken"""
+    count: int = 0
+    expected_value: float = 0.0   # Summe Wahrscheinlichkeit (dezimal) * Auswirkung
+    impact: float = 0.0           # Summe der Auswirkungen
+    budget: float = 0.0           # Budget, auf das sich die Exposition bezieht
+
+    @property
+    def exposure_percent(self) -> float:
+        """Erwartungswert in Prozent des Budgets"""
+        return self.expected_value / self.budget * 100 if self.budget else 0.0
+
+    def _apply(self, count: int, expected_value: float, impact: float) -> None:
+        self.count += count
+        self.expected_value += expected_value
+        self.impact += impact
+
+
+class PortfolioManager:
+    """Hält die RiskManager vieler Projekte und liefert Auswertungen über alle.
+
+    Je Projekt und Zelle (Reporting Level, Risiko-Typ) werden Anzahl,
+    Erwartungswert und Auswirkung laufend aus den Änderungsereignissen der
+    Projekte nachgeführt. Abfragen summieren daher nur über die wenigen Zellen,
+    nie über die Risiken; nur nach Laden/Leeren eines Projekts wird dieses eine
+    Projekt (vektorisiert) neu erfasst.
+    """
+
+    def __init__(self):
+        self.projects: Dict[str, RiskManager] = {}
+        self._cells: Dict[str, Dict[_Cell, Aggregate]] = {}
+        self._totals: Dict[_Cell, Aggregate] = defaultdict(Aggregate)
+        self._budgets: Dict[str, float] = {}
+        self._unsubscribe = {}
+        # Anzeigename je normalisiertem Kategorie-Wert (erste Schreibweise gewinnt)
+        self._labels: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.projects)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.projects
+
+    def add_project(self, name: str, risk_manager: Optional[RiskManager] = None) -> RiskManager:
+        """Nimmt ein Projekt auf (neuer RiskManager, falls keiner übergeben wird)"""
+        if name in self.projects:
+            raise ValueError(f"Projekt {name} existiert bereits")
+        risk_manager = risk_manager if risk_manager is not None else RiskManager()
+        self.projects[name] = risk_manager
+        self._cells[name] = defaultdict(Aggregate)
+        self._budgets[name] = risk_manager.project_budget or 0.0
+        self._rescan(name)
+        self._unsubscribe[name] = risk_manager.events.subscribe(
+            lambda events, name=name: self._on_events(name, events))
+        return risk_manager
+
+    def remove_project(self, name: str) -> RiskManager:
+        if name not in self.projects:
+            raise ValueError(f"Projekt {name} nicht gefunden")
+        self._unsubscribe.pop(name)()
+        self._drop_cells(name)
+        del self._cells[name], self._budgets[name]
+        return self.projects.pop(name)
+
+    def project(self, name: str) -> RiskManager:
+        if name not in self.projects:
+            raise ValueError(f"Projekt {name} nicht gefunden")
+        return self.projects[name]
+
+    @property
+    def total_budget(self) -> float:
+        return sum(self._budgets.values())
+
+    # Abfragen (Kosten proportional zur Zahl der Zellen, nicht der Risiken)
+    def summary(self, reporting_level: Optional[str] = None, risk_type: Optional[str] = None,
+                project: Optional[str] = None) -> Aggregate:
+        """Summen über alle (bzw. ein) Projekt(e), optional gefiltert; Exposition relativ zum Budget"""
+        if project is not None:
+            self.project(project)
+            cells, budget = self._cells[project], self._budgets[project]
+        else:
+            cells, budget = self._totals, self.total_budget
+        level_key = None if reporting_level is None else normalize_key(reporting_level)
+        type_key = None if risk_type is None else normalize_key(risk_type)
+        result = Aggregate(budget=budget)
+        for (level, kind), aggregate in cells.items():
+            if (level_key is None or level == level_key) and (type_key is None or kind == type_key):
+                result._apply(aggregate.count, aggregate.expected_value, aggregate.impact)
+        return result
+
+    def by_reporting_level(self, project: Optional[str] = None) -> Dict[str, Aggregate]:
+        """Rollup je Reporting Level (z.B. für SteerCo-Berichte)"""
+        return self._rollup(0, project)
+
+    def by_risk_type(self, project: Optional[str] = None) -> Dict[str, Aggregate]:
+        return self._rollup(1, project)
+
+    def by_project(self) -> Dict[str, Aggregate]:
+        return {name: self.summary(project=name) for name in self.projects}
+
+    def _rollup(self, position: int, project: Optional[str]) -> Dict[str, Aggregate]:
+        if project is not None:
+            self.project(project)
+        cells = self._totals if project is None else self._cells[project]
+        budget = self.total_budget if project is None else self._budgets[project]
+        result: Dict[str, Aggregate] = {}
+        for cell, aggregate in cells.items():
+            label = self._labels.get(cell[position], cell[position])
+            rollup = result.setdefault(label, Aggregate(budget=budget))
+            rollup._apply(aggregate.count, aggregate.expected_value, aggregate.impact)
+        return result
+
+    def top_risks(self, n: int = 10, reporting_level: Optional[str] = None,
+                  risk_type: Optional[str] = None) -> List[Tuple[str, Risk]]:
+        """Die n Risiken mit dem höchsten Erwartungswert über alle Projekte als (Projekt, Risiko).
+
+        Ohne Filter werden nur die Top-n jedes Projekts aus dessen Heaps
+        (RiskManager.top_k) zusammengeführt; mit Filter werden die Spalten der
+        Projekte maskiert.
+        """
+        if n <= 0:
+            return []
+        if reporting_level is None and risk_type is None:
+            best = ((risk.risk_score, name, risk) for name, risk_manager in self.projects.items()
+                    for risk in risk_manager.top_k(n))
+            return [(name, risk) for _, name, risk in heapq.nlargest(n, best, key=lambda entry: entry[0])]
+        candidates = []
+        for name, risk_manager in self.projects.items():
+            store = risk_manager.store
+            rows = np.flatnonzero(store.mask(risk_type, reporting_level))
+            if not len(rows):
+                continue
+            scores = store.risk_scores()[rows]
+            if len(rows) > n:
+                best = np.argpartition(scores, -n)[-n:]
+                rows, scores = rows[best], scores[best]
+            candidates.extend((float(score), name, int(risk_id))
+                              for score, risk_id in zip(scores, store.ids[rows]))
+        return [(name, self.projects[name].get_risk(risk_id))
+                for _, name, risk_id in heapq.nlargest(n, candidates, key=lambda entry: entry[0])]
+
+    # Laufende Aggregate
+    def _on_events(self, name: str, events: List[RiskEvent]) -> None:
+        for event in events:
+            if event.kind in (BULK_LOADED, CLEARED):
+                self._rescan(name)
+            elif event.kind == BUDGET_CHANGED:
+                self._budgets[name] = event.changes.get('project_budget') or 0.0
+            elif event.kind == ADDED:
+                self._add(name, event.risk.reporting_level, event.risk.risk_type,
+                          event.risk.probability, event.risk.impact, 1)
+            elif event.kind == DELETED:
+                old = event.previous
+                self._add(name, old['reporting_level'], old['risk_type'], old['probability'], old['impact'], -1)
+            elif event.kind == UPDATED:
+                # previous enthält nur die geänderten Felder, der Rest steht unverändert im Risiko
+                risk = event.risk
+                old = {key: event.previous.get(key, getattr(risk, key))
+                       for key in ('reporting_level', 'risk_type', 'probability', 'impact')}
+                self._add(name, old['reporting_level'], old['risk_type'], old['probability'], old['impact'], -1)
+                self._add(name, risk.reporting_level, risk.risk_type, risk.probability, risk.impact, 1)
+
+    def _cell(self, reporting_level: str, risk_type: str) -> _Cell:
+        cell = (normalize_key(reporting_level), normalize_key(risk_type))
+        self._labels.setdefault(cell[0], reporting_level or "")
+        self._labels.setdefault(cell[1], risk_type or "")
+        return cell
+
+    def _add(self, name: str, reporting_level: str, risk_type: str, probability: float, impact: float,
+             sign: int) -> None:
+        cell = self._cell(reporting_level, risk_type)
+        expected_value = probability / 100 * impact
+        self._cells[name][cell]._apply(sign, sign * expected_value, sign * impact)
+        self._totals[cell]._apply(sign, sign * expected_value, sign * impact)
+
+    def _drop_cells(self, name: str) -> None:
+        for cell, aggregate in self._cells[name].items():
+            self._totals[cell]._apply(-aggregate.count, -aggregate.expected_value, -aggregate.impact)
+            if self._totals[cell].count == 0:
+                del self._totals[cell]
+        self._cells[name].clear()
+
+    def _rescan(self, name: str) -> None:
+        """Erfasst ein Projekt neu aus den Spalten seines RiskStore (nach Laden oder Leeren)"""
+        self._drop_cells(name)
+        risk_manager = self.projects[name]
+        self._budgets[name] = risk_manager.project_budget or 0.0
+        store = risk_manager.store
+        if not len(store):
+            return
+        cells = store.reporting_codes.astype(np.int64) * len(store.risk_types.labels) + store.type_codes
+        size = len(store.reporting_levels.labels) * len(store.risk_types.labels)
+        counts = np.bincount(cells, minlength=size)
+        expected_values = np.bincount(cells, weights=store.risk_scores(), minlength=size)
+        impacts = np.bincount(cells, weights=store.impacts, minlength=size)
+        for index in np.flatnonzero(counts):
+            level_code, type_code = divmod(int(index), len(store.risk_types.labels))
+            cell = self._cell(store.reporting_levels.decode(level_code), store.risk_types.decode(type_code))
+            self._cells[name][cell]._apply(int(counts[index]), float(expected_values[index]),
+                                           float(impacts[index]))
+            self._totals[cell]._apply(int(counts[index]), float(expected_values[index]),
+                                      float(impacts[index]))
@@ -0,0 +1,113 @@
+import heapq
+from typing import Callable, Dict, Iterable, List, Tuple
+from ..models.risk import Risk
+
+# Rangfolge-Schlüssel je Heap; der Budgetanteil ist bei festem Budget proportional zur Auswirkung
+RANK_KEYS: Dict[str, Callable[[Risk], float]] = {
+    'expected_value': lambda risk: risk.risk_score,
+    'impact': lambda risk: risk.impact
+}
+METRICS = ('expected_value', 'impact', 'budget_usage')
+
+# Anteil veralteter Heap-Einträge, ab dem ein Heap neu aufgebaut wird
+_COMPACT_FACTOR = 2
+
+
+class RiskRanking:
+    """Max-Heaps je Rangfolge-Schlüssel mit verzögertem Löschen.
+
+    Änderungen legen nur einen neuen Eintrag mit neuer Version an; veraltete
+    Einträge werden erst beim Abfragen verworfen (oder beim Neuaufbau, wenn sie
+    überhandnehmen). top_k und above kosten so O((k + veraltete) log n). Ein
+    Heap wird beim ersten Abruf seines Schlüssels aufgebaut.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Risk]]):
+        self._source = source
+        self._heaps: Dict[str, List[Tuple[float, int, int]]] = {}
+        self._versions: Dict[int, int] = {}   # aktuelle Version je Risiko-ID
+        self._version = 0
+
+    def _next_version(self, risk_id: int) -> int:
+        self._version += 1
+        self._versions[risk_id] = self._version
+        return self._version
+
+    def _build(self, key: str) -> None:
+        rank = RANK_KEYS[key]
+        heap = []
+        for risk in self._source():
+            version = self._versions.get(risk.id)
+            if version is None:
+                version = self._next_version(risk.id)
+            heap.append((-rank(risk), risk.id, version))
+        heapq.heapify(heap)
+        self._heaps[key] = heap
+
+    def _push(self, risk: Risk) -> None:
+        version = self._next_version(risk.id)
+        for key, heap in self._heaps.items():
+            heapq.heappush(heap, (-RANK_KEYS[key](risk), risk.id, version))
+
+    def add(self, risk: Risk) -> None:
+        self._push(risk)
+
+    def add_many(self, risks: List[Risk]) -> None:
+        if self._heaps and len(risks) > len(self._versions):
+            # Großer Import: Heaps beim nächsten Abruf neu aufbauen statt einzeln einfügen
+            self._heaps.clear()
+            for risk in risks:
+                self._next_version(risk.id)
+            return
+        for risk in risks:
+            self._push(risk)
+
+    def update(self, risk: Risk) -> None:
+        # Der alte Eintrag wird durch die neue Version ungültig
+        self._push(risk)
+        self._maybe_compact()
+
+    def remove(self, risk_id: int) -> None:
+        self._versions.pop(risk_id, None)
+        self._maybe_compact()
+
+    def clear(self) -> None:
+        self._heaps.clear()
+        self._versions.clear()
+
+    def _maybe_compact(self) -> None:
+        for key, heap in list(self._heaps.items()):
+            if len(heap) > _COMPACT_FACTOR * len(self._versions) + 64:
+                self._heaps[key] = [entry for entry in heap if self._versions.get(entry[1]) == entry[2]]
+                heapq.heapify(self._heaps[key])
+
+    def _heap(self, key: str) -> List[Tuple[float, int, int]]:
+        if key not in RANK_KEYS:
+            raise ValueError(f"Unbekannter Rangfolge-Schlüssel: {key}")
+        if key not in self._heaps:
+            self._build(key)
+        return self._heaps[key]
+
+    def _take(self, key: str, stop: Callable[[float, int], bool]) -> List[Tuple[int, float]]:
+        """Entnimmt gültige Einträge absteigend, bis stop(wert, anzahl) gilt, und legt sie zurück"""
+        heap = self._heap(key)
+        taken = []
+        while heap:
+            entry = heap[0]
+            if self._versions.get(entry[1]) != entry[2]:
+                heapq.heappop(heap)   # veraltet: endgültig verwerfen
+                continue
+            if stop(-entry[0], len(taken)):
+                break
+            taken.append(heapq.heappop(heap))
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [(risk_id, -negated) for negated, risk_id, _ in taken]
+
+    def top_k(self, k: int, key: str = 'expected_value') -> List[Tuple[int, float]]:
+        """Die k Risiken mit dem höchsten Schlüsselwert als (ID, Wert), absteigend"""
+        return self._take(key, lambda value, count: count >= k)
+
+    def above(self, threshold: float, key: str = 'expected_value') -> List[Tuple[int, float]]:
+        """Alle Risiken mit Schlüsselwert > threshold als (ID, Wert), absteigend"""
+        return self._take(key, lambda value, count: value <= threshold)
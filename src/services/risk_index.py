@@ -0,0 +1,104 @@
+from typing import Dict, List, Optional, Tuple
+from ..models.risk import Risk
+
+
+def normalize_key(value) -> str:
+    """Normalisiert einen Indexschlüssel (Groß-/Kleinschreibung egal)"""
+    if value is None:
+        return ""
+    return str(value).casefold()
+
+
+class RiskIndex:
+    """Hash-Indizes über Kategorie-Attribute der Risiken.
+
+    Jeder Index bildet einen normalisierten Schlüssel auf die Risiken mit
+    diesem Wert ab. Abfragen kosten damit Zeit proportional zur Ergebnisgröße.
+    """
+
+    FIELDS = ("risk_type", "reporting_level", "risk_level")
+
+    def __init__(self):
+        self._buckets: Dict[str, Dict[str, Dict[int, Risk]]] = {field: {} for field in self.FIELDS}
+        # Zuletzt indizierte Schlüssel je Risiko, damit auch nach Änderungen sauber entfernt wird
+        self._keys: Dict[int, Tuple[str, ...]] = {}
+
+    def _keys_of(self, risk: Risk) -> Tuple[str, ...]:
+        return tuple(normalize_key(getattr(risk, field, None)) for field in self.FIELDS)
+
+    def add(self, risk: Risk) -> None:
+        """Nimmt ein Risiko in alle Indizes auf"""
+        keys = self._keys_of(risk)
+        for field, key in zip(self.FIELDS, keys):
+            self._buckets[field].setdefault(key, {})[risk.id] = risk
+        self._keys[risk.id] = keys
+
+    def remove(self, risk_id: int) -> None:
+        """Entfernt ein Risiko aus allen Indizes"""
+        keys = self._keys.pop(risk_id, None)
+        if keys is None:
+            return
+        for field, key in zip(self.FIELDS, keys):
+            self._discard(field, key, risk_id)
+
+    def update(self, risk: Risk) -> None:
+        """Indiziert ein geändertes Risiko neu (nur Felder mit geändertem Schlüssel)"""
+        old_keys = self._keys.get(risk.id)
+        if old_keys is None:
+            self.add(risk)
+            return
+        new_keys = self._keys_of(risk)
+        for field, old_key, new_key in zip(self.FIELDS, old_keys, new_keys):
+            if old_key != new_key:
+                self._discard(field, old_key, risk.id)
+                self._buckets[field].setdefault(new_key, {})[risk.id] = risk
+        self._keys[risk.id] = new_keys
+
+    def clear(self) -> None:
+        for buckets in self._buckets.values():
+            buckets.clear()
+        self._keys.clear()
+
+    def _discard(self, field: str, key: str, risk_id: int) -> None:
+        bucket = self._buckets[field].get(key)
+        if bucket is None:
+            return
+        bucket.pop(risk_id, None)
+        if not bucket:
+            del self._buckets[field][key]
+
+    def lookup(self, field: str, value) -> List[Risk]:
+        """Gibt alle Risiken mit dem angegebenen Wert im Feld zurück"""
+        bucket = self._buckets[field].get(normalize_key(value))
+        return list(bucket.values()) if bucket else []
+
+    def filter(self, **criteria) -> Optional[List[Risk]]:
+        """Schneidet mehrere Indizes; iteriert nur über den kleinsten Treffer-Bucket.
+
+        Gibt None zurück, wenn kein Kriterium gesetzt ist.
+        """
+        unknown = set(criteria) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unbekannte Filterfelder: {', '.join(sorted(unknown))}")
+        buckets = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            bucket = self._buckets[field].get(normalize_key(value))
+            if not bucket:
+                return []
+            buckets.append(bucket)
+        if not buckets:
+            return None
+        buckets.sort(key=len)
+        smallest, others = buckets[0], buckets[1:]
+        return [risk for risk_id, risk in smallest.items()
+                if all(risk_id in other for other in others)]
+
+    def count(self, field: str, value) -> int:
+        bucket = self._buckets[field].get(normalize_key(value))
+        return len(bucket) if bucket else 0
+
+    def keys(self, field: str) -> List[str]:
+        """Gibt alle vorhandenen (normalisierten) Schlüssel eines Feldes zurück"""
+        return list(self._buckets[field])
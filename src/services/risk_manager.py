@@ -1,18 +1,60 @@
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Iterable, Optional
 from datetime import datetime
+import numpy as np
 from ..models.risk import Risk
+from .aggregates import RiskSummary, RunningAggregates
+from .events import (ADDED, BUDGET_CHANGED, BULK_LOADED, CLEARED, DELETED, UPDATED,
+                     EventBus, RiskEvent)
+from .instrumentation import instrumented
+from .ranking import METRICS, RiskRanking
+from .risk_store import RiskStore
+from .sort_index import SortIndex
+from .storage import MemoryBackend, RiskBackend, SQLiteBackend
+
+# Felder eines Risikos, die in Lösch-Ereignissen als vorheriger Zustand mitgegeben werden
+_EVENT_FIELDS = ('name', 'description', 'probability', 'impact', 'reporting_level', 'risk_type')
 
 class RiskManager:
-    def __init__(self):
-        self.risks = {}
-        self.next_id = 1
+    def __init__(self, backend: Optional[RiskBackend] = None):
+        # Speicher-Backend (Standard: im Speicher); SQLiteBackend für große Register
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.next_id = self.backend.max_id() + 1
         self.project_budget = None
+        self.store = RiskStore()
+        # Nur die Spalten lesen: ein gefülltes Backend wird beim Start nicht in Risk-Objekte geladen
+        self.store.extend_rows(self.backend.columns())
+        # Sortierreihenfolgen je Spalte für Tabellen (werden beim ersten Abruf aufgebaut)
+        self.sort_index = SortIndex(self.backend.values)
+        # Max-Heaps für top_k und risks_above (werden beim ersten Abruf aufgebaut)
+        self.ranking = RiskRanking(self.backend.values)
+        # Laufende Summen für summary() (Erwartungswert, Level, Typen)
+        self.aggregates = RunningAggregates()
+        self.aggregates.add_store(self.store)
+        # Optionales Änderungsjournal (siehe services.journal)
+        self.journal = None
+        # Änderungsereignisse für GUI, Matrix und Kennzahlen
+        self.events = EventBus()
+    
+    @property
+    def risks(self) -> RiskBackend:
+        """Risiken als Mapping ID -> Risiko (nur lesend verwenden)"""
+        return self.backend
+    
+    def batch(self):
+        """Fasst alle Änderungen im with-Block zu einem Ereignisstapel zusammen"""
+        return self.events.batch()
     
     def set_project_budget(self, budget: float):
         """Setzt das Projektbudget"""
         if budget <= 0:
             raise ValueError("Budget muss positiv sein")
+        previous = self.project_budget
         self.project_budget = budget
+        self.aggregates.set_budget(budget)
+        if self.journal is not None:
+            self.journal.record_budget(budget)
+        self.events.publish(RiskEvent(BUDGET_CHANGED, previous={'project_budget': previous},
+                                      changes={'project_budget': budget}))
         
     def get_project_budget(self) -> float:
         """Gibt das Projektbudget zurück"""
@@ -20,11 +62,17 @@ class RiskManager:
             raise ValueError("Projektbudget wurde noch nicht gesetzt")
         return self.project_budget
     
+    @instrumented("risk_manager.add_risk")
     def add_risk(self, name: str, description: str, probability: float, 
-                 impact: float, reporting_level: str, risk_type: str) -> Risk:
-        """Fügt ein neues Risiko hinzu"""
+                 impact: float, reporting_level: str, risk_type: str,
+                 risk_id: Optional[int] = None) -> Risk:
+        """Fügt ein neues Risiko hinzu (optional mit vorgegebener ID, z.B. beim Laden)"""
+        if risk_id is None:
+            risk_id = self.next_id
+        elif risk_id in self.backend:
+            raise ValueError(f"Risiko mit ID {risk_id} existiert bereits")
         risk = Risk(
-            id=self.next_id,
+            id=risk_id,
             name=name,
             description=description,
             probability=probability,
@@ -32,51 +80,219 @@ class RiskManager:
             reporting_level=reporting_level,
             risk_type=risk_type
         )
-        self.risks[self.next_id] = risk
-        self.next_id += 1
+        self.backend.add(risk)
+        self.store.add(risk)
+        self.sort_index.add(risk)
+        self.aggregates.add(risk)
+        self.ranking.add(risk)
+        self.next_id = max(self.next_id, risk_id + 1)
+        if self.journal is not None:
+            self.journal.record_add(risk)
+        self.events.publish(RiskEvent(ADDED, risk_id, risk))
         return risk
     
+    @instrumented("risk_manager.add_risks")
+    def add_risks(self, records: Iterable[Dict[str, Any]]) -> List[Risk]:
+        """Fügt viele Risiken in einem Schritt hinzu (Import, Laden).
+
+        records enthält die Argumente von add_risk; die Backends schreiben gebündelt.
+        """
+        risks = []
+        new_ids = set()
+        next_id = self.next_id
+        for record in records:
+            record = dict(record)
+            risk_id = record.pop('risk_id', None)
+            if risk_id is None:
+                risk_id = next_id
+            elif risk_id in new_ids or risk_id in self.backend:
+                raise ValueError(f"Risiko mit ID {risk_id} existiert bereits")
+            new_ids.add(risk_id)
+            next_id = max(next_id, risk_id + 1)
+            risks.append(Risk(id=risk_id, **record))
+        self.backend.add_many(risks)
+        self.store.extend(risks)
+        self.sort_index.add_many(risks)
+        self.aggregates.add_many(risks)
+        self.ranking.add_many(risks)
+        self.next_id = next_id
+        if self.journal is not None:
+            # Kompaktierung erst nach dem letzten Eintrag (der Snapshot enthält bereits alle Risiken)
+            with self.journal.deferred():
+                for risk in risks:
+                    self.journal.record_add(risk)
+        if risks:
+            self.events.publish(RiskEvent(BULK_LOADED))
+        return risks
+    
+    @instrumented("risk_manager.update_risk")
     def update_risk(self, risk_id: int, **kwargs) -> Risk:
-        if risk_id not in self.risks:
+        risk = self.backend.get(risk_id)
+        if risk is None:
             raise ValueError(f"Risiko mit ID {risk_id} nicht gefunden")
         
-        risk = self.risks[risk_id]
-        for key, value in kwargs.items():
-            if hasattr(risk, key):
-                setattr(risk, key, value)
+        changes = {key: value for key, value in kwargs.items() if hasattr(risk, key)}
+        previous = {key: getattr(risk, key) for key in changes}
+        for key, value in changes.items():
+            setattr(risk, key, value)
         
+        # Abgeleitete Werte (Score, Level) verwirft das Risiko bei Änderungen selbst
         risk.updated_at = datetime.now()
+        self.backend.update(risk)
+        self.store.update(risk)
+        self.sort_index.update(risk)
+        self.aggregates.update(risk, previous)
+        self.ranking.update(risk)
+        if self.journal is not None:
+            self.journal.record_update(risk_id, changes)
+        self.events.publish(RiskEvent(UPDATED, risk_id, risk, previous, changes))
         return risk
     
+    @instrumented("risk_manager.delete_risk")
     def delete_risk(self, risk_id: int) -> None:
-        if risk_id not in self.risks:
+        risk = self.backend.get(risk_id)
+        if risk is None:
             raise ValueError(f"Risiko mit ID {risk_id} nicht gefunden")
-        del self.risks[risk_id]
+        self.backend.delete(risk_id)
+        self.store.remove(risk_id)
+        self.sort_index.remove(risk_id)
+        self.aggregates.remove(risk)
+        self.ranking.remove(risk_id)
+        if self.journal is not None:
+            self.journal.record_delete(risk_id)
+        self.events.publish(RiskEvent(DELETED, risk_id, risk,
+                                      previous={key: getattr(risk, key) for key in _EVENT_FIELDS}))
+    
+    @instrumented("risk_manager.clear_risks")
+    def clear_risks(self) -> None:
+        """Entfernt alle Risiken"""
+        self.backend.clear()
+        self.store.clear()
+        self.sort_index.clear()
+        self.aggregates.clear()
+        self.ranking.clear()
+        self.next_id = 1
+        if self.journal is not None:
+            self.journal.record_clear()
+        self.events.publish(RiskEvent(CLEARED))
     
+    @instrumented("risk_manager.replace_register")
+    def replace_register(self, staging: 'RiskManager') -> None:
+        """Übernimmt Risiken und Budget eines separat geladenen RiskManagers in einem Schritt.
+
+        Die Risiken werden in das eigene Backend kopiert (ein SQLite-Register
+        bleibt also persistent), Spalten und Summen werden von staging übernommen;
+        staging darf danach nicht weiterverwendet werden. So kann ein Register im
+        Hintergrund geladen werden, ohne das bestehende vorher anzutasten.
+        """
+        risks = list(staging.backend.values())
+        with self.batch():
+            self.backend.replace_all(risks)
+            staging.backend.close()
+            self.store, self.aggregates = staging.store, staging.aggregates
+            self.aggregates.set_budget(self.project_budget)
+            # Sortierungen und Heaps beim nächsten Abruf aus dem eigenen Backend neu aufbauen
+            self.sort_index.clear()
+            self.ranking.clear()
+            self.next_id = staging.next_id
+            if self.journal is not None:
+                with self.journal.deferred():
+                    self.journal.record_clear()
+                    for risk in risks:
+                        self.journal.record_add(risk)
+            self.events.publish(RiskEvent(CLEARED))
+            if risks:
+                self.events.publish(RiskEvent(BULK_LOADED))
+            if staging.project_budget is not None:
+                self.set_project_budget(staging.project_budget)
+
     def get_risk(self, risk_id: int) -> Optional[Risk]:
-        return self.risks.get(risk_id)
+        return self.backend.get(risk_id)
     
     def get_all_risks(self) -> list:
         """Gibt alle Risiken zurück"""
-        return list(self.risks.values())
+        return list(self.backend.values())
     
+    @instrumented("risk_manager.get_risks_by_type")
     def get_risks_by_type(self, risk_type: str) -> List[Risk]:
-        return [risk for risk in self.risks.values() 
-                if risk.risk_type.lower() == risk_type.lower()]
+        return self.backend.find(risk_type=risk_type)
     
+    @instrumented("risk_manager.get_risks_by_reporting_level")
     def get_risks_by_reporting_level(self, level: str) -> List[Risk]:
-        return [risk for risk in self.risks.values() 
-                if risk.reporting_level.lower() == level.lower()]
+        return self.backend.find(reporting_level=level)
     
+    @instrumented("risk_manager.get_high_risks")
     def get_high_risks(self) -> List[Risk]:
-        return [risk for risk in self.risks.values() 
-                if risk.risk_level == "Hoch"]
+        return self.backend.find(risk_level="Hoch")
     
+    @instrumented("risk_manager.get_risks_by_owner")
     def get_risks_by_owner(self, owner: str) -> List[Risk]:
-        return [risk for risk in self.risks.values() 
-                if risk.owner.lower() == owner.lower()]
+        return self.backend.find(owner=owner)
+    
+    @instrumented("risk_manager.filter_risks")
+    def filter_risks(self, risk_type: Optional[str] = None, reporting_level: Optional[str] = None,
+                     risk_level: Optional[str] = None, owner: Optional[str] = None) -> List[Risk]:
+        """Kombinierter Filter (UND-Verknüpfung); None bedeutet: Feld nicht filtern"""
+        return self.backend.find(
+            risk_type=risk_type,
+            reporting_level=reporting_level,
+            risk_level=risk_level,
+            owner=owner
+        )
+    
+    @instrumented("risk_manager.sorted_ids")
+    def sorted_ids(self, column: str = 'id', descending: bool = False, risk_type: Optional[str] = None,
+                   reporting_level: Optional[str] = None, risk_level: Optional[str] = None,
+                   owner: Optional[str] = None) -> List[int]:
+        """IDs sortiert nach einer Spalte (siehe sort_index.SORT_KEYS), optional gefiltert wie filter_risks"""
+        ids = None
+        if any(value is not None for value in (risk_type, reporting_level, risk_level, owner)):
+            ids = {risk.id for risk in self.filter_risks(risk_type, reporting_level, risk_level, owner)}
+        return self.sort_index.order(column, descending, ids)
+    
+    def _ranking_key(self, metric: str) -> str:
+        if metric not in METRICS:
+            raise ValueError(f"Unbekannte Kennzahl: {metric} (erlaubt: {', '.join(METRICS)})")
+        # Budgetanteil = Auswirkung / Budget: gleiche Reihenfolge wie die Auswirkung
+        return 'impact' if metric == 'budget_usage' else metric
+    
+    @instrumented("risk_manager.top_k")
+    def top_k(self, k: int, metric: str = 'expected_value') -> List[Risk]:
+        """Die k Risiken mit dem höchsten Erwartungswert, der höchsten Auswirkung oder dem höchsten Budgetanteil"""
+        if metric == 'expected_value' and isinstance(self.backend, SQLiteBackend):
+            # Über den Score-Index der Datenbank, ohne alle Risiken für den Heap zu laden
+            return self.backend.find_by_score(float('-inf'), limit=max(0, k))
+        return [self.backend.get(risk_id) for risk_id, _ in self.ranking.top_k(k, self._ranking_key(metric))]
+    
+    @instrumented("risk_manager.risks_above")
+    def risks_above(self, threshold: float, metric: str = 'expected_value') -> List[Risk]:
+        """Alle Risiken, deren Kennzahl threshold übersteigt, absteigend (budget_usage in Prozent)"""
+        if metric == 'budget_usage':
+            threshold = threshold * self.get_project_budget() / 100
+        elif metric == 'expected_value' and isinstance(self.backend, SQLiteBackend):
+            return self.backend.find_by_score(threshold)
+        return [self.backend.get(risk_id) for risk_id, _ in self.ranking.above(threshold, self._ranking_key(metric))]
+    
+    def summary(self) -> RiskSummary:
+        """Kennzahlen des Registers aus den laufenden Summen (ohne die Risiken zu durchlaufen)"""
+        return self.aggregates.summary()
+    
+    def verify_aggregates(self) -> List[str]:
+        """Prüft die laufenden Summen gegen eine vollständige Neuberechnung (leer = konsistent)"""
+        return self.aggregates.verify(self.backend.values())
+    
+    @instrumented("risk_manager.score_portfolio")
+    def score_portfolio(self) -> Dict[str, np.ndarray]:
+        """Berechnet Erwartungswert, Risiko-Level und Budgetanteil aller Risiken vektorisiert"""
+        budget = self.project_budget or 0
+        return {
+            'id': self.store.ids.copy(),
+            'risk_score': self.store.risk_scores(),
+            'risk_level': self.store.risk_levels(),
+            'budget_usage_percent': self.store.budget_usage_percent(budget)
+        }
     
     def get_overdue_risks(self) -> List[Risk]:
         now = datetime.now()
-        return [risk for risk in self.risks.values() 
+        return [risk for risk in self.backend.values() 
                 if risk.due_date and risk.due_date < now]
\ No newline at end of file
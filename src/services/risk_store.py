@@ -0,0 +1,197 @@
+from itertools import islice
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.risk import Risk
+from .risk_index import normalize_key
+
+# Schwellwerte wie in Risk._calculate_risk_level (Wahrscheinlichkeit in % * Auswirkung)
+LEVEL_THRESHOLDS = np.array([10.0, 30.0])
+LEVELS = ("Niedrig", "Mittel", "Hoch")
+
+
+class CategoryCodes:
+    """Bildet Kategorie-Strings (Groß-/Kleinschreibung egal) auf Integer-Codes ab"""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def encode(self, value) -> int:
+        key = normalize_key(value)
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self.labels)
+            self._codes[key] = code
+            self.labels.append(value if value is not None else "")
+        return code
+
+    def code_of(self, value) -> Optional[int]:
+        """Gibt den Code zurück oder None, wenn der Wert unbekannt ist"""
+        return self._codes.get(normalize_key(value))
+
+    def decode(self, code: int) -> str:
+        return self.labels[code]
+
+    def clear(self) -> None:
+        self._codes.clear()
+        self.labels.clear()
+
+
+class RiskStore:
+    """Spaltenorientierte Ablage der numerischen Risikodaten in NumPy-Arrays.
+
+    Die Zeilen sind dicht gepackt; beim Löschen rückt die letzte Zeile nach,
+    daher ist die Zeilenreihenfolge nicht die Einfügereihenfolge.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(1, capacity)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._probabilities = np.empty(capacity, dtype=np.float64)
+        self._impacts = np.empty(capacity, dtype=np.float64)
+        self._type_codes = np.empty(capacity, dtype=np.int32)
+        self._reporting_codes = np.empty(capacity, dtype=np.int32)
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self.risk_types = CategoryCodes()
+        self.reporting_levels = CategoryCodes()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, risk_id: int) -> bool:
+        return risk_id in self._rows
+
+    # Spalten (Views auf die belegten Zeilen)
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        return self._probabilities[:self._size]
+
+    @property
+    def impacts(self) -> np.ndarray:
+        return self._impacts[:self._size]
+
+    @property
+    def type_codes(self) -> np.ndarray:
+        return self._type_codes[:self._size]
+
+    @property
+    def reporting_codes(self) -> np.ndarray:
+        return self._reporting_codes[:self._size]
+
+    def row_of(self, risk_id: int) -> int:
+        return self._rows[risk_id]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_ids", "_probabilities", "_impacts", "_type_codes", "_reporting_codes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _write_row(self, row: int, risk: Risk) -> None:
+        self._ids[row] = risk.id
+        self._probabilities[row] = risk.probability
+        self._impacts[row] = risk.impact
+        self._type_codes[row] = self.risk_types.encode(risk.risk_type)
+        self._reporting_codes[row] = self.reporting_levels.encode(risk.reporting_level)
+
+    def add(self, risk: Risk) -> None:
+        """Fügt ein Risiko als neue Zeile an (oder überschreibt die bestehende)"""
+        row = self._rows.get(risk.id)
+        if row is None:
+            self._reserve(self._size + 1)
+            row = self._size
+            self._size += 1
+            self._rows[risk.id] = row
+        self._write_row(row, risk)
+
+    def extend(self, risks: List[Risk]) -> None:
+        """Fügt viele Risiken mit einer einzigen Vergrößerung der Arrays an"""
+        self._reserve(self._size + len(risks))
+        for risk in risks:
+            self.add(risk)
+
+    def extend_rows(self, rows: Iterable[Tuple[int, float, float, str, str]], batch_size: int = 10000) -> None:
+        """Fügt Zeilen (ID, Wahrscheinlichkeit, Auswirkung, Risiko-Typ, Reporting Level) blockweise an.
+
+        Für das Einlesen eines Backends: es werden keine Risk-Objekte benötigt.
+        Die IDs dürfen noch nicht enthalten sein.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            ids, probabilities, impacts, risk_types, reporting_levels = zip(*batch)
+            start, end = self._size, self._size + len(batch)
+            self._reserve(end)
+            self._ids[start:end] = ids
+            self._probabilities[start:end] = probabilities
+            self._impacts[start:end] = impacts
+            self._type_codes[start:end] = [self.risk_types.encode(value) for value in risk_types]
+            self._reporting_codes[start:end] = [self.reporting_levels.encode(value) for value in reporting_levels]
+            self._rows.update(zip(ids, range(start, end)))
+            self._size = end
+
+    def update(self, risk: Risk) -> None:
+        self.add(risk)
+
+    def remove(self, risk_id: int) -> None:
+        row = self._rows.pop(risk_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            for column in (self._ids, self._probabilities, self._impacts,
+                           self._type_codes, self._reporting_codes):
+                column[row] = column[last]
+            self._rows[int(self._ids[row])] = row
+        self._size = last
+
+    def clear(self) -> None:
+        self._size = 0
+        self._rows.clear()
+        self.risk_types.clear()
+        self.reporting_levels.clear()
+
+    # Vektorisierte Kennzahlen
+    def risk_scores(self) -> np.ndarray:
+        """Erwartungswerte aller Risiken (Wahrscheinlichkeit in Dezimal * Auswirkung)"""
+        return self.probabilities / 100 * self.impacts
+
+    def risk_level_codes(self) -> np.ndarray:
+        """Risiko-Level als Codes 0-2 (Index in LEVELS)"""
+        return np.digitize(self.probabilities * self.impacts, LEVEL_THRESHOLDS)
+
+    def risk_levels(self) -> np.ndarray:
+        """Risiko-Level als Strings ("Niedrig", "Mittel", "Hoch")"""
+        return np.asarray(LEVELS)[self.risk_level_codes()]
+
+    def budget_usage_percent(self, budget: float) -> np.ndarray:
+        """Anteil der Auswirkung am Budget in Prozent"""
+        if not budget or budget <= 0:
+            return np.zeros(self._size)
+        return self.impacts / budget * 100
+
+    def mask(self, risk_type: Optional[str] = None, reporting_level: Optional[str] = None) -> np.ndarray:
+        """Boolesche Zeilenmaske für Kategorie-Filter"""
+        mask = np.ones(self._size, dtype=bool)
+        for codes, column, value in ((self.risk_types, self.type_codes, risk_type),
+                                     (self.reporting_levels, self.reporting_codes, reporting_level)):
+            if value is None:
+                continue
+            code = codes.code_of(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= column == code
+        return mask
@@ -0,0 +1,234 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+IMPACT_DISTRIBUTIONS = ("fixed", "uniform", "triangular")
+
+
+@dataclass
+class SimulationResult:
+    """Verlustverteilung einer Monte-Carlo-Simulation (Beträge in Mio. Euro)"""
+    n_trials: int
+    seed: int                    # Entropie der SeedSequence, reproduziert das Ergebnis
+    project_budget: Optional[float]
+    bin_edges: np.ndarray        # Histogramm-Grenzen (bins + 1)
+    counts: np.ndarray           # Anzahl Durchläufe je Bin
+    bin_sums: np.ndarray         # Summe der Verluste je Bin (für CVaR)
+    mean: float
+    std: float
+    max_loss: float
+    exceedance_count: int        # Durchläufe mit Verlust > Projektbudget
+
+    @property
+    def exceedance_probability(self) -> Optional[float]:
+        """Wahrscheinlichkeit, dass der Verlust das Projektbudget übersteigt"""
+        if self.project_budget is None or self.n_trials == 0:
+            return None
+        return self.exceedance_count / self.n_trials
+
+    def percentile(self, q: float) -> float:
+        """Perzentil der Verlustverteilung (q in Prozent), linear im Bin interpoliert"""
+        if not 0 <= q <= 100:
+            raise ValueError("Perzentil muss zwischen 0 und 100 liegen")
+        if self.n_trials == 0:
+            return 0.0
+        target = q / 100 * self.n_trials
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, target))
+        i = min(i, len(self.counts) - 1)
+        before = cumulative[i - 1] if i > 0 else 0
+        fraction = (target - before) / self.counts[i] if self.counts[i] else 0.0
+        lower, upper = self.bin_edges[i], self.bin_edges[i + 1]
+        return float(min(lower + fraction * (upper - lower), self.max_loss))
+
+    def percentiles(self, qs: Sequence[float] = (50, 90, 95, 99)) -> Dict[float, float]:
+        return {q: self.percentile(q) for q in qs}
+
+    def value_at_risk(self, confidence: float = 0.95) -> float:
+        """Value at Risk: Verlust, der mit der angegebenen Konfidenz nicht überschritten wird"""
+        return self.percentile(confidence * 100)
+
+    def conditional_value_at_risk(self, confidence: float = 0.95) -> float:
+        """Conditional VaR: mittlerer Verlust jenseits des VaR"""
+        if self.n_trials == 0:
+            return 0.0
+        var = self.value_at_risk(confidence)
+        target = confidence * self.n_trials
+        cumulative = np.cumsum(self.counts)
+        i = min(int(np.searchsorted(cumulative, target)), len(self.counts) - 1)
+        tail_count = self.n_trials - target
+        if tail_count <= 0:
+            return self.max_loss
+        # Anteil des VaR-Bins oberhalb des VaR mit dem Bin-Mittel (mindestens VaR) gewichten
+        partial = cumulative[i] - target
+        bin_mean = self.bin_sums[i] / self.counts[i] if self.counts[i] else var
+        tail_sum = float(self.bin_sums[i + 1:].sum()) + partial * max(var, bin_mean)
+        return tail_sum / tail_count
+
+    def histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.counts, self.bin_edges
+
+
+@dataclass
+class _BlockResult:
+    """Teilergebnis eines Simulationsblocks"""
+    counts: np.ndarray
+    bin_sums: np.ndarray
+    total: float
+    total_sq: float
+    max_loss: float
+    exceedance_count: int
+
+
+def _simulate_block(probabilities: np.ndarray, impacts: np.ndarray, low: np.ndarray, high: np.ndarray,
+                    distribution: str, seed: np.random.SeedSequence, n_trials: int,
+                    bin_edges: np.ndarray, budget: Optional[float], chunk_trials: int) -> _BlockResult:
+    """Simuliert einen Block von Durchläufen in speicherbegrenzten Teilstücken"""
+    rng = np.random.default_rng(seed)
+    # Eigener Strom für die Auswirkungen, damit beide Ströme unabhängig von chunk_trials gleich verbraucht werden
+    impact_rng = rng if distribution == "fixed" else np.random.default_rng(seed.spawn(1)[0])
+    bins = len(bin_edges) - 1
+    width = bin_edges[1] - bin_edges[0]
+    counts = np.zeros(bins, dtype=np.int64)
+    bin_sums = np.zeros(bins, dtype=np.float64)
+    total = total_sq = max_loss = 0.0
+    exceedance_count = 0
+    n_risks = len(probabilities)
+
+    for start in range(0, n_trials, chunk_trials):
+        size = (min(chunk_trials, n_trials - start), n_risks)
+        occurred = rng.random(size) < probabilities
+        if distribution == "fixed":
+            draws = impacts
+        elif distribution == "uniform":
+            draws = impact_rng.uniform(low, high, size)
+        else:
+            draws = impact_rng.triangular(low, impacts, high, size)
+        losses = np.where(occurred, draws, 0.0).sum(axis=1)
+
+        index = np.minimum((losses / width).astype(np.int64), bins - 1)
+        counts += np.bincount(index, minlength=bins)
+        bin_sums += np.bincount(index, weights=losses, minlength=bins)
+        total += float(losses.sum())
+        total_sq += float(np.dot(losses, losses))
+        if len(losses):
+            max_loss = max(max_loss, float(losses.max()))
+        if budget is not None:
+            exceedance_count += int(np.count_nonzero(losses > budget))
+
+    return _BlockResult(counts, bin_sums, total, total_sq, max_loss, exceedance_count)
+
+
+class MonteCarloSimulation:
+    """Monte-Carlo-Simulation der Portfolio-Verluste.
+
+    Jedes Risiko tritt pro Durchlauf mit seiner Wahrscheinlichkeit ein
+    (Bernoulli); die Auswirkung ist fest oder wird aus einer Verteilung um
+    den erfassten Wert gezogen. Die Durchläufe werden in Blöcken mit eigenem
+    Seed-Strom simuliert, jeder Block in Teilstücken von höchstens
+    ``max_chunk_elements`` Zufallszahlen. Die volle Durchlauf-Matrix wird nie
+    im Speicher gehalten.
+    """
+
+    def __init__(self, impact_distribution: str = "fixed", impact_spread: Tuple[float, float] = (0.5, 1.5),
+                 bins: int = 1000, block_trials: int = 65536, max_chunk_elements: int = 2 ** 20):
+        if impact_distribution not in IMPACT_DISTRIBUTIONS:
+            raise ValueError(f"Unbekannte Verteilung: {impact_distribution}")
+        low, high = impact_spread
+        if not 0 <= low <= 1 <= high:
+            raise ValueError("Streuung muss 0 <= unten <= 1 <= oben erfüllen")
+        if bins < 1 or block_trials < 1 or max_chunk_elements < 1:
+            raise ValueError("bins, block_trials und max_chunk_elements müssen positiv sein")
+        self.impact_distribution = impact_distribution
+        self.impact_spread = (float(low), float(high))
+        self.bins = bins
+        self.block_trials = block_trials
+        self.max_chunk_elements = max_chunk_elements
+
+    def run(self, risk_manager, n_trials: int, seed: Optional[int] = None) -> SimulationResult:
+        """Simuliert die aktuellen Risiken eines RiskManagers gegen dessen Projektbudget"""
+        store = risk_manager.store
+        return self.run_arrays(store.probabilities, store.impacts, n_trials,
+                               seed=seed, project_budget=risk_manager.project_budget)
+
+    def run_arrays(self, probabilities: Sequence[float], impacts: Sequence[float], n_trials: int,
+                   seed: Optional[int] = None, project_budget: Optional[float] = None) -> SimulationResult:
+        """Simuliert Risiken aus Arrays (Wahrscheinlichkeit in Prozent, Auswirkung in Mio. Euro)"""
+        probabilities, impacts = self._prepare_inputs(probabilities, impacts, n_trials)
+        seed_sequence = np.random.SeedSequence(seed)
+        block_seeds = self._block_seeds(seed_sequence, n_trials)
+        low, high = self._impact_bounds(impacts)
+        bin_edges = self._bin_edges(high)
+        chunk_trials = self._chunk_trials(len(probabilities))
+
+        blocks = [
+            _simulate_block(probabilities / 100, impacts, low, high, self.impact_distribution,
+                            block_seed, block_size, bin_edges, project_budget, chunk_trials)
+            for block_seed, block_size in block_seeds
+        ]
+        return self._merge(blocks, n_trials, seed_sequence, bin_edges, project_budget)
+
+    def _prepare_inputs(self, probabilities, impacts, n_trials: int) -> Tuple[np.ndarray, np.ndarray]:
+        probabilities = np.ascontiguousarray(probabilities, dtype=np.float64)
+        impacts = np.ascontiguousarray(impacts, dtype=np.float64)
+        if probabilities.shape != impacts.shape or probabilities.ndim != 1:
+            raise ValueError("Wahrscheinlichkeiten und Auswirkungen müssen gleich lange Vektoren sein")
+        if n_trials < 1:
+            raise ValueError("Anzahl der Durchläufe muss positiv sein")
+        if np.any((probabilities < 0) | (probabilities > 100)):
+            raise ValueError("Wahrscheinlichkeit muss zwischen 0 und 100 Prozent liegen")
+        if np.any(impacts < 0):
+            raise ValueError("Auswirkung muss positiv sein")
+        return probabilities, impacts
+
+    def _block_seeds(self, seed_sequence: np.random.SeedSequence,
+                     n_trials: int) -> List[Tuple[np.random.SeedSequence, int]]:
+        """Teilt die Durchläufe in Blöcke mit unabhängigen, deterministischen Seed-Strömen"""
+        n_blocks = math.ceil(n_trials / self.block_trials)
+        sizes = [self.block_trials] * (n_blocks - 1) + [n_trials - self.block_trials * (n_blocks - 1)]
+        return list(zip(seed_sequence.spawn(n_blocks), sizes))
+
+    def _impact_bounds(self, impacts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.impact_distribution == "fixed":
+            return impacts, impacts
+        low, high = self.impact_spread
+        return impacts * low, impacts * high
+
+    def _bin_edges(self, high: np.ndarray) -> np.ndarray:
+        upper = float(high.sum())
+        return np.linspace(0.0, upper if upper > 0 else 1.0, self.bins + 1)
+
+    def _chunk_trials(self, n_risks: int) -> int:
+        return max(1, self.max_chunk_elements // max(1, n_risks))
+
+    @staticmethod
+    def _merge(blocks: List[_BlockResult], n_trials: int, seed_sequence: np.random.SeedSequence,
+               bin_edges: np.ndarray, project_budget: Optional[float]) -> SimulationResult:
+        """Führt Blockergebnisse in Blockreihenfolge zusammen (deterministische Summation)"""
+        bins = len(bin_edges) - 1
+        counts = np.zeros(bins, dtype=np.int64)
+        bin_sums = np.zeros(bins, dtype=np.float64)
+        total = total_sq = max_loss = 0.0
+        exceedance_count = 0
+        for block in blocks:
+            counts += block.counts
+            bin_sums += block.bin_sums
+            total += block.total
+            total_sq += block.total_sq
+            max_loss = max(max_loss, block.max_loss)
+            exceedance_count += block.exceedance_count
+        mean = total / n_trials
+        std = math.sqrt(max(0.0, total_sq / n_trials - mean * mean))
+        return SimulationResult(
+            n_trials=n_trials,
+            seed=seed_sequence.entropy,
+            project_budget=project_budget,
+            bin_edges=bin_edges,
+            counts=counts,
+            bin_sums=bin_sums,
+            mean=mean,
+            std=std,
+            max_loss=max_loss,
+            exceedance_count=exceedance_count
+        )
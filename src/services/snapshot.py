@@ -0,0 +1,274 @@
+import json
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from ..models.risk import Risk
+from .persistence import RegisterReader, load_register, record_to_kwargs, risk_to_record, save_register
+
+MAGIC = b"RMSNAP\x00\x00"
+VERSION = 2
+SNAPSHOT_SUFFIX = ".rmsnap"
+
+# Magic, Version, Anzahl, Projektbudget (NaN = nicht gesetzt), Größe Kategorien, Größe String-Heap,
+# CRC32 der Abschnitte; danach CRC32 über diese Felder (prüft Größen und damit alle Offsets)
+_HEADER = struct.Struct("<8sIQdQQI")
+_HEADER_CHECKSUM = struct.Struct("<I")
+_HEADER_SIZE = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(count: int, category_size: int, heap_size: int) -> Dict[str, int]:
+    """Berechnet die Byte-Offsets der Abschnitte hinter dem Header"""
+    layout = {}
+    offset = _HEADER_SIZE
+    for name, size in (("ids", 8 * count), ("probability", 8 * count), ("impact", 8 * count),
+                       ("type_codes", 4 * count), ("reporting_codes", 4 * count),
+                       ("string_offsets", 8 * (2 * count + 1)), ("categories", category_size),
+                       ("heap", heap_size)):
+        layout[name] = offset
+        offset = _align(offset + size)
+    layout["end"] = offset
+    return layout
+
+
+def write_snapshot(path: str, project_budget: Optional[float], records: Iterable[Dict[str, Any]]) -> int:
+    """Schreibt Risiko-Datensätze (Format wie im JSON-Register) als Binär-Snapshot.
+
+    Die Datei wird unter einem temporären Namen geschrieben und dann ersetzt.
+    Gibt die Anzahl der Risiken zurück.
+    """
+    ids, probabilities, impacts, type_codes, reporting_codes = [], [], [], [], []
+    categories: Dict[str, Dict[str, int]] = {"risk_type": {}, "reporting_level": {}}
+    heap = bytearray()
+    string_offsets = [0]
+    for record in records:
+        ids.append(record["id"])
+        probabilities.append(record["probability"])
+        impacts.append(record["impact"])
+        for field, codes in (("risk_type", type_codes), ("reporting_level", reporting_codes)):
+            table = categories[field]
+            codes.append(table.setdefault(record.get(field, ""), len(table)))
+        for field in ("name", "description"):
+            heap += record[field].encode("utf-8")
+            string_offsets.append(len(heap))
+
+    count = len(ids)
+    category_bytes = json.dumps({field: list(table) for field, table in categories.items()},
+                                ensure_ascii=False).encode("utf-8")
+    layout = _layout(count, len(category_bytes), len(heap))
+    body = bytearray(layout["end"] - _HEADER_SIZE)
+    sections = (
+        ("ids", np.asarray(ids, dtype="<i8").tobytes()),
+        ("probability", np.asarray(probabilities, dtype="<f8").tobytes()),
+        ("impact", np.asarray(impacts, dtype="<f8").tobytes()),
+        ("type_codes", np.asarray(type_codes, dtype="<i4").tobytes()),
+        ("reporting_codes", np.asarray(reporting_codes, dtype="<i4").tobytes()),
+        ("string_offsets", np.asarray(string_offsets, dtype="<u8").tobytes()),
+        ("categories", category_bytes),
+        ("heap", bytes(heap)),
+    )
+    for name, data in sections:
+        start = layout[name] - _HEADER_SIZE
+        body[start:start + len(data)] = data
+
+    budget = float("nan") if project_budget is None else float(project_budget)
+    header = _HEADER.pack(MAGIC, VERSION, count, budget, len(category_bytes), len(heap), zlib.crc32(body))
+    header += _HEADER_CHECKSUM.pack(zlib.crc32(header))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(_HEADER_SIZE, b"\x00"))
+        f.write(body)
+    os.replace(tmp_path, path)
+    return count
+
+
+def is_snapshot(path: str) -> bool:
+    """True, wenn die Datei mit der Snapshot-Kennung beginnt (unabhängig von der Endung)"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SnapshotReader:
+    """Öffnet einen Binär-Snapshot per mmap.
+
+    Die numerischen Spalten (ids, probabilities, impacts, Kategorie-Codes)
+    sind NumPy-Views direkt auf die Datei. Namen und Beschreibungen werden
+    erst beim Zugriff dekodiert. Beim Öffnen wird nur die Prüfsumme des
+    Headers geprüft; verify=True (oder verify()) liest zusätzlich alle
+    Abschnitte, berührt also jede Seite der Datei.
+    """
+
+    def __init__(self, path: str, verify: bool = False, batch_size: int = 10000):
+        if batch_size < 1:
+            raise ValueError("batch_size muss positiv sein")
+        self.path = path
+        self.batch_size = batch_size
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Snapshot ist leer oder beschädigt")
+        if len(self._mmap) < _HEADER_SIZE:
+            self.close()
+            raise ValueError("Snapshot ist leer oder beschädigt")
+        magic, version, count, budget, category_size, heap_size, checksum = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Keine Snapshot-Datei")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Nicht unterstützte Snapshot-Version: {version}")
+        header_checksum, = _HEADER_CHECKSUM.unpack_from(self._mmap, _HEADER.size)
+        if zlib.crc32(self._mmap[:_HEADER.size]) != header_checksum:
+            self.close()
+            raise ValueError("Prüfsumme des Snapshot-Headers stimmt nicht")
+        self.count = count
+        self.project_budget = None if np.isnan(budget) else budget
+        self._checksum = checksum
+        self._layout = _layout(count, category_size, heap_size)
+        if len(self._mmap) != self._layout["end"]:
+            self.close()
+            raise ValueError("Snapshot ist unvollständig")
+        if verify and not self.verify():
+            self.close()
+            raise ValueError("Prüfsumme des Snapshots stimmt nicht")
+
+        buffer = self._mmap
+        self.ids = np.frombuffer(buffer, dtype="<i8", count=count, offset=self._layout["ids"])
+        self.probabilities = np.frombuffer(buffer, dtype="<f8", count=count, offset=self._layout["probability"])
+        self.impacts = np.frombuffer(buffer, dtype="<f8", count=count, offset=self._layout["impact"])
+        self.type_codes = np.frombuffer(buffer, dtype="<i4", count=count, offset=self._layout["type_codes"])
+        self.reporting_codes = np.frombuffer(buffer, dtype="<i4", count=count,
+                                             offset=self._layout["reporting_codes"])
+        self._string_offsets = np.frombuffer(buffer, dtype="<u8", count=2 * count + 1,
+                                             offset=self._layout["string_offsets"])
+        start = self._layout["categories"]
+        categories = json.loads(bytes(buffer[start:start + category_size]).decode("utf-8"))
+        self.risk_types: List[str] = categories["risk_type"]
+        self.reporting_levels: List[str] = categories["reporting_level"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        # NumPy-Views halten Verweise auf die Abbildung; nur schließen, wenn keine mehr bestehen
+        for name in ("ids", "probabilities", "impacts", "type_codes", "reporting_codes", "_string_offsets"):
+            self.__dict__.pop(name, None)
+        try:
+            self._mmap.close()
+        except (AttributeError, BufferError):
+            pass
+        self._file.close()
+
+    def verify(self) -> bool:
+        """Prüft die CRC32-Prüfsumme über alle Abschnitte"""
+        with memoryview(self._mmap) as view:
+            return zlib.crc32(view[_HEADER_SIZE:]) == self._checksum
+
+    def _string(self, index: int) -> str:
+        start = self._layout["heap"] + int(self._string_offsets[index])
+        end = self._layout["heap"] + int(self._string_offsets[index + 1])
+        if not self._layout["heap"] <= start <= end <= self._layout["end"]:
+            raise ValueError("Snapshot ist beschädigt (String-Offsets)")
+        return self._mmap[start:end].decode("utf-8")
+
+    def name(self, row: int) -> str:
+        return self._string(2 * row)
+
+    def description(self, row: int) -> str:
+        return self._string(2 * row + 1)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Datensatz einer Zeile im Format des JSON-Registers"""
+        return {
+            'id': int(self.ids[row]),
+            'name': self.name(row),
+            'description': self.description(row),
+            'probability': float(self.probabilities[row]),
+            'impact': float(self.impacts[row]),
+            'reporting_level': self.reporting_levels[self.reporting_codes[row]],
+            'risk_type': self.risk_types[self.type_codes[row]]
+        }
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.count):
+            yield self.record(row)
+
+    def iter_risks(self) -> Iterator[Risk]:
+        for record in self.iter_records():
+            yield Risk(**record)
+
+    def batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """Datensätze in Stapeln von batch_size (wie RegisterReader.batches)"""
+        for start in range(0, self.count, self.batch_size):
+            yield [self.record(row) for row in range(start, min(start + self.batch_size, self.count))]
+
+    def load_into(self, risk_manager, on_batch: Optional[Callable[[List[Risk], float], None]] = None) -> int:
+        """Lädt den Snapshot in einen RiskManager (vorhandene Risiken werden ersetzt).
+
+        on_batch wird wie bei load_register nach jedem Stapel mit den neuen Risiken
+        und dem Fortschritt (0-1) aufgerufen.
+        """
+        with risk_manager.batch():
+            risk_manager.clear_risks()
+            loaded = 0
+            for batch in self.batches():
+                added = risk_manager.add_risks(record_to_kwargs(record) for record in batch)
+                loaded += len(batch)
+                if on_batch is not None:
+                    on_batch(added, loaded / self.count)
+            if self.project_budget is not None:
+                risk_manager.set_project_budget(self.project_budget)
+        return self.count
+
+
+def load_file(path: str, risk_manager, on_batch: Optional[Callable[[List[Risk], float], None]] = None) -> int:
+    """Lädt ein JSON-Register oder einen Binär-Snapshot (erkannt am Dateikopf) in einen RiskManager"""
+    if is_snapshot(path):
+        with SnapshotReader(path) as reader:
+            return reader.load_into(risk_manager, on_batch=on_batch)
+    return load_register(path, risk_manager, on_batch=on_batch)
+
+
+def save_file(path: str, project_budget: float, risks: Iterable[Risk]) -> int:
+    """Speichert als Binär-Snapshot (Endung .rmsnap) oder als JSON-Register (ggf. komprimiert)"""
+    if path.endswith(SNAPSHOT_SUFFIX):
+        return write_snapshot(path, project_budget, (risk_to_record(risk) for risk in risks))
+    return save_register(path, project_budget, risks)
+
+
+def save_snapshot(path: str, risk_manager) -> int:
+    """Schreibt den Inhalt eines RiskManagers als Binär-Snapshot"""
+    return write_snapshot(path, risk_manager.project_budget,
+                          (risk_to_record(risk) for risk in risk_manager.get_all_risks()))
+
+
+def json_to_snapshot(json_path: str, snapshot_path: str) -> int:
+    """Konvertiert ein JSON-Register (project_budget + risks) in einen Binär-Snapshot"""
+    with RegisterReader(json_path) as reader:
+        records = [record for batch in reader.batches() for record in batch]
+        if 'project_budget' not in reader.metadata:
+            raise ValueError("Register enthält kein Projektbudget")
+        return write_snapshot(snapshot_path, reader.project_budget, records)
+
+
+def snapshot_to_json(snapshot_path: str, json_path: str, compact: bool = False) -> int:
+    """Konvertiert einen Binär-Snapshot in das JSON-Register-Format"""
+    with SnapshotReader(snapshot_path) as reader:
+        return save_register(json_path, reader.project_budget, reader.iter_risks(), compact=compact)
@@ -0,0 +1,100 @@
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from ..models.risk import Risk
+
+# Sortierschlüssel je Spalte; Texte ohne Beachtung der Groß-/Kleinschreibung
+SORT_KEYS: Dict[str, Callable[[Risk], object]] = {
+    'id': lambda risk: risk.id,
+    'name': lambda risk: risk.name.casefold(),
+    'description': lambda risk: risk.description.casefold(),
+    'probability': lambda risk: risk.probability,
+    'impact': lambda risk: risk.impact,
+    'risk_score': lambda risk: risk.risk_score,
+    'reporting_level': lambda risk: risk.reporting_level.casefold(),
+    'risk_type': lambda risk: risk.risk_type.casefold(),
+    'risk_level': lambda risk: risk.risk_level.casefold()
+}
+
+# Felder, von denen der Sortierschlüssel einer Spalte abhängt
+SORT_FIELDS: Dict[str, Tuple[str, ...]] = {column: (column,) for column in SORT_KEYS}
+SORT_FIELDS.update(risk_score=('probability', 'impact'), risk_level=('probability', 'impact'))
+
+# Ab diesem Anteil neuer Risiken wird eine Spalte neu sortiert statt einzeln eingefügt
+_REBUILD_FRACTION = 0.25
+
+
+class SortIndex:
+    """Vorab sortierte Reihenfolgen der Risiken je Spalte.
+
+    Eine Spalte wird beim ersten Abruf einmal sortiert und danach bei jeder
+    Änderung per Binärsuche nachgeführt statt neu sortiert. Gleiche Schlüssel
+    sind nach ID geordnet, die Reihenfolge ist also stabil.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Risk]]):
+        # Liefert alle Risiken, wenn eine Spalte (neu) aufgebaut werden muss
+        self._source = source
+        self._orders: Dict[str, List[Tuple[object, int]]] = {}
+        self._keys: Dict[str, Dict[int, object]] = {}
+
+    def _build(self, column: str) -> None:
+        key = SORT_KEYS[column]
+        keys = {risk.id: key(risk) for risk in self._source()}
+        self._keys[column] = keys
+        self._orders[column] = sorted((value, risk_id) for risk_id, value in keys.items())
+
+    def _insert(self, column: str, risk: Risk) -> None:
+        value = SORT_KEYS[column](risk)
+        self._keys[column][risk.id] = value
+        bisect.insort(self._orders[column], (value, risk.id))
+
+    def _discard(self, column: str, risk_id: int) -> None:
+        value = self._keys[column].pop(risk_id)
+        order = self._orders[column]
+        del order[bisect.bisect_left(order, (value, risk_id))]
+
+    def add(self, risk: Risk) -> None:
+        for column in self._orders:
+            self._insert(column, risk)
+
+    def add_many(self, risks: List[Risk]) -> None:
+        for column in list(self._orders):
+            if len(risks) > _REBUILD_FRACTION * len(self._orders[column]):
+                # Viele neue Risiken: beim nächsten Abruf komplett neu sortieren
+                del self._orders[column], self._keys[column]
+            else:
+                for risk in risks:
+                    self._insert(column, risk)
+
+    def update(self, risk: Risk) -> None:
+        for column in self._orders:
+            if self._keys[column].get(risk.id) != SORT_KEYS[column](risk):
+                self._discard(column, risk.id)
+                self._insert(column, risk)
+
+    def remove(self, risk_id: int) -> None:
+        for column in self._orders:
+            self._discard(column, risk_id)
+
+    def clear(self) -> None:
+        self._orders.clear()
+        self._keys.clear()
+
+    def _ensure(self, column: str) -> None:
+        if column not in SORT_KEYS:
+            raise ValueError(f"Unbekannte Sortierspalte: {column}")
+        if column not in self._orders:
+            self._build(column)
+
+    def key(self, column: str, risk_id: int) -> Tuple[object, int]:
+        """Sortierschlüssel (Wert, ID) eines Risikos, nach dem order() ordnet"""
+        self._ensure(column)
+        return self._keys[column][risk_id], risk_id
+
+    def order(self, column: str, descending: bool = False, ids: Optional[Set[int]] = None) -> List[int]:
+        """IDs in der Sortierung einer Spalte; mit ids nur die enthaltenen"""
+        self._ensure(column)
+        entries = reversed(self._orders[column]) if descending else self._orders[column]
+        if ids is None:
+            return [risk_id for _, risk_id in entries]
+        return [risk_id for _, risk_id in entries if risk_id in ids]
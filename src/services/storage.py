@@ -0,0 +1,281 @@
+import sqlite3
+from abc import abstractmethod
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..models.risk import Risk
+from .risk_index import RiskIndex, normalize_key
+from .risk_store import LEVELS
+
+_LEVEL_NAMES = {normalize_key(level): level for level in LEVELS}
+
+
+class RiskBackend(Mapping):
+    """Gemeinsame Schnittstelle der Speicher-Backends des RiskManagers.
+
+    Ein Backend ist ein Mapping von Risiko-ID auf Risiko. Geänderte Risiken
+    werden mit update() zurückgeschrieben. find() filtert über die
+    Kategorie-Felder (Groß-/Kleinschreibung egal).
+    """
+
+    @abstractmethod
+    def add(self, risk: Risk) -> None:
+        ...
+
+    def add_many(self, risks: List[Risk]) -> None:
+        for risk in risks:
+            self.add(risk)
+
+    @abstractmethod
+    def update(self, risk: Risk) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, risk_id: int) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def replace_all(self, risks: List[Risk]) -> None:
+        """Ersetzt den gesamten Inhalt durch risks"""
+        self.clear()
+        self.add_many(risks)
+
+    @abstractmethod
+    def find(self, risk_type: Optional[str] = None, reporting_level: Optional[str] = None,
+             risk_level: Optional[str] = None, owner: Optional[str] = None) -> List[Risk]:
+        """UND-verknüpfter Filter; ohne Kriterien werden alle Risiken geliefert.
+
+        Risk hat kein owner-Feld: ein Filter nach Verantwortlichem trifft daher nie.
+        """
+
+    def columns(self) -> Iterator[Tuple[int, float, float, str, str]]:
+        """Je Risiko (ID, Wahrscheinlichkeit, Auswirkung, Risiko-Typ, Reporting Level) für den RiskStore"""
+        return ((risk.id, risk.probability, risk.impact, risk.risk_type, risk.reporting_level)
+                for risk in self.values())
+
+    def max_id(self) -> int:
+        return max(self, default=0)
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(RiskBackend):
+    """Hält die Risiken in einem Dict mit Hash-Indizes"""
+
+    def __init__(self):
+        self._risks: Dict[int, Risk] = {}
+        self._index = RiskIndex()
+
+    def __getitem__(self, risk_id: int) -> Risk:
+        return self._risks[risk_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._risks)
+
+    def __len__(self) -> int:
+        return len(self._risks)
+
+    def __contains__(self, risk_id) -> bool:
+        return risk_id in self._risks
+
+    def get(self, risk_id: int, default=None) -> Optional[Risk]:
+        return self._risks.get(risk_id, default)
+
+    def values(self):
+        return self._risks.values()
+
+    def add(self, risk: Risk) -> None:
+        self._risks[risk.id] = risk
+        self._index.add(risk)
+
+    def update(self, risk: Risk) -> None:
+        self._risks[risk.id] = risk
+        self._index.update(risk)
+
+    def delete(self, risk_id: int) -> None:
+        del self._risks[risk_id]
+        self._index.remove(risk_id)
+
+    def clear(self) -> None:
+        self._risks.clear()
+        self._index.clear()
+
+    def find(self, risk_type: Optional[str] = None, reporting_level: Optional[str] = None,
+             risk_level: Optional[str] = None, owner: Optional[str] = None) -> List[Risk]:
+        if owner is not None:
+            return []
+        result = self._index.filter(risk_type=risk_type, reporting_level=reporting_level,
+                                    risk_level=risk_level)
+        return list(self._risks.values()) if result is None else result
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS risks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    probability REAL NOT NULL,
+    impact REAL NOT NULL,
+    reporting_level TEXT NOT NULL,
+    risk_type TEXT NOT NULL,
+    reporting_key TEXT NOT NULL,
+    type_key TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    risk_score REAL NOT NULL,
+    budget REAL NOT NULL DEFAULT 0,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_risks_type ON risks (type_key);
+CREATE INDEX IF NOT EXISTS idx_risks_reporting ON risks (reporting_key);
+CREATE INDEX IF NOT EXISTS idx_risks_level ON risks (risk_level);
+CREATE INDEX IF NOT EXISTS idx_risks_score ON risks (risk_score);
+"""
+
+# Nachträglich hinzugekommene Spalten (werden in älteren Datenbanken ergänzt)
+_ADDED_COLUMNS = (("budget", "REAL NOT NULL DEFAULT 0"), ("created_at", "TEXT"))
+
+_COLUMNS = "id, name, description, probability, impact, reporting_level, risk_type, budget, created_at, updated_at"
+
+_UPSERT = """
+INSERT OR REPLACE INTO risks (id, name, description, probability, impact, reporting_level, risk_type,
+                              reporting_key, type_key, risk_level, risk_score, budget, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _timestamp(value) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else None
+
+
+class SQLiteBackend(RiskBackend):
+    """Persistiert die Risiken in einer lokalen SQLite-Datenbank (WAL-Modus).
+
+    Risiko-Typ, Reporting Level, Risiko-Level und Erwartungswert sind indiziert,
+    Filter laufen als SQL-Abfragen. Gelieferte Risiken sind Kopien; Änderungen
+    werden erst mit update() gespeichert.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(risks)")}
+        for column, definition in _ADDED_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE risks ADD COLUMN {column} {definition}")
+        self._conn.commit()
+
+    @staticmethod
+    def _row_params(risk: Risk) -> tuple:
+        return (
+            risk.id, risk.name, risk.description, risk.probability, risk.impact,
+            risk.reporting_level, risk.risk_type,
+            normalize_key(risk.reporting_level), normalize_key(risk.risk_type),
+            risk.risk_level, risk.risk_score, risk.budget,
+            _timestamp(risk.created_at), _timestamp(risk.updated_at)
+        )
+
+    @staticmethod
+    def _to_risk(row) -> Risk:
+        risk = Risk(id=row[0], name=row[1], description=row[2], probability=row[3],
+                    impact=row[4], reporting_level=row[5], risk_type=row[6], budget=row[7])
+        if row[8]:
+            risk.created_at = datetime.fromisoformat(row[8])
+        if row[9]:
+            risk.updated_at = datetime.fromisoformat(row[9])
+        return risk
+
+    def __getitem__(self, risk_id: int) -> Risk:
+        row = self._conn.execute(f"SELECT {_COLUMNS} FROM risks WHERE id = ?", (risk_id,)).fetchone()
+        if row is None:
+            raise KeyError(risk_id)
+        return self._to_risk(row)
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[0] for row in self._conn.execute("SELECT id FROM risks ORDER BY id"))
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM risks").fetchone()[0]
+
+    def __contains__(self, risk_id) -> bool:
+        return self._conn.execute("SELECT 1 FROM risks WHERE id = ?", (risk_id,)).fetchone() is not None
+
+    def values(self) -> Iterator[Risk]:
+        """Liefert alle Risiken über einen Cursor (ohne sie vorab zu sammeln)"""
+        return (self._to_risk(row) for row in self._conn.execute(f"SELECT {_COLUMNS} FROM risks ORDER BY id"))
+
+    def columns(self) -> Iterator[Tuple[int, float, float, str, str]]:
+        """Liest nur die Spalten des RiskStore (ohne Risk-Objekte anzulegen)"""
+        return self._conn.execute(
+            "SELECT id, probability, impact, risk_type, reporting_level FROM risks ORDER BY id")
+
+    def add(self, risk: Risk) -> None:
+        if risk.id in self:
+            raise ValueError(f"Risiko mit ID {risk.id} existiert bereits")
+        with self._conn:
+            self._conn.execute(_UPSERT, self._row_params(risk))
+
+    def add_many(self, risks: Iterable[Risk]) -> None:
+        """Fügt viele Risiken in einer Transaktion per executemany ein"""
+        with self._conn:
+            self._conn.executemany(_UPSERT, (self._row_params(risk) for risk in risks))
+
+    def replace_all(self, risks: Iterable[Risk]) -> None:
+        """Ersetzt den gesamten Inhalt in einer Transaktion (bei einem Fehler bleibt der alte Stand)"""
+        with self._conn:
+            self._conn.execute("DELETE FROM risks")
+            self._conn.executemany(_UPSERT, (self._row_params(risk) for risk in risks))
+
+    def update(self, risk: Risk) -> None:
+        with self._conn:
+            self._conn.execute(_UPSERT, self._row_params(risk))
+
+    def delete(self, risk_id: int) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM risks WHERE id = ?", (risk_id,))
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM risks")
+
+    def find(self, risk_type: Optional[str] = None, reporting_level: Optional[str] = None,
+             risk_level: Optional[str] = None, owner: Optional[str] = None) -> List[Risk]:
+        if owner is not None:
+            return []
+        conditions, params = [], []
+        for column, value in (("type_key", risk_type), ("reporting_key", reporting_level)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(normalize_key(value))
+        if risk_level is not None:
+            # Risiko-Level wird in Originalschreibweise gespeichert ("Niedrig", "Mittel", "Hoch")
+            level = _LEVEL_NAMES.get(normalize_key(risk_level))
+            if level is None:
+                return []
+            conditions.append("risk_level = ?")
+            params.append(level)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(f"SELECT {_COLUMNS} FROM risks{where} ORDER BY id", params)
+        return [self._to_risk(row) for row in rows]
+
+    def find_by_score(self, threshold: float, limit: Optional[int] = None) -> List[Risk]:
+        """Risiken mit Erwartungswert > threshold, absteigend wie RiskRanking (über den Score-Index)"""
+        query = f"SELECT {_COLUMNS} FROM risks WHERE risk_score > ? ORDER BY risk_score DESC, id"
+        params = [threshold]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [self._to_risk(row) for row in self._conn.execute(query, params)]
+
+    def max_id(self) -> int:
+        return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM risks").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,139 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+_SUFFIX = ".cache"
+
+
+@dataclass
+class CacheStats:
+    """Zähler eines RenderCache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0      # Einträge im Speicher
+    size_bytes: int = 0   # Größe der Einträge im Speicher
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RenderCache:
+    """LRU-Cache für gerenderte Bilder, adressiert über einen Inhalts-Hash.
+
+    Im Speicher liegen höchstens max_bytes. Mit directory werden Bilder
+    zusätzlich als Dateien abgelegt (höchstens max_disk_bytes, die am längsten
+    nicht gelesenen zuerst verdrängt) und überstehen so einen Neustart.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2**20, directory: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 2**20):
+        if max_bytes < 0 or max_disk_bytes < 0:
+            raise ValueError("Cache-Größe darf nicht negativ sein")
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._size)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Liefert das Bild zum Schlüssel oder None (zählt Treffer/Fehlschläge)"""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return data
+        data = self._read_file(key)
+        if data is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self._remember(key, data)
+        if self.directory:
+            self._write_file(key, data)
+            self._trim_disk()
+
+    def clear(self) -> None:
+        """Leert Speicher und Verzeichnis; die Zähler bleiben erhalten"""
+        self._entries.clear()
+        self._size = 0
+        for path, _, _ in self._disk_entries():
+            os.remove(path)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Zugriffszeit = Änderungszeit, danach richtet sich die Verdrängung
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _disk_entries(self):
+        if not self.directory:
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _trim_disk(self) -> None:
+        entries = self._disk_entries()
+        total = sum(size for _, _, size in entries)
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self._evictions += 1
@@ -1,162 +1,506 @@
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import os
 import numpy as np
-from typing import List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Dict, Optional, Tuple
 from collections import defaultdict
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import BoxStyle
+from matplotlib.path import Path
+from matplotlib.text import Text
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import IdentityTransform, ScaledTranslation
 from src.models.risk import Risk
+from src.services.instrumentation import instrumented
+from src.visualization.render_cache import RenderCache
+
+# Obergrenzen (inklusive) der Stufen 0-3 in Prozent; darüber liegt Stufe 4
+LEVEL_BOUNDS = np.array([5.0, 10.0, 50.0, 75.0])
+
+# Farbfelder der 5x5-Matrix: 1 = Grün, 2 = Gelb, 3 = Rot (abhängig von Impact- + Wahrscheinlichkeitsstufe)
+_LEVEL_SUM = np.add.outer(np.arange(5), np.arange(5))
+BACKGROUND = np.select([_LEVEL_SUM <= 2, _LEVEL_SUM >= 6], [1, 3], default=2)
+CELL_COLORS = ['#90EE90', '#FFFF00', '#FF6B6B']  # Grün, Gelb, Rot
+
+EXPORT_FORMATS = ("png", "svg", "pdf")
+# Bei Änderungen an der Darstellung erhöhen, damit alte Cache-Einträge nicht mehr passen
+RENDER_VERSION = 1
+
+# Die frühere Größenformel ergab durch die Untergrenze von 12 pt stets 12 pt
+LABEL_FONTSIZE = 12
+_LABEL_FONT = FontProperties(size=LABEL_FONTSIZE)
+_LABEL_BOX = BoxStyle('round', pad=0.3)  # Abgerundete Ecken
+
+
+@lru_cache(maxsize=None)
+def _glyph(char: str) -> Tuple[Path, float]:
+    """Umriss und Vorschubbreite (in Punkt) eines einzelnen Zeichens"""
+    width = text_to_path.get_text_width_height_descent(char, _LABEL_FONT, ismath=False)[0]
+    return TextPath((0, 0), char, prop=_LABEL_FONT), width
+
+
+_, _LABEL_HEIGHT, _LABEL_DESCENT = text_to_path.get_text_width_height_descent(
+    "R-0123456789", _LABEL_FONT, ismath=False)
+_LABEL_PAD = 0.3 * LABEL_FONTSIZE
+
+
+@lru_cache(maxsize=65536)
+def _label_paths(text: str) -> Tuple[Path, Path]:
+    """Rahmen- und Textpfad einer Beschriftung in Punkt, Rahmen unten links bei (0, 0).
+
+    Der Text wird aus zwischengespeicherten Zeichen zusammengesetzt, da das
+    Layout einzelner Text-Artists bei tausenden Beschriftungen zu teuer ist.
+    """
+    vertices, codes = [], []
+    x = _LABEL_PAD
+    baseline = _LABEL_PAD + _LABEL_DESCENT
+    for char in text:
+        glyph, width = _glyph(char)
+        if len(glyph.vertices):
+            vertices.append(glyph.vertices + (x, baseline))
+            codes.append(glyph.codes)
+        x += width
+    text_path = Path(np.concatenate(vertices), np.concatenate(codes)) if vertices else Path(np.empty((0, 2)))
+    box_path = _LABEL_BOX(_LABEL_PAD, _LABEL_PAD, x - _LABEL_PAD, _LABEL_HEIGHT, LABEL_FONTSIZE)
+    return box_path, text_path
+
+
+@dataclass
+class CellSummary:
+    """Zusammenfassung einer dicht belegten Zelle (Dichte-Modus)"""
+    count: int
+    expected_value: float  # Summe der Erwartungswerte in Mio. Euro
+    top_ids: List[int]     # IDs mit dem höchsten Erwartungswert, absteigend
+
+    def label(self) -> str:
+        lines = [f"{self.count} Risiken", f"Σ EW {self.expected_value:.2f}"]
+        lines.extend(f"R-{risk_id}" for risk_id in self.top_ids)
+        return "\n".join(lines)
+
+
+@dataclass
+class MatrixJob:
+    """Auftrag für den Batch-Export einer Risikomatrix"""
+    risks: List[Risk]
+    project_budget: float
+    title: str
+    path: str
+
+
+@dataclass
+class ExportResult:
+    """Ergebnis eines Export-Auftrags; error enthält bei Fehlschlag die Meldung"""
+    path: str
+    error: Optional[str] = None
+    cached: bool = False  # Bild kam aus dem Render-Cache
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _export_format(path: Optional[str], file_format: Optional[str]) -> str:
+    """Exportformat aus der Angabe oder der Dateiendung (Standard: PNG)"""
+    if not file_format and path:
+        file_format = os.path.splitext(path)[1].lstrip('.')
+    file_format = (file_format or 'png').lower()
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Nicht unterstütztes Exportformat: {file_format}")
+    return file_format
+
+
+def _write_image(path: str, data: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _error_result(path: str, error: Exception) -> ExportResult:
+    return ExportResult(path, f"{type(error).__name__}: {error}")
+
+
+def _export_job(payload: tuple) -> Tuple[ExportResult, Optional[bytes]]:
+    """Rendert einen Auftrag im Worker-Prozess; Fehler werden als Ergebnis zurückgegeben"""
+    positions, summaries, title, path, dpi, file_format, figsize = payload
+    try:
+        data = RiskMatrix()._render_bytes(positions, summaries, title, dpi, file_format, figsize)
+        _write_image(path, data)
+    except Exception as e:
+        return _error_result(path, e), None
+    return ExportResult(path), data
+
+
+def _export_isolated(payload: tuple) -> Tuple[ExportResult, Optional[bytes]]:
+    """Rendert einen Auftrag in einem eigenen Prozess, damit ein Absturz nur diesen Auftrag trifft"""
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return pool.submit(_export_job, payload).result()
+    except Exception as e:
+        return _error_result(payload[3], e), None
+
+
+class MatrixFigure:
+    """Figur mit einmalig gezeichnetem Hintergrund.
+
+    Alle Risiko-Beschriftungen liegen in einer einzigen PathCollection, die
+    beim Neuzeichnen nur neue Pfade und Positionen erhält.
+    """
+
+    def __init__(self, figure: Figure):
+        self.figure = figure
+        self.ax = figure.add_subplot(111, aspect='equal')  # Erzwingt quadratisches Verhältnis
+        # Ankerpunkt = linker Textrand, vertikale Mitte (wie ha='left', va='center')
+        anchor = ScaledTranslation(-_LABEL_PAD / 72, -(_LABEL_HEIGHT / 2 + _LABEL_PAD) / 72,
+                                   figure.dpi_scale_trans)
+        # Weißer Text auf rotem Grund mit schwarzem Rahmen; Pfade in Punkt (Größe 1 = 1 pt)
+        self.labels = PathCollection(
+            [], sizes=[1], offsets=np.empty((0, 2)), transform=IdentityTransform(),
+            offset_transform=self.ax.transData + anchor,
+            facecolors=['red', 'white'], edgecolors=['black', 'none'], linewidths=[1, 0], zorder=3)
+        self.ax.add_collection(self.labels, autolim=False)
+        self.positions: Dict[Tuple[int, int], tuple] = None
+        # Ein Text-Artist je Zelle im Dichte-Modus
+        self.summaries: Dict[Tuple[int, int], Text] = {}
+
 
 class RiskMatrix:
-    def __init__(self):
+    def __init__(self, density_threshold: int = 15, density_top_n: int = 3,
+                 render_cache: Optional[RenderCache] = None):
         self.levels = ["very low", "low", "medium", "high", "very high"]
-        
+        # Zellen mit mehr Risiken werden zusammengefasst statt einzeln beschriftet
+        self.density_threshold = density_threshold
+        self.density_top_n = density_top_n
+        # Gerenderte Bilder je Inhalts-Hash (render_image, export_matrix, export_batch)
+        self.render_cache = render_cache if render_cache is not None else RenderCache()
+        # Wiederverwendete pyplot-Figur für create_matrix
+        self._matrix_figure = None
+
     def _map_impact_to_level(self, impact: float, budget: float) -> int:
         """Mappt Impact-Werte auf Matrix-Level (0-4) basierend auf dem Projektbudget"""
         impact_percentage = (impact / budget) * 100
-        if impact_percentage <= 5:
-            return 0  # very low
-        elif impact_percentage <= 10:
-            return 1  # low
-        elif impact_percentage <= 50:
-            return 2  # medium
-        elif impact_percentage <= 75:
-            return 3  # high
-        else:
-            return 4  # very high
-    
+        return int(np.digitize(impact_percentage, LEVEL_BOUNDS, right=True))
+
     def _map_probability_to_level(self, probability: float) -> int:
         """Mappt Wahrscheinlichkeits-Werte auf Matrix-Level (0-4)"""
-        if probability <= 5:
-            return 0  # very low
-        elif probability <= 10:
-            return 1  # low
-        elif probability <= 50:
-            return 2  # medium
-        elif probability <= 75:
-            return 3  # high
-        else:
-            return 4  # very high
-    
+        return int(np.digitize(probability, LEVEL_BOUNDS, right=True))
+
+    def bin_levels(self, probabilities, impacts, project_budget: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Berechnet Impact- und Wahrscheinlichkeits-Level (0-4) für Arrays von Risiken"""
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        impact_percentages = np.asarray(impacts, dtype=np.float64) / project_budget * 100
+        return (np.digitize(impact_percentages, LEVEL_BOUNDS, right=True),
+                np.digitize(probabilities, LEVEL_BOUNDS, right=True))
+
+    def _cell_rows(self, probabilities, impacts, project_budget: float) -> Dict[Tuple[int, int], np.ndarray]:
+        """Zeilenindizes je Zelle (impact_level, prob_level), Reihenfolge bleibt erhalten"""
+        if len(probabilities) == 0:
+            return {}
+        impact_levels, prob_levels = self.bin_levels(probabilities, impacts, project_budget)
+        cells = impact_levels * 5 + prob_levels
+        order = np.argsort(cells, kind='stable')
+        sorted_cells = cells[order]
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        return {
+            divmod(int(sorted_cells[start]), 5): order[start:end]
+            for start, end in zip(starts, ends)
+        }
+
+    def group_positions(self, ids, probabilities, impacts,
+                        project_budget: float) -> Dict[Tuple[int, int], np.ndarray]:
+        """Gruppiert Risiko-IDs nach Zelle (impact_level, prob_level), Reihenfolge bleibt erhalten"""
+        ids = np.asarray(ids)
+        return {cell: ids[rows] for cell, rows in self._cell_rows(probabilities, impacts, project_budget).items()}
+
+    @instrumented("risk_matrix.layout_cells")
+    def layout_cells(self, ids, probabilities, impacts, project_budget: float,
+                     density: Optional[bool] = None) -> Tuple[Dict[Tuple[int, int], List[str]],
+                                                              Dict[Tuple[int, int], CellSummary]]:
+        """Teilt die Zellen in Einzelbeschriftungen und Dichte-Zusammenfassungen auf.
+
+        density=None fasst Zellen mit mehr als density_threshold Risiken
+        zusammen, True/False erzwingt den Modus für alle Zellen.
+        """
+        ids = np.asarray(ids)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        impacts = np.asarray(impacts, dtype=np.float64)
+        positions: Dict[Tuple[int, int], List[str]] = {}
+        summaries: Dict[Tuple[int, int], CellSummary] = {}
+        for cell, rows in self._cell_rows(probabilities, impacts, project_budget).items():
+            dense = len(rows) > self.density_threshold if density is None else density
+            if dense:
+                # Erwartungswert wie Risk.risk_score (Wahrscheinlichkeit in Dezimal)
+                scores = probabilities[rows] / 100 * impacts[rows]
+                top = rows[np.argsort(-scores, kind='stable')[:self.density_top_n]]
+                summaries[cell] = CellSummary(len(rows), float(scores.sum()), [int(risk_id) for risk_id in ids[top]])
+            else:
+                positions[cell] = [f"R-{risk_id}" for risk_id in ids[rows]]
+        return positions, summaries
+
+    def _risk_arrays(self, risks: List[Risk]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """IDs, Wahrscheinlichkeiten und Auswirkungen als Arrays"""
+        ids = np.fromiter((risk.id for risk in risks), dtype=np.int64, count=len(risks))
+        probabilities = np.fromiter((risk.probability for risk in risks), dtype=np.float64, count=len(risks))
+        impacts = np.fromiter((risk.impact for risk in risks), dtype=np.float64, count=len(risks))
+        return ids, probabilities, impacts
+
     def _group_risks_by_position(self, risks: List[Risk], project_budget: float) -> Dict[Tuple[int, int], List[str]]:
         """Gruppiert Risiken nach ihrer Position in der Matrix"""
         positions = defaultdict(list)
-        for risk in risks:
-            impact_level = self._map_impact_to_level(risk.impact, project_budget)
-            prob_level = self._map_probability_to_level(risk.probability)
-            positions[(impact_level, prob_level)].append(f"R-{risk.id}")  # Statt risk.name nun R-{risk.id}
+        for cell, cell_ids in self.group_positions(*self._risk_arrays(risks), project_budget).items():
+            positions[cell] = [f"R-{risk_id}" for risk_id in cell_ids]  # Statt risk.name nun R-{risk.id}
         return positions
-    
+
     def _truncate_text(self, text: str, max_chars: int = 20) -> str:
         """Kürzt Text auf maximale Zeichenanzahl"""
         if len(text) <= max_chars:
             return text
         return text[:max_chars-3] + "..."
-            
-    def create_matrix(self, risks: List[Risk], project_budget: float, title: str = "Risiko Matrix", save_path: str = None):
-        """Erstellt die Power-Matrix"""
-        # Figure mit quadratischem Aspektverhältnis erstellen
-        fig = plt.figure(figsize=(10, 10))  # Quadratische Grundgröße
-        ax = fig.add_subplot(111, aspect='equal')  # Erzwingt quadratisches Verhältnis
-        
-        # Titel setzen
-        plt.title(title, pad=20, fontsize=14, fontweight='bold')
-        
-        # Matrix für die Farbfelder erstellen (5x5)
-        matrix = np.zeros((5, 5))
-        for i in range(5):
-            for j in range(5):
-                if i + j <= 2:
-                    matrix[i, j] = 1  # Grün
-                elif i + j >= 6:
-                    matrix[i, j] = 3  # Rot
-                else:
-                    matrix[i, j] = 2  # Gelb
-        
-        # Farbpalette definieren
-        colors = ['#90EE90', '#FFFF00', '#FF6B6B']  # Grün, Gelb, Rot
-        cmap = plt.cm.colors.ListedColormap(colors)
-        
-        # Farbige Matrix zeichnen
-        ax.pcolormesh(np.arange(6), np.arange(6), matrix, cmap=cmap)
-        
+
+    def setup_figure(self, figure: Figure) -> MatrixFigure:
+        """Zeichnet den statischen Hintergrund (Farbfelder, Gitter, Achsen) einmalig"""
+        matrix_figure = MatrixFigure(figure)
+        ax = matrix_figure.ax
+
+        # Farbige Matrix zeichnen (Zeilen = Wahrscheinlichkeit, Spalten = Impact)
+        cmap = ListedColormap(CELL_COLORS)
+        ax.pcolormesh(np.arange(6), np.arange(6), BACKGROUND, cmap=cmap)
+
         # Gitternetz bei ganzzahligen Werten
         ax.grid(True, color='black', linewidth=1)
         ax.set_xticks(range(6))
         ax.set_yticks(range(6))
-        
+
         # Achsenbeschriftungen
         ax.set_xlabel('Impact', fontsize=12, fontweight='bold', labelpad=20)
         ax.set_ylabel('Probability', fontsize=12, fontweight='bold', labelpad=45)
-        
+
         # Beschriftungen direkt an den Achsen hinzufügen
         for i in range(5):
             # X-Achsen-Beschriftungen
-            ax.text(i + 0.5, -0.05, self.levels[i], 
+            ax.text(i + 0.5, -0.05, self.levels[i],
                    ha='center', va='top')
             # Y-Achsen-Beschriftungen
-            ax.text(-0.05, i + 0.5, self.levels[i], 
+            ax.text(-0.05, i + 0.5, self.levels[i],
                    ha='right', va='center')
-        
+
         # Numerische Beschriftungen ausblenden
         ax.set_xticklabels([])
         ax.set_yticklabels([])
-        
+
         # Achsengrenzen setzen
         ax.set_xlim(0, 5)
         ax.set_ylim(0, 5)
-        
-        # Risiken nach Position gruppieren
-        positions = self._group_risks_by_position(risks, project_budget)
-        
-        # Risiken platzieren
+
+        # Layout optimieren und Quadrat erzwingen
+        figure.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.9)
+        return matrix_figure
+
+    def _label_offsets(self, positions: Dict[Tuple[int, int], List[str]]) -> Tuple[List[str], np.ndarray]:
+        """Berechnet die Ankerpunkte aller Risiko-Beschriftungen (max. 3 nebeneinander je Zelle)"""
+        labels: List[str] = []
+        offsets = []
         for (impact_level, prob_level), risk_ids in positions.items():
             num_risks = len(risk_ids)
-            
+            if not num_risks:
+                continue
+
             # Berechne maximale Anzahl von Risiken pro Zeile
             max_risks_per_row = min(3, num_risks)  # Maximal 3 Risiken nebeneinander
             num_rows = (num_risks + max_risks_per_row - 1) // max_risks_per_row
-            
-            # Berechne Schriftgröße basierend auf verfügbarem Platz
-            # Ein Quadrant ist 1x1 Einheiten groß
-            base_fontsize = 12  # Basis-Schriftgröße
-            fontsize = min(
-                base_fontsize / num_rows,  # Vertikale Anpassung
-                base_fontsize / max_risks_per_row  # Horizontale Anpassung
-            )
-            fontsize = max(12, min(28, fontsize))  # Begrenzen zwischen 6 und 14
-            
-            for idx, risk_id in enumerate(risk_ids):
-                # Berechne Position in Reihen und Spalten
-                row = idx // max_risks_per_row
-                col = idx % max_risks_per_row
-                
-                # Berechne x und y Position mit Offset
-                x_offset = col * (0.8 / max_risks_per_row)  # Horizontaler Abstand
-                y_offset = row * (0.8 / num_rows)  # Vertikaler Abstand
-                
-                x_pos = impact_level + 0.1 + x_offset
-                y_pos = prob_level + 0.1 + y_offset
-                
-                # Text-Box mit weißem Text auf rotem Grund und schwarzem Rahmen erstellen
-                ax.text(x_pos, y_pos, risk_id,
-                       va='center', ha='left',
-                       fontsize=fontsize,
-                       color='white',
-                       bbox=dict(
-                           facecolor='red',
-                           edgecolor='black',  # Schwarzer Rahmen
-                           linewidth=1,        # Rahmendicke
-                           pad=2,              # Innenabstand
-                           boxstyle='round,pad=0.3'  # Abgerundete Ecken
-                       ))
-        
-        # Layout optimieren und Quadrat erzwingen
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.9)
-        
+
+            # Position in Reihen und Spalten, Abstand innerhalb des 1x1-Quadranten
+            row, col = np.divmod(np.arange(num_risks), max_risks_per_row)
+            x_pos = impact_level + 0.1 + col * (0.8 / max_risks_per_row)
+            y_pos = prob_level + 0.1 + row * (0.8 / num_rows)
+
+            labels.extend(risk_ids)
+            offsets.append(np.column_stack((x_pos, y_pos)))
+        if not offsets:
+            return labels, np.empty((0, 2))
+        return labels, np.concatenate(offsets)
+
+    def update_figure(self, matrix_figure: MatrixFigure, positions: Dict[Tuple[int, int], List[str]],
+                      title: str = "Risiko Matrix",
+                      summaries: Optional[Dict[Tuple[int, int], CellSummary]] = None) -> None:
+        """Aktualisiert Titel und Risiko-Beschriftungen; der Hintergrund bleibt unverändert"""
+        matrix_figure.ax.set_title(title, pad=20, fontsize=14, fontweight='bold')
+        self._update_summaries(matrix_figure, summaries or {})
+        key = {cell: tuple(risk_ids) for cell, risk_ids in positions.items()}
+        if key == matrix_figure.positions:
+            return
+        matrix_figure.positions = key
+
+        labels, offsets = self._label_offsets(positions)
+        # Abwechselnd Rahmen und Text, damit spätere Beschriftungen frühere überdecken
+        paths = []
+        for label in labels:
+            paths.extend(_label_paths(label))
+        matrix_figure.labels.set_paths(paths)
+        matrix_figure.labels.set_offsets(np.repeat(offsets, 2, axis=0))
+
+    def _update_summaries(self, matrix_figure: MatrixFigure, summaries: Dict[Tuple[int, int], CellSummary]) -> None:
+        """Setzt die Zusammenfassungen der dicht belegten Zellen (ein Artist je Zelle)"""
+        texts = matrix_figure.summaries
+        for cell in [cell for cell in texts if cell not in summaries]:
+            texts.pop(cell).remove()
+        for (impact_level, prob_level), summary in summaries.items():
+            text = texts.get((impact_level, prob_level))
+            if text is not None:
+                text.set_text(summary.label())
+                continue
+            texts[(impact_level, prob_level)] = matrix_figure.ax.text(
+                impact_level + 0.5, prob_level + 0.5, summary.label(),
+                ha='center', va='center', fontsize=9, zorder=4,
+                bbox=dict(
+                    facecolor='white',
+                    edgecolor='black',
+                    linewidth=1,
+                    alpha=0.85,
+                    boxstyle='round,pad=0.3'
+                ))
+
+    def _pyplot_figure(self) -> MatrixFigure:
+        """Gibt die wiederverwendbare pyplot-Figur zurück (neu, falls das Fenster geschlossen wurde)"""
+        # pyplot (mit Backend-Auswahl) nur für interaktive Fenster laden; Export und GUI nutzen Figure direkt
+        import matplotlib.pyplot as plt
+        matrix_figure = self._matrix_figure
+        if matrix_figure is None or not plt.fignum_exists(matrix_figure.figure.number):
+            # Figure mit quadratischem Aspektverhältnis erstellen
+            figure = plt.figure(figsize=(10, 10))  # Quadratische Grundgröße
+            matrix_figure = self._matrix_figure = self.setup_figure(figure)
+        return matrix_figure
+
+    @instrumented("risk_matrix.create_matrix")
+    def create_matrix(self, risks: List[Risk], project_budget: float, title: str = "Risiko Matrix", save_path: str = None,
+                      density: Optional[bool] = None):
+        """Erstellt die Power-Matrix (density: siehe layout_cells)"""
+        matrix_figure = self._pyplot_figure()
+        fig, ax = matrix_figure.figure, matrix_figure.ax
+
+        # Risiken nach Position gruppieren; nur die Beschriftungen werden neu gesetzt
+        positions, summaries = self.layout_cells(*self._risk_arrays(risks), project_budget, density)
+        self.update_figure(matrix_figure, positions, title, summaries)
+
         if save_path:
             # Speichern mit festgelegter DPI für konsistente Größe
-            plt.savefig(save_path, bbox_inches='tight', dpi=300)
-            plt.close()
+            fig.savefig(save_path, bbox_inches='tight', dpi=300)
         else:
             # Anzeigen mit erzwungenem quadratischem Layout
+            import matplotlib.pyplot as plt
             plt.show(block=True)
-        
-        return fig, ax 
\ No newline at end of file
+
+        return fig, ax
+
+    def render_key(self, positions: Dict[Tuple[int, int], List[str]],
+                   summaries: Dict[Tuple[int, int], CellSummary], project_budget: float, title: str,
+                   figsize: Tuple[float, float], dpi: float, file_format: str) -> str:
+        """Inhalts-Hash aller Eingaben, die das gerenderte Bild bestimmen"""
+        content = (
+            RENDER_VERSION, tuple(self.levels), float(project_budget), title,
+            tuple(float(size) for size in figsize), float(dpi), file_format,
+            sorted((cell, tuple(labels)) for cell, labels in positions.items()),
+            sorted((cell, summary.label()) for cell, summary in summaries.items())
+        )
+        return hashlib.sha256(repr(content).encode('utf-8')).hexdigest()
+
+    def _render_bytes(self, positions: Dict[Tuple[int, int], List[str]],
+                      summaries: Dict[Tuple[int, int], CellSummary], title: str, dpi: float,
+                      file_format: str, figsize: Tuple[float, float]) -> bytes:
+        """Rendert in eine eigene Agg-Figur ohne pyplot (auch ohne Display nutzbar)"""
+        figure = Figure(figsize=figsize)
+        FigureCanvasAgg(figure)
+        matrix_figure = self.setup_figure(figure)
+        self.update_figure(matrix_figure, positions, title, summaries)
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=file_format, dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+
+    @instrumented("risk_matrix.render_image")
+    def render_image(self, risks: List[Risk], project_budget: float, title: str = "Risiko Matrix",
+                     dpi: float = 100, file_format: str = 'png', figsize: Tuple[float, float] = (10, 10),
+                     density: Optional[bool] = None) -> bytes:
+        """Rendert die Matrix als Bilddaten; unveränderte Matrizen kommen aus dem Render-Cache"""
+        file_format = _export_format(None, file_format)
+        positions, summaries = self.layout_cells(*self._risk_arrays(risks), project_budget, density)
+        key = self.render_key(positions, summaries, project_budget, title, figsize, dpi, file_format)
+        data = self.render_cache.get(key)
+        if data is None:
+            data = self._render_bytes(positions, summaries, title, dpi, file_format, figsize)
+            self.render_cache.put(key, data)
+        return data
+
+    @instrumented("risk_matrix.export_matrix")
+    def export_matrix(self, risks: List[Risk], project_budget: float, path: str, title: str = "Risiko Matrix",
+                      dpi: float = 300, file_format: Optional[str] = None,
+                      figsize: Tuple[float, float] = (10, 10), density: Optional[bool] = None) -> None:
+        """Exportiert die Matrix als PNG, SVG oder PDF (Format aus der Dateiendung, falls nicht angegeben)"""
+        file_format = _export_format(path, file_format)
+        _write_image(path, self.render_image(risks, project_budget, title, dpi, file_format, figsize, density))
+
+    @instrumented("risk_matrix.export_batch")
+    def export_batch(self, jobs: Iterable[MatrixJob], workers: Optional[int] = None, dpi: float = 300,
+                     file_format: Optional[str] = None, figsize: Tuple[float, float] = (10, 10),
+                     density: Optional[bool] = None) -> List[ExportResult]:
+        """Exportiert viele Matrizen parallel auf mehreren Prozessen.
+
+        Die Zellbelegung wird vorab berechnet; Aufträge, deren Bild bereits im
+        Render-Cache liegt, werden direkt geschrieben, nur die übrigen gehen an
+        die Worker. Ein fehlgeschlagener Auftrag bricht den Batch nicht ab, auch
+        nicht bei einem abgestürzten Worker-Prozess; die Ergebnisse kommen in
+        Auftragsreihenfolge zurück.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Anzahl der Worker muss positiv sein")
+        results: List[Optional[ExportResult]] = []
+        pending = []  # (Position im Ergebnis, Cache-Schlüssel, Auftrag für den Worker)
+        for job in jobs:
+            try:
+                job_format = _export_format(job.path, file_format)
+                positions, summaries = self.layout_cells(*self._risk_arrays(job.risks), job.project_budget, density)
+                key = self.render_key(positions, summaries, job.project_budget, job.title, figsize, dpi, job_format)
+                data = self.render_cache.get(key)
+                if data is not None:
+                    _write_image(job.path, data)
+                    results.append(ExportResult(job.path, cached=True))
+                    continue
+            except Exception as e:
+                results.append(_error_result(job.path, e))
+                continue
+            results.append(None)
+            pending.append((len(results) - 1, key,
+                            (positions, summaries, job.title, job.path, dpi, job_format, figsize)))
+
+        workers = min(workers, len(pending))
+        if workers <= 1:
+            outcomes = [_export_job(payload) for _, _, payload in pending]
+        else:
+            outcomes = [None] * len(pending)
+            retry = []
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_export_job, payload) for _, _, payload in pending]
+                for position, ((_, _, payload), future) in enumerate(zip(pending, futures)):
+                    try:
+                        outcomes[position] = future.result()
+                    except BrokenProcessPool:
+                        retry.append(position)
+                    except Exception as e:
+                        outcomes[position] = (_error_result(payload[3], e), None)
+            # Ein abgestürzter Worker macht den Pool unbrauchbar und lässt alle offenen Aufträge
+            # scheitern; diese werden einzeln in eigenen Prozessen wiederholt
+            for position in retry:
+                outcomes[position] = _export_isolated(pending[position][2])
+
+        for (index, key, _), (result, data) in zip(pending, outcomes):
+            if data is not None:
+                self.render_cache.put(key, data)
+            results[index] = result
+        return results
@@ -0,0 +1,63 @@
+import pytest
+
+from benchmarks.suite import RESULT_VERSION, compare, spread
+from benchmarks.synthetic import generate_records, parse_mix
+
+
+def _results(seconds_by_case, runs_by_case=None, size=100):
+    runs_by_case = runs_by_case or {}
+    return {
+        'version': RESULT_VERSION,
+        'parameters': {'size': size},
+        'cases': {name: {'seconds': seconds, 'runs': runs_by_case.get(name, [seconds] * 5)}
+                  for name, seconds in seconds_by_case.items()}
+    }
+
+
+def test_compare_flags_only_cases_beyond_threshold():
+    baseline = _results({'a': 1.0, 'b': 1.0, 'c': 1.0})
+    results = _results({'a': 1.25, 'b': 1.4, 'c': 0.5})
+    assert compare(results, baseline, threshold=0.3) == ['b']
+
+
+def test_compare_tolerates_measured_noise():
+    baseline = _results({'a': 1.0}, {'a': [0.8, 0.9, 1.0, 1.2, 1.5]})
+    assert spread(baseline['cases']['a']) == pytest.approx(0.7)
+    assert compare(_results({'a': 1.6}), baseline, threshold=0.3) == []
+    assert compare(_results({'a': 1.8}), baseline, threshold=0.3) == ['a']
+
+
+def test_compare_ignores_cases_missing_from_baseline():
+    assert compare(_results({'a': 1.0, 'neu': 5.0}), _results({'a': 1.0})) == []
+
+
+def test_compare_rejects_other_result_version():
+    baseline = _results({'a': 1.0})
+    baseline['version'] = RESULT_VERSION + 1
+    with pytest.raises(ValueError):
+        compare(_results({'a': 1.0}), baseline)
+
+
+def test_generate_records_is_reproducible_and_in_range():
+    records = generate_records(500, seed=7, project_budget=50.0, probability="beta")
+    assert records == generate_records(500, seed=7, project_budget=50.0, probability="beta")
+    assert records != generate_records(500, seed=8, project_budget=50.0, probability="beta")
+    assert len(records) == 500
+    assert all(1 <= record['probability'] <= 99 for record in records)
+    assert all(0.01 <= record['impact'] <= 50.0 for record in records)
+
+
+def test_generate_records_follows_category_mix():
+    records = generate_records(2000, risk_types={"Project": 1.0, "Business": 0.0},
+                               reporting_levels={"SteerCo": 0.5, "Program": 0.5})
+    assert {record['risk_type'] for record in records} == {"Project"}
+    steerco = sum(record['reporting_level'] == "SteerCo" for record in records)
+    assert 800 < steerco < 1200
+
+
+def test_parse_mix():
+    assert parse_mix("Project=0.6, Business=0.4") == {"Project": 0.6, "Business": 0.4}
+    with pytest.raises(ValueError):
+        parse_mix("Project")
+    with pytest.raises(ValueError):
+        generate_records(10, risk_types={"Project": 0.0})
@@ -0,0 +1,26 @@
+from cli import filter_batch
+from src.models.risk import Risk
+
+
+def _risk(risk_id, risk_type, probability=50.0):
+    return Risk(id=risk_id, name=f"Risiko {risk_id}", description="", probability=probability, impact=8.0,
+                reporting_level="SteerCo", risk_type=risk_type)
+
+
+def test_filter_batch_keeps_input_order():
+    risks = [_risk(5, "Project"), _risk(2, "Business"), _risk(9, "project"), _risk(1, "PROJECT", 1.0)]
+    criteria = {'risk_type': "Project", 'reporting_level': None, 'risk_level': None}
+    assert [risk.id for risk in filter_batch(risks, criteria)] == [5, 9, 1]
+    criteria['risk_level'] = "hoch"
+    assert [risk.id for risk in filter_batch(risks, criteria)] == [5, 9]
+
+
+def test_filter_batch_keeps_duplicate_ids():
+    risks = [_risk(0, "Project"), _risk(0, "Project")]
+    criteria = {'risk_type': "project", 'reporting_level': "steerco", 'risk_level': None}
+    assert len(filter_batch(risks, criteria)) == 2
+
+
+def test_filter_batch_without_criteria_returns_batch():
+    risks = [_risk(3, "Project"), _risk(1, "Business")]
+    assert filter_batch(risks, {'risk_type': None, 'reporting_level': None, 'risk_level': None}) is risks
@@ -0,0 +1,95 @@
+from src.services.events import (ADDED, BUDGET_CHANGED, BULK_LOADED, CLEARED, DELETED, UPDATED,
+                                 EventBus, RiskEvent, coalesce)
+from src.services.risk_manager import RiskManager
+
+
+def _risk_manager():
+    risk_manager = RiskManager()
+    delivered = []
+    risk_manager.events.subscribe(delivered.append)
+    return risk_manager, delivered
+
+
+def _add(risk_manager, name="Lieferverzug", risk_id=None):
+    return risk_manager.add_risk(name, "", 50.0, 8.0, "SteerCo", "Project", risk_id=risk_id)
+
+
+def test_add_then_delete_cancels_out():
+    risk_manager, delivered = _risk_manager()
+    with risk_manager.batch():
+        risk = _add(risk_manager)
+        risk_manager.update_risk(risk.id, impact=2.0)
+        risk_manager.delete_risk(risk.id)
+    assert delivered == []
+
+
+def test_add_then_update_stays_added_with_final_state():
+    risk_manager, delivered = _risk_manager()
+    with risk_manager.batch():
+        risk = _add(risk_manager)
+        risk_manager.update_risk(risk.id, impact=2.0)
+    [events] = delivered
+    assert [(event.kind, event.risk_id) for event in events] == [(ADDED, risk.id)]
+    assert events[0].risk.impact == 2.0
+
+
+def test_delete_then_add_becomes_update():
+    risk_manager, delivered = _risk_manager()
+    risk = _add(risk_manager)
+    delivered.clear()
+    with risk_manager.batch():
+        risk_manager.delete_risk(risk.id)
+        _add(risk_manager, name="Neu", risk_id=risk.id)
+    [events] = delivered
+    assert [(event.kind, event.risk_id) for event in events] == [(UPDATED, risk.id)]
+    assert events[0].previous['name'] == "Lieferverzug"
+    assert events[0].changes['name'] == "Neu"
+
+
+def test_updates_keep_first_previous_and_last_change():
+    events = coalesce([
+        RiskEvent(UPDATED, 1, previous={'impact': 1.0}, changes={'impact': 2.0}),
+        RiskEvent(UPDATED, 1, previous={'impact': 2.0, 'name': "a"}, changes={'impact': 3.0, 'name': "b"}),
+    ])
+    assert len(events) == 1
+    assert events[0].previous == {'impact': 1.0, 'name': "a"}
+    assert events[0].changes == {'impact': 3.0, 'name': "b"}
+
+
+def test_update_then_delete_becomes_delete():
+    events = coalesce([
+        RiskEvent(UPDATED, 1, previous={'impact': 1.0}, changes={'impact': 2.0}),
+        RiskEvent(DELETED, 1, previous={'impact': 2.0, 'name': "a"}),
+    ])
+    assert [(event.kind, event.previous, event.changes) for event in events] == \
+        [(DELETED, {'impact': 1.0, 'name': "a"}, {})]
+
+
+def test_reset_collapses_to_single_bulk_loaded():
+    events = coalesce([
+        RiskEvent(ADDED, 1),
+        RiskEvent(BUDGET_CHANGED, previous={'project_budget': None}, changes={'project_budget': 10.0}),
+        RiskEvent(CLEARED),
+        RiskEvent(BULK_LOADED),
+        RiskEvent(BUDGET_CHANGED, previous={'project_budget': 10.0}, changes={'project_budget': 20.0}),
+        RiskEvent(UPDATED, 2),
+    ])
+    assert [event.kind for event in events] == [BULK_LOADED, BUDGET_CHANGED]
+    assert events[1].previous == {'project_budget': None}
+    assert events[1].changes == {'project_budget': 20.0}
+
+
+def test_batch_delivers_once_after_outermost_block():
+    bus = EventBus()
+    delivered = []
+    unsubscribe = bus.subscribe(delivered.append)
+    with bus.batch():
+        bus.publish(RiskEvent(ADDED, 1))
+        with bus.batch():
+            bus.publish(RiskEvent(ADDED, 2))
+        assert delivered == []
+    assert [[event.risk_id for event in events] for events in delivered] == [[1, 2]]
+
+    unsubscribe()
+    bus.publish(RiskEvent(ADDED, 3))
+    assert len(delivered) == 1
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+from src.services.journal import JournaledRegister, RiskJournal
+from src.services.persistence import save_register
+from src.services.risk_manager import RiskManager
+
+
+def _records(count, start=0):
+    return [dict(name=f"Risiko {i}", description="", probability=10.0 + i, impact=1.0 + i,
+                 reporting_level="Project", risk_type="Business") for i in range(start, start + count)]
+
+
+def test_reopen_after_batch_crossing_compaction_threshold(tmp_path):
+    snapshot = str(tmp_path / "register.json")
+    register = JournaledRegister(snapshot, compact_after=5)
+    risk_manager = register.open()
+    risk_manager.set_project_budget(100.0)
+    risk_manager.add_risks(_records(10))
+    risk_manager.add_risk(**_records(1, start=10)[0])
+    register.close()
+
+    reopened = JournaledRegister(snapshot, compact_after=5).open()
+    assert sorted(reopened.risks) == list(range(1, 12))
+    assert reopened.get_risk(10).probability == 19.0
+    assert reopened.project_budget == 100.0
+
+
+def test_replace_register_crossing_compaction_threshold(tmp_path):
+    snapshot = str(tmp_path / "register.json")
+    register = JournaledRegister(snapshot, compact_after=3)
+    risk_manager = register.open()
+    risk_manager.add_risks(_records(2))
+    staging = RiskManager()
+    staging.add_risks(_records(8))
+    risk_manager.replace_register(staging)
+    register.close()
+
+    reopened = JournaledRegister(snapshot).open()
+    assert sorted(reopened.risks) == list(range(1, 9))
+
+
+def test_replay_add_already_in_snapshot_is_idempotent(tmp_path):
+    snapshot = str(tmp_path / "register.json")
+    risk_manager = RiskManager()
+    risk = risk_manager.add_risk(**_records(1)[0])
+    save_register(snapshot, 100.0, risk_manager.get_all_risks())
+
+    journal = RiskJournal(f"{snapshot}.journal")
+    risk.probability = 55.0
+    journal.record_add(risk)
+    journal.close()
+
+    reopened = JournaledRegister(snapshot).open()
+    assert list(reopened.risks) == [1]
+    assert reopened.get_risk(1).probability == 55.0
+
+
+def test_records_survive_process_crash(tmp_path):
+    snapshot = str(tmp_path / "register.json")
+    script = (
+        "import os\n"
+        "from src.services.journal import JournaledRegister\n"
+        f"risk_manager = JournaledRegister({snapshot!r}).open()\n"
+        "risk_manager.set_project_budget(100.0)\n"
+        "for i in range(5):\n"
+        "    risk_manager.add_risk(f'Risiko {i}', '', 10.0, 1.0, 'Project', 'Business')\n"
+        "os._exit(1)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.run([sys.executable, '-c', script], cwd=root)
+    assert process.returncode == 1
+
+    reopened = JournaledRegister(snapshot).open()
+    assert sorted(reopened.risks) == [1, 2, 3, 4, 5]
+    assert reopened.project_budget == 100.0
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from src.services.parallel_simulation import ParallelMonteCarloSimulation
+from src.services.simulation import MonteCarloSimulation
+
+PROBABILITIES = [10.0, 40.0, 75.0, 5.0, 60.0]
+IMPACTS = [5.0, 2.0, 1.0, 8.0, 3.0]
+
+
+@pytest.mark.parametrize("distribution", ["fixed", "triangular"])
+def test_parallel_result_is_bit_identical_to_sequential(distribution):
+    options = dict(impact_distribution=distribution, block_trials=700, max_chunk_elements=1000)
+    expected = MonteCarloSimulation(**options).run_arrays(PROBABILITIES, IMPACTS, 5000, seed=11,
+                                                          project_budget=10.0)
+    for workers in (1, 2, 3):
+        result = ParallelMonteCarloSimulation(workers=workers, **options).run_arrays(
+            PROBABILITIES, IMPACTS, 5000, seed=11, project_budget=10.0)
+        assert np.array_equal(result.counts, expected.counts)
+        assert np.array_equal(result.bin_sums, expected.bin_sums)
+        assert result.mean == expected.mean
+        assert result.std == expected.std
+        assert result.exceedance_count == expected.exceedance_count
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        ParallelMonteCarloSimulation(workers=-1)
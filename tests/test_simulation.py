@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.services.simulation import MonteCarloSimulation
+
+
+def test_certain_risk_has_known_statistics():
+    result = MonteCarloSimulation(bins=10).run_arrays([100.0], [10.0], 1000, seed=1, project_budget=5.0)
+    assert result.mean == pytest.approx(10.0)
+    assert result.std == pytest.approx(0.0, abs=1e-9)
+    assert result.max_loss == 10.0
+    assert result.counts[-1] == 1000
+    assert result.exceedance_probability == 1.0
+    assert result.value_at_risk(0.95) == pytest.approx(9.95)
+    assert result.conditional_value_at_risk(0.95) == pytest.approx(10.0)
+
+
+def test_coin_flip_risk():
+    result = MonteCarloSimulation(bins=10).run_arrays([50.0], [10.0], 20000, seed=3, project_budget=5.0)
+    occurred = int(result.counts[-1])
+    assert result.counts[0] + occurred == 20000
+    assert 9500 < occurred < 10500
+    assert result.exceedance_probability == occurred / 20000
+    assert result.mean == pytest.approx(10.0 * occurred / 20000)
+    assert result.std == pytest.approx(5.0, rel=0.01)
+    assert result.percentile(25) < 1.0
+    assert result.percentile(100) == 10.0
+    assert result.conditional_value_at_risk(0.95) == pytest.approx(10.0)
+    with pytest.raises(ValueError):
+        result.percentile(101)
+
+
+def test_without_budget_no_exceedance_probability():
+    result = MonteCarloSimulation().run_arrays([50.0], [10.0], 100, seed=1)
+    assert result.exceedance_probability is None
+
+
+def test_same_seed_reproduces_result():
+    simulation = MonteCarloSimulation(impact_distribution="triangular", block_trials=500)
+    args = ([10.0, 40.0, 75.0], [5.0, 2.0, 1.0], 2000)
+    first = simulation.run_arrays(*args, seed=42)
+    second = simulation.run_arrays(*args, seed=42)
+    other = simulation.run_arrays(*args, seed=43)
+    assert np.array_equal(first.counts, second.counts)
+    assert first.mean == second.mean
+    assert first.seed == 42
+    assert not np.array_equal(first.counts, other.counts)
+
+
+@pytest.mark.parametrize("distribution", ["fixed", "uniform", "triangular"])
+def test_result_does_not_depend_on_chunk_size(distribution):
+    args = ([10.0, 40.0, 75.0, 5.0], [5.0, 2.0, 1.0, 8.0], 3000)
+    reference = MonteCarloSimulation(impact_distribution=distribution, block_trials=1000).run_arrays(*args, seed=7)
+    for max_chunk_elements in (4, 100, 1001):
+        result = MonteCarloSimulation(impact_distribution=distribution, block_trials=1000,
+                                      max_chunk_elements=max_chunk_elements).run_arrays(*args, seed=7)
+        assert np.array_equal(result.counts, reference.counts)
+        assert result.max_loss == reference.max_loss
+        assert result.mean == pytest.approx(reference.mean)
+        assert result.std == pytest.approx(reference.std)
@@ -0,0 +1,96 @@
+import json
+import zlib
+
+import pytest
+
+from src.services.persistence import save_register
+from src.services.risk_manager import RiskManager
+from src.services.snapshot import (_HEADER, _HEADER_CHECKSUM, SnapshotReader, json_to_snapshot,
+                                   snapshot_to_json, write_snapshot)
+
+RECORDS = [
+    dict(name="Lieferverzug", description="Zulieferer aus Übersee", probability=50.0, impact=8.0,
+         reporting_level="SteerCo", risk_type="Project"),
+    dict(name="Zinsanstieg", description="", probability=90.0, impact=5.5, reporting_level="Program",
+         risk_type="Business"),
+    dict(name="Lizenzkosten", description="€-Kurs", probability=5.0, impact=1.0, reporting_level="SteerCo",
+         risk_type="Project"),
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / "register.rmsnap")
+    write_snapshot(path, 120.0, [dict(id=i, **record) for i, record in enumerate(RECORDS, start=1)])
+    return path
+
+
+def _patch(path, offset, data):
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_json_snapshot_round_trip(tmp_path):
+    risk_manager = RiskManager()
+    risk_manager.add_risks(RECORDS)
+    source = str(tmp_path / "source.json")
+    save_register(source, 120.0, risk_manager.get_all_risks())
+
+    snapshot = str(tmp_path / "register.rmsnap")
+    target = str(tmp_path / "target.json")
+    assert json_to_snapshot(source, snapshot) == 3
+    assert snapshot_to_json(snapshot, target) == 3
+
+    with open(source, encoding="utf-8") as f:
+        expected = json.load(f)
+    with open(target, encoding="utf-8") as f:
+        actual = json.load(f)
+    assert actual["project_budget"] == expected["project_budget"] == 120.0
+    assert actual["risks"] == expected["risks"]
+
+
+def test_reader_exposes_columns_and_records(snapshot):
+    with SnapshotReader(snapshot, verify=True) as reader:
+        assert len(reader) == 3
+        assert reader.project_budget == 120.0
+        assert list(reader.ids) == [1, 2, 3]
+        assert reader.record(0)["description"] == "Zulieferer aus Übersee"
+        assert reader.record(2)["reporting_level"] == "SteerCo"
+
+
+def test_corrupted_header_is_rejected(snapshot):
+    _patch(snapshot, 20, b"\xff")
+    with pytest.raises(ValueError, match="Header"):
+        SnapshotReader(snapshot)
+
+
+def test_other_version_is_rejected(snapshot):
+    with open(snapshot, "rb") as f:
+        fields = list(_HEADER.unpack(f.read(_HEADER.size)))
+    fields[1] += 1
+    header = _HEADER.pack(*fields)
+    _patch(snapshot, 0, header + _HEADER_CHECKSUM.pack(zlib.crc32(header)))
+    with pytest.raises(ValueError, match="Version"):
+        SnapshotReader(snapshot)
+
+
+def test_truncated_file_is_rejected(snapshot):
+    with open(snapshot, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 8)
+    with pytest.raises(ValueError, match="unvollständig"):
+        SnapshotReader(snapshot)
+    with open(snapshot, "r+b") as f:
+        f.truncate(10)
+    with pytest.raises(ValueError):
+        SnapshotReader(snapshot)
+
+
+def test_corrupted_body_is_found_by_verify(snapshot):
+    with open(snapshot, "rb") as f:
+        size = len(f.read())
+    _patch(snapshot, size - 1, b"\x01")
+    with SnapshotReader(snapshot) as reader:
+        assert not reader.verify()
+    with pytest.raises(ValueError, match="Prüfsumme"):
+        SnapshotReader(snapshot, verify=True)
@@ -0,0 +1,168 @@
+from datetime import datetime
+
+import pytest
+
+from src.services.risk_manager import RiskManager
+from src.services.storage import MemoryBackend, SQLiteBackend
+
+RECORDS = [
+    dict(name="Lieferverzug", description="", probability=50.0, impact=8.0, reporting_level="SteerCo",
+         risk_type="Project"),
+    dict(name="Personalengpass", description="", probability=20.0, impact=1.0, reporting_level="Project",
+         risk_type="Business"),
+    dict(name="Zinsanstieg", description="", probability=90.0, impact=5.0, reporting_level="steerco",
+         risk_type="business"),
+    dict(name="Lizenzkosten", description="", probability=5.0, impact=1.0, reporting_level="Program",
+         risk_type="Project"),
+]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend_factory(request, tmp_path):
+    """Liefert (neuer RiskManager, Funktion zum Wiederöffnen) je Backend"""
+    if request.param == "memory":
+        backend = MemoryBackend()
+        return lambda: RiskManager(backend), lambda risk_manager: RiskManager(risk_manager.backend)
+    path = str(tmp_path / "register.db")
+
+    def reopen(risk_manager):
+        risk_manager.backend.close()
+        return RiskManager(SQLiteBackend(path))
+    return lambda: RiskManager(SQLiteBackend(path)), reopen
+
+
+@pytest.fixture
+def filled(backend_factory):
+    create, reopen = backend_factory
+    risk_manager = create()
+    risk_manager.set_project_budget(100.0)
+    risk_manager.add_risks(RECORDS)
+    yield risk_manager, reopen
+    risk_manager.backend.close()
+
+
+def names(risks):
+    return sorted(risk.name for risk in risks)
+
+
+def test_add_assigns_ids_and_persists_fields(filled):
+    risk_manager, _ = filled
+    assert sorted(risk_manager.risks) == [1, 2, 3, 4]
+    risk = risk_manager.add_risk("Ausfall", "Server", 10.0, 3.0, "Project", "Business")
+    assert risk.id == 5
+    stored = risk_manager.get_risk(5)
+    assert (stored.name, stored.description, stored.probability, stored.impact) == ("Ausfall", "Server", 10.0, 3.0)
+    with pytest.raises(ValueError):
+        risk_manager.add_risk("Doppelt", "", 1.0, 1.0, "Project", "Business", risk_id=5)
+
+
+def test_update_changes_stored_risk_and_filters(filled):
+    risk_manager, _ = filled
+    risk_manager.update_risk(2, probability=80.0, risk_type="Project")
+    assert risk_manager.get_risk(2).probability == 80.0
+    assert names(risk_manager.get_risks_by_type("project")) == ["Lieferverzug", "Lizenzkosten", "Personalengpass"]
+    assert "Personalengpass" in names(risk_manager.get_high_risks())
+    with pytest.raises(ValueError):
+        risk_manager.update_risk(99, probability=1.0)
+
+
+def test_delete_removes_risk(filled):
+    risk_manager, _ = filled
+    risk_manager.delete_risk(1)
+    assert 1 not in risk_manager.risks
+    assert risk_manager.get_risk(1) is None
+    assert names(risk_manager.get_risks_by_type("Project")) == ["Lizenzkosten"]
+    with pytest.raises(ValueError):
+        risk_manager.delete_risk(1)
+
+
+def test_filters_ignore_case(filled):
+    risk_manager, _ = filled
+    assert names(risk_manager.get_risks_by_reporting_level("STEERCO")) == ["Lieferverzug", "Zinsanstieg"]
+    assert names(risk_manager.get_risks_by_type("Business")) == ["Personalengpass", "Zinsanstieg"]
+    assert names(risk_manager.get_high_risks()) == ["Lieferverzug", "Zinsanstieg"]
+    assert names(risk_manager.filter_risks(risk_type="business", reporting_level="SteerCo",
+                                           risk_level="hoch")) == ["Zinsanstieg"]
+    assert risk_manager.get_risks_by_owner("Niemand") == []
+    assert risk_manager.get_risks_by_owner("") == []
+    assert risk_manager.sorted_ids(owner="") == []
+    assert len(risk_manager.filter_risks()) == 4
+
+
+def test_sorted_ids(filled):
+    risk_manager, _ = filled
+    assert risk_manager.sorted_ids('risk_score', descending=True) == [3, 1, 2, 4]
+    assert risk_manager.sorted_ids('name') == [1, 4, 2, 3]
+    assert risk_manager.sorted_ids('impact', risk_type="Project") == [4, 1]
+    risk_manager.update_risk(4, impact=20.0)
+    assert risk_manager.sorted_ids('impact', descending=True) == [4, 1, 3, 2]
+
+
+def test_top_k_and_risks_above(filled):
+    risk_manager, _ = filled
+    assert [risk.id for risk in risk_manager.top_k(2)] == [3, 1]
+    assert [risk.id for risk in risk_manager.top_k(1, 'impact')] == [1]
+    risk_manager.delete_risk(3)
+    risk_manager.update_risk(2, probability=100.0)
+    assert [risk.id for risk in risk_manager.top_k(2)] == [1, 2]
+    assert [risk.id for risk in risk_manager.risks_above(4.0, 'budget_usage')] == [1]
+
+
+def test_summary_matches_recount(filled):
+    risk_manager, _ = filled
+    risk_manager.update_risk(1, impact=1.0)
+    risk_manager.delete_risk(4)
+    summary = risk_manager.summary()
+    assert summary.count == 3
+    assert summary.expected_value == pytest.approx(0.5 + 0.2 + 4.5)
+    assert risk_manager.verify_aggregates() == []
+
+
+def test_reopen_restores_register(filled):
+    risk_manager, reopen = filled
+    risk_manager.update_risk(2, impact=7.0)
+    risk_manager.delete_risk(4)
+    reopened = reopen(risk_manager)
+    assert sorted(reopened.risks) == [1, 2, 3]
+    assert reopened.get_risk(2).impact == 7.0
+    assert reopened.add_risk("Neu", "", 1.0, 1.0, "Project", "Business").id == 4
+    reopened.set_project_budget(100.0)
+    assert reopened.verify_aggregates() == []
+    assert [risk.id for risk in reopened.top_k(1)] == [3]
+    assert reopened.sorted_ids('probability') == [4, 2, 1, 3]
+    reopened.backend.close()
+
+
+def test_replace_register_keeps_backend(filled):
+    risk_manager, reopen = filled
+    backend = risk_manager.backend
+    staging = RiskManager()
+    staging.add_risks(RECORDS[:2])
+    risk_manager.replace_register(staging)
+    assert risk_manager.backend is backend
+    assert sorted(risk_manager.risks) == [1, 2]
+    reopened = reopen(risk_manager)
+    assert names(reopened.get_all_risks()) == ["Lieferverzug", "Personalengpass"]
+    reopened.backend.close()
+
+
+def test_reopen_keeps_budget_and_timestamps(filled):
+    risk_manager, reopen = filled
+    risk = risk_manager.get_risk(1)
+    risk.budget = 250.0
+    risk.created_at = datetime(2024, 3, 1, 12, 30)
+    risk_manager.backend.update(risk)
+    reopened = reopen(risk_manager)
+    stored = reopened.get_risk(1)
+    assert stored.budget == 250.0
+    assert stored.created_at == datetime(2024, 3, 1, 12, 30)
+    reopened.backend.close()
+
+
+def test_sqlite_score_queries_do_not_load_register(tmp_path, monkeypatch):
+    risk_manager = RiskManager(SQLiteBackend(str(tmp_path / "register.db")))
+    risk_manager.add_risks(RECORDS)
+    monkeypatch.setattr(SQLiteBackend, 'values', lambda self: pytest.fail("Register vollständig geladen"))
+    assert [risk.id for risk in risk_manager.top_k(2)] == [3, 1]
+    assert [risk.id for risk in risk_manager.risks_above(0.2)] == [3, 1]
+    risk_manager.backend.close()
@@ -0,0 +1,93 @@
+import bisect
+import random
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from src.gui import virtual_table
+from src.gui.virtual_table import RowOrder
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Kleine Blöcke, damit Teilen und Blockgrenzen schon bei wenigen Zeilen vorkommen
+    monkeypatch.setattr(virtual_table, 'BLOCK_SIZE', 4)
+
+
+def _check(order, expected):
+    assert len(order) == len(expected)
+    assert list(order) == expected
+    for index, risk_id in enumerate(expected):
+        assert risk_id in order
+        assert order.index(risk_id) == index
+    for start in range(len(expected) + 1):
+        for count in (0, 1, 3, 9):
+            assert order.slice(start, count) == expected[start:start + count]
+
+
+def test_reset_and_append():
+    order = RowOrder(range(10))
+    _check(order, list(range(10)))
+    order.append(10)
+    _check(order, list(range(11)))
+    order.reset([])
+    _check(order, [])
+    order.append(5)
+    _check(order, [5])
+
+
+def test_insert_splits_blocks():
+    order = RowOrder()
+    expected = []
+    for risk_id in range(40):
+        index = risk_id // 2
+        order.insert(index, risk_id)
+        expected.insert(index, risk_id)
+    _check(order, expected)
+    assert max(len(block.ids) for block in order._blocks) < 8
+    with pytest.raises(ValueError):
+        order.insert(0, 5)
+
+
+def test_remove_returns_position_and_drops_empty_blocks():
+    order = RowOrder(range(12))
+    expected = list(range(12))
+    for risk_id in (4, 5, 6, 7, 0, 11):
+        assert order.remove(risk_id) == expected.index(risk_id)
+        expected.remove(risk_id)
+        _check(order, expected)
+    assert all(block.ids for block in order._blocks)
+    with pytest.raises(ValueError):
+        order.remove(4)
+    with pytest.raises(ValueError):
+        order.index(4)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_inserts_and_removes_match_sorted_list(descending):
+    rng = random.Random(5)
+    values = {}
+    order = RowOrder()
+    for step in range(600):
+        if values and rng.random() < 0.4:
+            risk_id = rng.choice(list(values))
+            order.remove(risk_id)
+            del values[risk_id]
+        else:
+            risk_id = step
+            values[risk_id] = rng.randint(0, 20)
+
+            def key(other):
+                return (values[other], other)
+            order.insert(order.bisect(key(risk_id), key, descending), risk_id)
+        expected = sorted(values, key=lambda other: (values[other], other), reverse=descending)
+        assert list(order) == expected
+    _check(order, expected)
+
+
+def test_bisect_matches_list_bisect():
+    ids = list(range(0, 60, 2))
+    order = RowOrder(ids)
+    for value in range(-1, 62):
+        assert order.bisect(value, lambda risk_id: risk_id) == bisect.bisect_left(ids, value)